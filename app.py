@@ -522,6 +522,10 @@ from extraction.prescription_processor import prescription_processor
 if "processed_prescriptions" not in st.session_state:
     st.session_state.processed_prescriptions = []
 
+# Load OCR models in the background so the first upload doesn't wait for them
+if Config.OCR_WARM_UP_ON_START:
+    prescription_processor.ocr.warm_up(background=True)
+
 # ========================= HELPERS =========================
 def get_prescription_type_badge(rx_type):
     """Get badge class for prescription type"""
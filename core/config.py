@@ -24,6 +24,7 @@ class Config:
     UPLOADS_DIR = STORAGE_DIR / "uploads"
     EXPORTS_DIR = STORAGE_DIR / "exports"
     CACHE_DIR = STORAGE_DIR / "cache"
+    BATCH_DIR = STORAGE_DIR / "batches"
     DB_PATH = STORAGE_DIR / "docuvault.db"
     
     # API Keys
@@ -35,15 +36,136 @@ class Config:
     FALLBACK_LLM_MODEL = "gpt-3.5-turbo"
     LLM_TEMPERATURE = 0
     LLM_MAX_TOKENS = 4096
+    LLM_MAX_CONCURRENCY = 16  # In-flight async LLM requests per process (all extractors)
+    VISION_MAX_PAGES = 10  # Pages of a multi-page TIFF sent to the vision model (one image each)
+    LLM_STRUCTURED_OUTPUT = True  # JSON-schema output (OpenAI json_schema / Anthropic forced tool) instead of scraping free text
+    
+    # Multi-document packing: batches send several high-confidence OCR texts per LLM-text request
+    LLM_PACK_DOCUMENTS = True
+    LLM_PACK_MAX_DOCUMENTS = 8
+    LLM_PACK_MAX_INPUT_TOKENS = 6000  # OCR text tokens per packed request
+    LLM_PACK_MAX_OUTPUT_TOKENS = 8192
+    LLM_PACK_MIN_OCR_CONFIDENCE = 0.85  # Only documents at least this confident are packed
+    
+    # Deferred batch processing (Batch API); set LLM_BATCH_BASE_URL to use extraction.batch_server offline
+    LLM_BATCH_BASE_URL: Optional[str] = os.getenv("LLM_BATCH_BASE_URL")
+    LLM_BATCH_COMPLETION_WINDOW = "24h"
+    LLM_BATCH_POLL_SECONDS = 30
+    LLM_BATCH_TIMEOUT_HOURS = 24
+    LLM_BATCH_MAX_REQUESTS = 50000  # Batch API limit on requests per input file
+    LLM_BATCH_MAX_FILE_MB = 190  # Batch API input files are limited to 200MB; larger batches are split
+    
+    # Provider routing (opt-in): with both API keys set, a primary call slower than its usual
+    # tail is duplicated to the other provider. Hedged requests are billed by both providers,
+    # roughly (100 - LLM_HEDGE_PERCENTILE)% extra calls when healthy, more while the primary is degraded
+    LLM_HEDGING = os.getenv("LLM_HEDGING", "false").lower() == "true"
+    LLM_PRIMARY_PROVIDER = os.getenv("LLM_PRIMARY_PROVIDER", "openai")
+    LLM_HEDGE_PERCENTILE = 95  # Hedge once the primary is slower than this percentile of its recent calls
+    LLM_HEDGE_DEFAULT_DELAY = 10.0  # Seconds, until LLM_HEDGE_MIN_SAMPLES latencies are recorded
+    LLM_HEDGE_MIN_DELAY = 1.0
+    LLM_HEDGE_MIN_SAMPLES = 20
+    LLM_LATENCY_WINDOW = 200  # Recent successful calls kept per provider
+    LLM_BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failures that open a provider's circuit
+    LLM_BREAKER_COOLDOWN_SECONDS = 60  # Open time before a single probe request is let through
+    
+    # LLM Rate Limits: (requests/minute, tokens/minute) per model - match the account's tier
+    LLM_RATE_LIMITS = {
+        "gpt-4o": (500, 30000),
+        "gpt-4o-mini": (500, 200000),
+        "claude-3-5-sonnet-20241022": (50, 40000)
+    }
+    LLM_DEFAULT_RATE_LIMIT = (500, 30000)
+    LLM_RATE_LIMIT_HEADROOM = 0.9  # Fraction of the quota the client-side limiter allows
+    LLM_IMAGE_TOKEN_ESTIMATE = 1105  # Tokens counted per high-detail image
+    LLM_MAX_RETRIES = 5  # Retries for rate limits, overloads and connection errors
+    LLM_RETRY_BASE_DELAY = 1.0
+    LLM_RETRY_MAX_DELAY = 60.0
+    
+    # LLM Response Cache
+    LLM_CACHE_ENABLED = True
+    LLM_CACHE_PATH = CACHE_DIR / "llm_cache.sqlite3"
+    LLM_CACHE_TTL_HOURS = 24 * 7
+    LLM_CACHE_MAX_MB = 256
+    LLM_CACHE_PROMPT_VERSION = 1  # Bump when prompt templates change to invalidate cached responses
+    
+    # OCR Text Compaction (prompt copy of the OCR text only; see extraction/text_compaction.py)
+    LLM_PROMPT_COMPACTION = True
+    LLM_COMPACT_MIN_LINE_CONFIDENCE = 0.6  # Drop OCR lines recognized below this confidence
+    LLM_COMPACT_MIN_LINE_CHARS = 2  # Drop fragments with fewer letters/digits
+    LLM_COMPACT_DEDUPE_MIN_CHARS = 20  # Non-consecutive repeats shorter than this are kept (table cells)
+    LLM_OCR_TOKEN_BUDGET = 3000  # Max OCR tokens pasted into a prompt
     
     # OCR Settings
     OCR_LANGUAGE = "en"
     OCR_USE_GPU = False
     OCR_CONFIDENCE_THRESHOLD = 0.5
+    OCR_CPU_THREADS = 10  # Math library threads for in-process OCR
+    OCR_WARM_UP_ON_START = True  # Load OCR models in the background when the app starts
+    
+    # Resolution normalization: downscale inputs whose text is taller than the
+    # recognizer needs. PaddleOCR's recognizer resizes each line crop to 48px high
+    # and takes the crops from the image it is given (not the detector's shrunk
+    # copy), so text is never shrunk below OCR_TARGET_TEXT_HEIGHT pixels.
+    # OCR_MAX_SIDE_LEN only guards against very large scans
+    OCR_NORMALIZE_RESOLUTION = True
+    OCR_TARGET_TEXT_HEIGHT = 48
+    OCR_MAX_SIDE_LEN = 4096
+    OCR_DET_LIMIT_SIDE_LEN = 960  # Detector input long side (PaddleOCR's default)
+    
+    # OCR Worker Pool (batch processing); 1 = run OCR in-process.
+    # For full-core throughput set OCR_WORKERS * OCR_WORKER_THREADS ~= CPU cores
+    OCR_WORKERS = 1
+    OCR_WORKER_THREADS = 2
+    OCR_BATCH_REC_SIZE = 64  # Recognition batch size for cross-image batch OCR
+    
+    # Preprocessing chains (step names from extraction.preprocessing.PREPROCESS_STEPS).
+    # Per-category overrides are keyed by prescription type; compare chains with
+    # `python -m extraction.preprocessing`
+    OCR_PREPROCESS_CHAIN = ["grayscale", "nl_means", "adaptive_threshold"]
+    OCR_PREPROCESS_CHAINS = {
+        "digital": ["grayscale"],  # Screenshots/exports are already clean
+    }
+    
+    # Dual-variant OCR: run the preprocessed and raw passes concurrently on
+    # separate engines instead of retrying sequentially on low confidence
+    # (uses a second PaddleOCR instance and roughly twice the CPU per image)
+    OCR_DUAL_VARIANT = False
+    OCR_DUAL_VARIANT_EARLY_CANCEL = True
+    OCR_DUAL_VARIANT_CANCEL_RATIO = 2.0  # Box-count ratio at which the losing variant is skipped
+    
+    # OCR Result Cache
+    OCR_CACHE_ENABLED = True
+    OCR_CACHE_DIR = CACHE_DIR / "ocr"
+    OCR_CACHE_MAX_MB = 512
+    
+    # PDF OCR: pages rendered ahead of the page currently being recognized
+    PDF_PREFETCH_PAGES = 2
+    PDF_PREFETCH_JOIN_SECONDS = 5.0  # Wait for the render thread to stop after OCR of a PDF ends early
+    
+    # PDF rendering DPI: with adaptive DPI each page is probed at low resolution
+    # and rendered just large enough for text to reach OCR_TARGET_TEXT_HEIGHT
+    PDF_DPI = 300  # Fixed DPI, and the reference grid OCR boxes are reported in
+    PDF_ADAPTIVE_DPI = True
+    PDF_PROBE_DPI = 72
+    PDF_MIN_DPI = 150
+    PDF_MAX_DPI = 300
+    
+    # PDF page skipping: blank backs and repeated pages are dropped before OCR
+    PDF_SKIP_BLANK_PAGES = True
+    PDF_BLANK_INK_RATIO = 0.0002  # Ink coverage (on a thumbnail) below which a page is blank
+    PDF_SKIP_DUPLICATE_PAGES = True
+    PDF_DUPLICATE_MAX_DISTANCE = 4  # Max differing bits of the 256-bit page dHash
+    PDF_DUPLICATE_MIN_CORRELATION = 0.98  # Min thumbnail correlation to confirm a duplicate
+    
+    # PDF text layer: pages with embedded text are read directly instead of OCRed
+    PDF_TEXT_LAYER_ENABLED = True
+    PDF_TEXT_LAYER_MIN_CHARS = 20  # Fewer characters than this counts as an image-only page
+    PDF_TEXT_LAYER_CONFIDENCE = 0.99  # Synthetic confidence reported for text-layer lines
+    PDF_TEXT_LAYER_MAX_IMAGE_AREA = 0.1  # Pages whose images without text cover more of the page are OCRed
     
     # Document Processing
     MAX_FILE_SIZE_MB = 50
-    SUPPORTED_FORMATS = ["png", "jpg", "jpeg", "pdf", "tiff"]
+    SUPPORTED_FORMATS = ["png", "jpg", "jpeg", "pdf", "tiff", "tif"]
     BATCH_SIZE = 10
     
     # Database
@@ -56,7 +178,7 @@ class Config:
     @classmethod
     def setup_directories(cls):
         """Create necessary directories"""
-        for directory in [cls.STORAGE_DIR, cls.UPLOADS_DIR, cls.EXPORTS_DIR, cls.CACHE_DIR]:
+        for directory in [cls.STORAGE_DIR, cls.UPLOADS_DIR, cls.EXPORTS_DIR, cls.CACHE_DIR, cls.BATCH_DIR]:
             directory.mkdir(parents=True, exist_ok=True)
     
     @classmethod
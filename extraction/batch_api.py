@@ -0,0 +1,292 @@
+"""
+DocuVault - Batch API Client
+Submit LLM requests through the asynchronous OpenAI Batch API and collect the results
+"""
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from openai import OpenAI
+from loguru import logger
+
+from core.config import Config
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Terminal batch states other than "completed"
+FAILED_STATES = ("failed", "expired", "cancelled")
+
+
+class BatchClient:
+    """
+    Deferred LLM requests via the Batch API
+
+    Requests are written to a JSONL file keyed by custom_id, uploaded and
+    submitted as one batch, polled until the batch completes and read back
+    as {custom_id: result}. The local input file is removed after upload. Batch requests are billed at a discount and
+    draw on a separate, larger quota, at the cost of completing within the
+    completion window instead of interactively.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+        """
+        Initialize batch client
+
+        Args:
+            base_url: API base URL (defaults to Config.LLM_BATCH_BASE_URL, then
+                OpenAI); point it at extraction.batch_server for offline runs
+            api_key: API key (defaults to Config.OPENAI_API_KEY)
+        """
+        base_url = base_url or Config.LLM_BATCH_BASE_URL
+        api_key = api_key or Config.OPENAI_API_KEY
+
+        if not api_key and not base_url:
+            raise ValueError("OPENAI_API_KEY not configured - required for the Batch API")
+
+        # The local stand-in accepts any key
+        self.client = OpenAI(api_key=api_key or "local-batch", base_url=base_url)
+        self.base_url = str(self.client.base_url)
+
+    def request_line(self, custom_id: str, body: Dict[str, Any]) -> str:
+        """One line of a batch input file"""
+        return json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body
+        }) + "\n"
+
+    def split_requests(
+        self,
+        requests: Dict[str, Dict[str, Any]],
+        max_requests: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> List[Dict[str, Dict[str, Any]]]:
+        """
+        Split requests into chunks that fit the Batch API input-file limits
+
+        Requests with inline base64 images run to hundreds of kilobytes
+        each, so the byte limit is usually reached long before the
+        request-count limit.
+
+        Args:
+            requests: {custom_id: chat completions request body}
+            max_requests: Requests per chunk (defaults to Config.LLM_BATCH_MAX_REQUESTS)
+            max_bytes: Input file bytes per chunk (defaults to Config.LLM_BATCH_MAX_FILE_MB)
+
+        Returns:
+            List of {custom_id: body} chunks, in the original order
+        """
+        max_requests = max_requests or Config.LLM_BATCH_MAX_REQUESTS
+        max_bytes = max_bytes or Config.LLM_BATCH_MAX_FILE_MB * 1024 * 1024
+
+        chunks: List[Dict[str, Dict[str, Any]]] = []
+        chunk: Dict[str, Dict[str, Any]] = {}
+        chunk_bytes = 0
+
+        for custom_id, body in requests.items():
+            size = len(self.request_line(custom_id, body).encode("utf-8"))
+            if size > max_bytes:
+                # Submitted on its own; the API rejects it and process() redoes it interactively
+                logger.warning(f"Batch request {custom_id} is {size / 1024 / 1024:.1f}MB, above the input file limit")
+            if chunk and (len(chunk) >= max_requests or chunk_bytes + size > max_bytes):
+                chunks.append(chunk)
+                chunk, chunk_bytes = {}, 0
+            chunk[custom_id] = body
+            chunk_bytes += size
+
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def new_batch_path(self, part: int = 0) -> Path:
+        """Unique input file path in Config.BATCH_DIR (timestamp, PID and a random suffix)"""
+        return Config.BATCH_DIR / (
+            f"batch_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{uuid.uuid4().hex[:8]}_part{part}.jsonl"
+        )
+
+    def write_requests(self, requests: Dict[str, Dict[str, Any]], path: Path) -> Path:
+        """
+        Write requests to a batch input file
+
+        Args:
+            requests: {custom_id: chat completions request body}
+            path: Output JSONL path
+
+        Returns:
+            The path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as f:
+            for custom_id, body in requests.items():
+                f.write(self.request_line(custom_id, body))
+
+        logger.info(f"Wrote {len(requests)} batch requests to {path.name} ({path.stat().st_size / 1024:.0f}KB)")
+        return path
+
+    def submit(self, path: Path, description: Optional[str] = None) -> str:
+        """
+        Upload a batch input file and create the batch
+
+        Args:
+            path: JSONL file from write_requests
+            description: Optional description stored in the batch metadata
+
+        Returns:
+            Batch ID
+        """
+        with open(path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=Config.LLM_BATCH_COMPLETION_WINDOW,
+            metadata={"description": description} if description else None
+        )
+
+        logger.info(f"Submitted batch {batch.id} ({Path(path).name}) to {self.base_url}")
+        return batch.id
+
+    def wait(
+        self,
+        batch_id: str,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Poll a batch until it reaches a terminal state
+
+        Args:
+            batch_id: Batch ID from submit
+            poll_interval: Seconds between polls (defaults to Config.LLM_BATCH_POLL_SECONDS)
+            timeout: Give up after this many seconds (defaults to Config.LLM_BATCH_TIMEOUT_HOURS)
+
+        Returns:
+            The completed batch object
+
+        Raises:
+            RuntimeError: If the batch failed, expired or was cancelled
+            TimeoutError: If the batch is still running after the timeout
+        """
+        poll_interval = poll_interval or Config.LLM_BATCH_POLL_SECONDS
+        timeout = timeout or Config.LLM_BATCH_TIMEOUT_HOURS * 3600
+        deadline = time.time() + timeout
+
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+
+            if batch.status == "completed":
+                counts = batch.request_counts
+                logger.success(
+                    f"Batch {batch_id} completed: "
+                    f"{counts.completed if counts else '?'} ok, {counts.failed if counts else '?'} failed"
+                )
+                return batch
+
+            if batch.status in FAILED_STATES:
+                raise RuntimeError(f"Batch {batch_id} {batch.status}: {batch.errors}")
+
+            if time.time() > deadline:
+                raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout:.0f}s")
+
+            logger.debug(f"Batch {batch_id} {batch.status}, polling again in {poll_interval:.0f}s")
+            time.sleep(poll_interval)
+
+    def fetch_results(self, batch) -> Dict[str, Dict[str, Any]]:
+        """
+        Read a completed batch's output and error files
+
+        Args:
+            batch: Completed batch object from wait
+
+        Returns:
+            {custom_id: {"text": response text or None, "usage": usage dict,
+            "error": error message or None}}
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    row = json.loads(line)
+                    results[row["custom_id"]] = self.parse_result(row)
+
+        return results
+
+    def parse_result(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Response text, usage and error of one output line"""
+        response = row.get("response") or {}
+        body = response.get("body") or {}
+
+        if row.get("error") or response.get("status_code", 200) != 200:
+            error = row.get("error") or body.get("error") or {"message": f"HTTP {response.get('status_code')}"}
+            return {"text": None, "usage": {}, "error": error.get("message", str(error))}
+
+        message = body["choices"][0]["message"]
+        if message.get("refusal"):
+            return {"text": None, "usage": body.get("usage", {}), "error": f"Model refused the request: {message['refusal']}"}
+
+        return {"text": message.get("content") or "", "usage": body.get("usage", {}), "error": None}
+
+    def run(
+        self,
+        requests: Dict[str, Dict[str, Any]],
+        description: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Write, submit and wait for the batches of a request set, then return their results
+
+        Requests are split to fit the input-file limits (see
+        split_requests); all parts are submitted before waiting, so they
+        run side by side. A part that fails to submit or to complete is
+        logged and its requests are left out of the results; the parts
+        already submitted are still waited for. Input files hold the full
+        request bodies (prescription images included) and are deleted
+        once uploaded.
+
+        Args:
+            requests: {custom_id: chat completions request body}
+            description: Optional batch description
+
+        Returns:
+            {custom_id: result} as from fetch_results
+        """
+        chunks = self.split_requests(requests)
+        if len(chunks) > 1:
+            logger.info(f"Splitting {len(requests)} batch requests into {len(chunks)} input files")
+
+        batch_ids = []
+        for part, chunk in enumerate(chunks):
+            path = self.new_batch_path(part)
+            part_description = f"{description} part {part + 1}/{len(chunks)}" if description and len(chunks) > 1 else description
+            try:
+                self.write_requests(chunk, path)
+                batch_ids.append(self.submit(path, part_description))
+            except Exception as e:
+                logger.error(
+                    f"Submitting batch part {part + 1}/{len(chunks)} failed: {e} - "
+                    f"its {len(chunk)} requests will be processed interactively"
+                )
+            finally:
+                path.unlink(missing_ok=True)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for batch_id in batch_ids:
+            try:
+                results.update(self.fetch_results(self.wait(batch_id)))
+            except Exception as e:
+                logger.error(f"Collecting batch {batch_id} failed: {e} - its requests will be processed interactively")
+
+        missing = set(requests) - set(results)
+        if missing:
+            logger.warning(f"Batches returned no result for {len(missing)} of {len(requests)} requests")
+
+        return results
@@ -0,0 +1,351 @@
+"""
+DocuVault - Local Batch API Server
+Stand-in for the OpenAI Files and Batches endpoints, for testing deferred processing offline
+
+Run with:
+    python -m extraction.batch_server --port 8765
+
+and point Config.LLM_BATCH_BASE_URL (or BatchClient(base_url=...)) at
+http://127.0.0.1:8765/v1. Chat completion requests are answered with a
+minimal valid instance of their response_format schema (empty strings,
+nulls and empty arrays), so the whole submit/poll/merge flow runs end to
+end without network access or an API key.
+"""
+import argparse
+import email.policy
+import json
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+
+def sample_from_schema(schema: Dict[str, Any]) -> Any:
+    """
+    Smallest valid instance of a JSON schema
+
+    Args:
+        schema: JSON schema (strict-mode subset, $refs inlined)
+
+    Returns:
+        Instance using null for nullable values, the first enum value,
+        empty strings/arrays and zeros
+    """
+    if "anyOf" in schema:
+        branches = schema["anyOf"]
+        if any(branch.get("type") == "null" for branch in branches):
+            return None
+        return sample_from_schema(branches[0])
+
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = "null" if "null" in schema_type else schema_type[0]
+
+    if schema_type == "object":
+        return {name: sample_from_schema(prop) for name, prop in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return []
+    if schema_type == "string":
+        return ""
+    if schema_type in ("integer", "number"):
+        return 0
+    if schema_type == "boolean":
+        return False
+    return None
+
+
+def complete_locally(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Answer a chat completion request body
+
+    Args:
+        body: Chat completions request body
+
+    Returns:
+        Chat completion response body
+    """
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        content = json.dumps(sample_from_schema(response_format["json_schema"]["schema"]))
+    elif response_format.get("type") == "json_object":
+        content = "{}"
+    else:
+        content = ""
+
+    prompt_tokens = len(json.dumps(body.get("messages", []))) // 4
+    completion_tokens = len(content) // 4
+
+    return {
+        "id": f"chatcmpl-local-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", ""),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content, "refusal": None},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0}
+        }
+    }
+
+
+class BatchStore:
+    """In-memory files and batches of the stand-in server"""
+
+    def __init__(self, delay: float = 1.0):
+        """
+        Args:
+            delay: Seconds a batch stays in progress before completing
+        """
+        self.delay = delay
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add_file(self, filename: str, purpose: str, content: bytes) -> Dict[str, Any]:
+        """Store an uploaded file and return its file object"""
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        file_object = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed"
+        }
+        with self._lock:
+            self.files[file_id] = file_object
+            self.contents[file_id] = content
+        return file_object
+
+    def create_batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a batch and start processing it in the background"""
+        if payload.get("input_file_id") not in self.contents:
+            raise KeyError(f"No such file: {payload.get('input_file_id')}")
+
+        now = int(time.time())
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": payload.get("endpoint", "/v1/chat/completions"),
+            "errors": None,
+            "input_file_id": payload["input_file_id"],
+            "completion_window": payload.get("completion_window", "24h"),
+            "status": "validating",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": now,
+            "in_progress_at": None,
+            "expires_at": now + 24 * 3600,
+            "completed_at": None,
+            "failed_at": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            "metadata": payload.get("metadata")
+        }
+        with self._lock:
+            self.batches[batch["id"]] = batch
+
+        threading.Thread(target=self._run_batch, args=(batch["id"],), daemon=True).start()
+        return batch
+
+    def _run_batch(self, batch_id: str):
+        """Answer every request of a batch and publish the output file"""
+        batch = self.batches[batch_id]
+        lines = self.contents[batch["input_file_id"]].decode("utf-8").splitlines()
+
+        with self._lock:
+            batch["status"] = "in_progress"
+            batch["in_progress_at"] = int(time.time())
+            batch["request_counts"]["total"] = len([line for line in lines if line.strip()])
+
+        time.sleep(self.delay)
+
+        outputs, errors = [], []
+        for line in lines:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            custom_id = request.get("custom_id")
+            try:
+                body = complete_locally(request["body"])
+                outputs.append({
+                    "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                    "custom_id": custom_id,
+                    "response": {"status_code": 200, "request_id": uuid.uuid4().hex, "body": body},
+                    "error": None
+                })
+            except Exception as e:
+                errors.append({
+                    "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                    "custom_id": custom_id,
+                    "response": None,
+                    "error": {"code": "invalid_request", "message": str(e)}
+                })
+
+        output_file = self.add_file(f"{batch_id}_output.jsonl", "batch_output", self._jsonl(outputs))
+        error_file = self.add_file(f"{batch_id}_errors.jsonl", "batch_output", self._jsonl(errors)) if errors else None
+
+        with self._lock:
+            batch["status"] = "completed"
+            batch["completed_at"] = int(time.time())
+            batch["output_file_id"] = output_file["id"]
+            batch["error_file_id"] = error_file["id"] if error_file else None
+            batch["request_counts"]["completed"] = len(outputs)
+            batch["request_counts"]["failed"] = len(errors)
+
+        logger.info(f"Local batch {batch_id} completed: {len(outputs)} ok, {len(errors)} failed")
+
+    @staticmethod
+    def _jsonl(rows) -> bytes:
+        return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+class BatchRequestHandler(BaseHTTPRequestHandler):
+    """Routes the Files/Batches subset used by BatchClient"""
+
+    store: BatchStore = None  # Set by make_server
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"batch server: {format % args}")
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json(status, {"error": {"message": message, "type": "invalid_request_error"}})
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+
+        if path == "/v1/files":
+            form = self._parse_multipart(self._read_body())
+            if "file" not in form:
+                return self._send_error(400, "Missing file")
+            filename, content = form["file"]
+            purpose = form.get("purpose", (None, b"batch"))[1].decode("utf-8")
+            return self._send_json(200, self.store.add_file(filename or "upload.jsonl", purpose, content))
+
+        if path == "/v1/batches":
+            try:
+                return self._send_json(200, self.store.create_batch(json.loads(self._read_body() or b"{}")))
+            except (KeyError, ValueError) as e:
+                return self._send_error(400, str(e))
+
+        self._send_error(404, f"Unknown endpoint: POST {self.path}")
+
+    def do_GET(self):
+        path = self.path.split("?")[0].rstrip("/")
+
+        match = re.fullmatch(r"/v1/batches/([\w-]+)", path)
+        if match:
+            batch = self.store.batches.get(match.group(1))
+            return self._send_json(200, batch) if batch else self._send_error(404, "No such batch")
+
+        match = re.fullmatch(r"/v1/files/([\w-]+)/content", path)
+        if match:
+            content = self.store.contents.get(match.group(1))
+            if content is None:
+                return self._send_error(404, "No such file")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+            return
+
+        match = re.fullmatch(r"/v1/files/([\w-]+)", path)
+        if match:
+            file_object = self.store.files.get(match.group(1))
+            return self._send_json(200, file_object) if file_object else self._send_error(404, "No such file")
+
+        self._send_error(404, f"Unknown endpoint: GET {self.path}")
+
+    def _parse_multipart(self, body: bytes) -> Dict[str, Tuple[Optional[str], bytes]]:
+        """Fields of a multipart/form-data body as {name: (filename, content)}"""
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode("utf-8")
+        message = BytesParser(policy=email.policy.HTTP).parsebytes(header + body)
+
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name:
+                fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+        return fields
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, delay: float = 1.0) -> ThreadingHTTPServer:
+    """
+    Create the stand-in server (call serve_forever, or start_server for a background thread)
+
+    Args:
+        host: Bind address
+        port: Port (0 picks a free one)
+        delay: Seconds each batch stays in progress
+
+    Returns:
+        Server instance
+    """
+    handler = type("Handler", (BatchRequestHandler,), {"store": BatchStore(delay)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, delay: float = 0.5) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Run the stand-in server in a daemon thread
+
+    Args:
+        host: Bind address
+        port: Port (0 picks a free one)
+        delay: Seconds each batch stays in progress
+
+    Returns:
+        Tuple of (server, base_url) - stop it with server.shutdown()
+    """
+    server = make_server(host, port, delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}/v1"
+    logger.info(f"Local batch server listening on {base_url}")
+    return server, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI Files/Batches API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds each batch stays in progress")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.delay)
+    logger.info(f"Local batch server listening on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
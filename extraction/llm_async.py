@@ -0,0 +1,173 @@
+"""
+DocuVault - Async LLM Helpers
+Per-event-loop async clients and the process-wide LLM concurrency limit
+"""
+import asyncio
+import threading
+import weakref
+from collections import deque
+from typing import Awaitable, Callable, Deque, Generic, Optional, Tuple, TypeVar
+
+from core.config import Config
+
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """
+    Lazily create one object per running event loop
+
+    asyncio primitives and the SDKs' async HTTP connection pools are bound
+    to the loop they were first used on, so callers that run several loops
+    (e.g. repeated asyncio.run from Streamlit callbacks or worker threads)
+    need a separate instance for each.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Args:
+            factory: Builds the object for a new loop
+        """
+        self.factory = factory
+        self._instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Instance for the running loop (must be called from a coroutine)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            instance = self._instances.get(loop)
+            if instance is None:
+                instance = self.factory()
+                self._instances[loop] = instance
+            return instance
+
+
+class BackgroundLoop:
+    """
+    One long-lived event loop on a daemon thread, for sync callers of async code
+
+    asyncio.run per call would create a new loop each time, and with it a
+    new set of async SDK clients (see LoopLocal) whose connection pools are
+    never closed. Coroutines submitted here all run on the same loop, so
+    its clients are built once and reused for the life of the process.
+    """
+
+    def __init__(self, name: str = "docuvault-async"):
+        """
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """The background loop, started on first use"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name=self.name, daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coroutine: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the background loop and wait for its result
+
+        Args:
+            coroutine: Coroutine to run
+
+        Returns:
+            The coroutine's result (its exception is re-raised)
+        """
+        loop = self.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            coroutine.close()
+            raise RuntimeError("BackgroundLoop.run called from the background loop itself - await the coroutine instead")
+
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+
+class ProcessSemaphore:
+    """
+    Async semaphore shared by every event loop and thread in the process
+
+    asyncio.Semaphore is bound to one loop, so callers running separate
+    loops (asyncio.run per request, worker threads) would each get their
+    own slots. Here the count lives behind a threading lock; a waiter
+    parks on a future of its own loop and is woken with
+    call_soon_threadsafe when a slot is handed to it.
+    """
+
+    def __init__(self, value: int):
+        """
+        Args:
+            value: Number of concurrent holders
+        """
+        self._value = value
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        """Wait for a slot"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was already handed to this waiter: pass it on
+            self.release()
+            raise
+
+    def release(self):
+        """Free a slot, handing it straight to the oldest waiter if there is one"""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(_grant, future)
+                    return
+            self._value += 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+def _grant(future: asyncio.Future):
+    """Wake a ProcessSemaphore waiter (runs on the waiter's loop)"""
+    if not future.done():
+        future.set_result(None)
+
+
+# Process-wide cap on in-flight async LLM requests, shared by all extractors and event loops
+_llm_semaphore = ProcessSemaphore(Config.LLM_MAX_CONCURRENCY)
+
+
+def llm_semaphore() -> ProcessSemaphore:
+    """Semaphore limiting concurrent async LLM calls to Config.LLM_MAX_CONCURRENCY"""
+    return _llm_semaphore
+
+
+# Loop shared by sync wrappers around the async LLM paths
+background_loop = BackgroundLoop()
@@ -0,0 +1,327 @@
+"""
+DocuVault - LLM Response Cache
+SQLite-backed cache for LLM responses with TTL and size-based eviction
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from loguru import logger
+
+from core.config import Config
+
+
+T = TypeVar("T")
+
+
+class LLMCache:
+    """
+    Persistent cache of LLM responses
+
+    Entries are keyed by provider, model, temperature, the prompt template
+    version (Config.LLM_CACHE_PROMPT_VERSION) and a hash of the full request
+    body - prompt text and any inline image bytes included - so identical
+    requests are answered from disk instead of the API. Entries expire
+    after a TTL; when the stored responses grow past the size cap the least
+    recently used ones are removed first.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        )
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_hours: Optional[float] = None,
+        max_size_mb: Optional[float] = None
+    ):
+        """
+        Initialize LLM cache
+
+        Args:
+            db_path: SQLite file (defaults to Config.LLM_CACHE_PATH)
+            ttl_hours: Entry lifetime (defaults to Config.LLM_CACHE_TTL_HOURS)
+            max_size_mb: Size cap for stored responses (defaults to Config.LLM_CACHE_MAX_MB)
+        """
+        self.db_path = Path(db_path or Config.LLM_CACHE_PATH)
+        self.ttl = (ttl_hours or Config.LLM_CACHE_TTL_HOURS) * 3600
+        self.max_bytes = int((max_size_mb or Config.LLM_CACHE_MAX_MB) * 1024 * 1024)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self.SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+
+        logger.debug(f"LLM cache at {self.db_path} (ttl {self.ttl / 3600:.0f}h, cap {self.max_bytes / (1024 * 1024):.0f}MB)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection (one per operation, so the cache is safe to share across threads)
+
+        The connection's context manager only commits or rolls back, so
+        callers wrap it in contextlib.closing to release the file handle.
+        """
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def make_key(self, provider: str, request: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a request
+
+        Args:
+            provider: "openai" or "anthropic"
+            request: Full request body (model, temperature, messages, ...)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        body_hash = hashlib.sha256(
+            json.dumps(request, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+        return hashlib.sha256(json.dumps({
+            "provider": provider,
+            "model": request.get("model"),
+            "temperature": request.get("temperature"),
+            "prompt_version": Config.LLM_CACHE_PROMPT_VERSION,
+            "request": body_hash
+        }, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Response text, or None on miss (expired entries and cache
+            read errors count as misses)
+        """
+        now = time.time()
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row and now - row[1] > self.ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                elif row:
+                    conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            # A locked or damaged cache must not fail the extraction; the API answers instead
+            logger.warning(f"Failed to read LLM cache entry: {e}")
+            row = None
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return row[0] if row else None
+
+    def put(self, key: str, provider: str, model: str, response: str):
+        """
+        Store a response
+
+        Args:
+            key: Cache key from make_key
+            provider: Provider name
+            model: Model name
+            response: Response text
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, provider, model, response, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, response, size, now, now)
+                )
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write LLM cache entry: {e}")
+            return
+
+        if total > self.max_bytes:
+            self.evict()
+
+    def delete(self, key: str):
+        """Remove one entry (e.g. a cached response that no longer parses)"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under 90% of the cap"""
+        target = int(self.max_bytes * 0.9)
+
+        with closing(self._connect()) as conn, conn:
+            expired = conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            removed_keys = []
+            if total > target:
+                for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                    if total <= target:
+                        break
+                    removed_keys.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM responses WHERE key = ?", removed_keys)
+
+        logger.info(
+            f"LLM cache eviction removed {expired} expired and {len(removed_keys)} LRU entries "
+            f"({total / (1024 * 1024):.1f}MB left)"
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process plus the stored entry count"""
+        with closing(self._connect()) as conn, conn:
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self):
+        """Remove every entry"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses")
+
+
+def _lookup(provider: str, request: Dict[str, Any], use_cache: bool) -> Optional[str]:
+    """Cache key for a request, or None when caching is off for this call"""
+    if not (use_cache and llm_cache):
+        return None
+    return llm_cache.make_key(provider, request)
+
+
+def cached_completion(
+    provider: str,
+    request: Dict[str, Any],
+    call: Callable[[], str],
+    parse: Callable[[str], T],
+    use_cache: bool = True,
+    call_info: Optional[Dict[str, Any]] = None
+) -> T:
+    """
+    Answer an LLM request from the cache, or call the API and cache the response
+
+    Only responses that parse are stored, so a malformed answer is retried
+    against the API next time instead of being replayed from the cache.
+
+    Args:
+        provider: Provider name
+        request: Request body (used for the cache key)
+        call: Performs the API call and returns the response text
+        parse: Turns response text into the caller's result; raises on bad responses
+        use_cache: False to bypass the cache for this call
+        call_info: Optional dict that receives "cache_hit"
+
+    Returns:
+        Parsed result
+    """
+    key = _lookup(provider, request, use_cache)
+
+    if key:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            try:
+                result = parse(cached)
+                logger.info(f"LLM cache hit ({provider}/{request.get('model')})")
+                if call_info is not None:
+                    call_info["cache_hit"] = True
+                return result
+            except Exception:
+                llm_cache.delete(key)
+
+    if call_info is not None:
+        call_info["cache_hit"] = False
+
+    response_text = call()
+    result = parse(response_text)
+
+    if key:
+        llm_cache.put(key, provider, request.get("model", ""), response_text)
+
+    return result
+
+
+async def cached_completion_async(
+    provider: str,
+    request: Dict[str, Any],
+    call: Callable[[], Awaitable[str]],
+    parse: Callable[[str], T],
+    use_cache: bool = True,
+    call_info: Optional[Dict[str, Any]] = None
+) -> T:
+    """
+    Async variant of cached_completion (SQLite access runs in a worker thread)
+
+    Args:
+        provider: Provider name
+        request: Request body (used for the cache key)
+        call: Coroutine function performing the API call and returning the response text
+        parse: Turns response text into the caller's result; raises on bad responses
+        use_cache: False to bypass the cache for this call
+        call_info: Optional dict that receives "cache_hit"
+
+    Returns:
+        Parsed result
+    """
+    key = _lookup(provider, request, use_cache)
+
+    if key:
+        cached = await asyncio.to_thread(llm_cache.get, key)
+        if cached is not None:
+            try:
+                result = parse(cached)
+                logger.info(f"LLM cache hit ({provider}/{request.get('model')})")
+                if call_info is not None:
+                    call_info["cache_hit"] = True
+                return result
+            except Exception:
+                await asyncio.to_thread(llm_cache.delete, key)
+
+    if call_info is not None:
+        call_info["cache_hit"] = False
+
+    response_text = await call()
+    result = parse(response_text)
+
+    if key:
+        await asyncio.to_thread(llm_cache.put, key, provider, request.get("model", ""), response_text)
+
+    return result
+
+
+# Global cache instance
+try:
+    llm_cache = LLMCache() if Config.LLM_CACHE_ENABLED else None
+except Exception as e:
+    logger.warning(f"Failed to initialize LLM cache: {e}")
+    llm_cache = None
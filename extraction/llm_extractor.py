@@ -5,14 +5,152 @@ Advanced document extraction using LLMs
 import json
 import re
 import time
-from typing import Dict, Any, Optional, Tuple
-from openai import OpenAI
-from anthropic import Anthropic
+from typing import Dict, Any, List, Optional, Tuple
+from openai import OpenAI, AsyncOpenAI
+from anthropic import Anthropic, AsyncAnthropic
 from loguru import logger
 from pydantic import ValidationError
 
 from core.config import Config
+from extraction.llm_async import LoopLocal, llm_semaphore
+from extraction.llm_cache import cached_completion, cached_completion_async
+from extraction.rate_limiter import rate_limiter
 from extraction.schema import ExtractedPrescription
+from extraction.structured_output import (
+    PACKED_PRESCRIPTION_JSON_SCHEMA,
+    PRESCRIPTION_JSON_SCHEMA,
+    anthropic_tool,
+    openai_response_format
+)
+from extraction.text_compaction import text_compactor
+
+
+EXTRACTION_SCHEMA_EXAMPLE = {
+    "document_type": "prescription",
+    "prescription_type": "printed",
+    "prescription_number": "OPD6",
+    "issue_date": "2023-08-30",
+    "patient": {
+        "name": "Patient Name",
+        "age": "13 Y",
+        "gender": "M",
+        "address": "PUNE",
+        "phone": "9423380390",
+        "patient_id": "11"
+    },
+    "doctor": {
+        "name": "Dr. Akshara",
+        "title": "M.S.",
+        "specialty": None,
+        "license_number": "MMC 2018",
+        "phone": "5465647658"
+    },
+    "hospital": {
+        "name": "SMS hospital",
+        "department": None,
+        "address": "B/503, Business Center, MG Road, Pune - 411000",
+        "phone": "5465647658"
+    },
+    "diagnosis": "MALARIA",
+    "medications": [
+        {
+            "name": "TAB. ABCIXIMAB",
+            "dosage": None,
+            "quantity": "8 Tab",
+            "frequency": "1 Morning",
+            "duration": "8 Days",
+            "instructions": None
+        }
+    ],
+    "notes": "TAKE BED REST, DO NOT EAT OUTSIDE FOOD",
+    "follow_up_date": "2023-09-04"
+}
+
+# Static instructions and schema, built once so every request starts with a
+# byte-identical prefix that the providers' prompt caches can reuse
+EXTRACTION_SYSTEM_PROMPT = f"""You are a precise document extraction system and an expert medical document parser specialized in extracting structured data from medical prescriptions.
+
+TASK: Extract ALL relevant information from the OCR text in the user message into a structured JSON format.
+
+RULES:
+1. Return ONLY valid JSON - no markdown, no explanations, no preamble
+2. Use null for missing/unknown fields
+3. CRITICAL: Convert ALL dates to YYYY-MM-DD format (e.g., "30-Aug-2023" becomes "2023-08-30", "04-09-2023" becomes "2023-09-04")
+4. Extract patient information: name, age, gender, address, phone, patient_id
+5. Extract doctor information: name, title, specialty, license_number, phone
+6. Extract hospital/clinic information: name, department, address, phone
+7. Extract diagnosis if present
+8. Extract ALL medications with: name, dosage, quantity, frequency, duration, instructions
+9. CRITICAL: Extract "Advice" section into "notes" field - this includes any instructions like "TAKE BED REST", dietary advice, etc.
+10. CRITICAL: Extract "Follow Up" date into "follow_up_date" field in YYYY-MM-DD format
+11. Be thorough - capture ALL information present
+
+EXPECTED JSON SCHEMA:
+{json.dumps(EXTRACTION_SCHEMA_EXAMPLE, indent=2)}
+
+IMPORTANT:
+- "document_type" should be "prescription"
+- Extract ALL patient, doctor, and hospital information visible
+- ALL dates MUST be in YYYY-MM-DD format (convert from any format like DD-Mon-YYYY or DD-MM-YYYY)
+- For medications array, include EVERY medication found with all details
+- The "notes" field should contain ALL advice/instructions from the "Advice:" section
+- The "follow_up_date" field should contain the follow-up date from "Follow Up:" section"""
+
+
+def record_usage(response, call_info: Optional[Dict[str, Any]]):
+    """
+    Copy token usage from an OpenAI or Anthropic response into call_info
+
+    cached_tokens counts prompt tokens served from the provider's prefix
+    cache (OpenAI prompt_tokens_details.cached_tokens, Anthropic
+    cache_read_input_tokens); for Anthropic input_tokens includes the
+    cached and cache-written tokens so both providers report the same total.
+
+    Args:
+        response: SDK response object
+        call_info: Dict to update (ignored when None)
+    """
+    usage = getattr(response, "usage", None)
+    if call_info is None or usage is None:
+        return
+
+    if hasattr(usage, "prompt_tokens"):
+        details = getattr(usage, "prompt_tokens_details", None)
+        input_tokens = usage.prompt_tokens or 0
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+    else:
+        cached_tokens = getattr(usage, "cache_read_input_tokens", None) or 0
+        input_tokens = (
+            (usage.input_tokens or 0) + cached_tokens
+            + (getattr(usage, "cache_creation_input_tokens", None) or 0)
+        )
+
+    call_info["input_tokens"] = input_tokens
+    call_info["cached_tokens"] = cached_tokens
+    logger.debug(f"LLM usage: {input_tokens} input tokens, {cached_tokens} from prompt cache")
+
+
+def split_usage(tokens: int, weights: List[int]) -> List[int]:
+    """
+    Split a packed request's token count across its documents
+
+    Args:
+        tokens: Token count of the whole request
+        weights: Share of each document (e.g. its OCR text tokens)
+
+    Returns:
+        Token count per document, proportional to weights and summing to tokens
+    """
+    if sum(weights) <= 0:
+        weights = [1] * len(weights)
+    total = sum(weights)
+
+    shares = [tokens * weight // total for weight in weights]
+    # Hand the rounding remainder to the largest fractional parts
+    by_remainder = sorted(range(len(weights)), key=lambda k: (tokens * weights[k]) % total, reverse=True)
+    for k in by_remainder[:tokens - sum(shares)]:
+        shares[k] += 1
+    return shares
 
 
 class LLMExtractor:
@@ -26,17 +164,21 @@ class LLMExtractor:
             provider: "openai" or "anthropic"
         """
         self.provider = provider
+        self.structured_output = Config.LLM_STRUCTURED_OUTPUT
         
         if provider == "openai":
             if not Config.OPENAI_API_KEY:
                 raise ValueError("OPENAI_API_KEY not configured")
-            self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+            # Retries are handled by the shared rate limiter, not the SDK
+            self.client = OpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0)
+            self.async_client = LoopLocal(lambda: AsyncOpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0))
             self.model = Config.DEFAULT_LLM_MODEL
             
         elif provider == "anthropic":
             if not Config.ANTHROPIC_API_KEY:
                 raise ValueError("ANTHROPIC_API_KEY not configured")
-            self.client = Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+            self.client = Anthropic(api_key=Config.ANTHROPIC_API_KEY, max_retries=0)
+            self.async_client = LoopLocal(lambda: AsyncAnthropic(api_key=Config.ANTHROPIC_API_KEY, max_retries=0))
             self.model = "claude-3-5-sonnet-20241022"
             
         else:
@@ -46,96 +188,46 @@ class LLMExtractor:
     
     def build_extraction_prompt(self, ocr_text: str, document_type: Optional[str] = None) -> str:
         """
-        Build extraction prompt with schema
+        Build the per-document part of the extraction prompt
+        
+        The instructions and schema are the static EXTRACTION_SYSTEM_PROMPT
+        sent ahead of this text, so only the OCR text changes between requests.
         
         Args:
             ocr_text: OCR extracted text
             document_type: Optional document type hint
             
         Returns:
-            Formatted prompt
+            User turn text
         """
-        schema_example = {
-            "document_type": "prescription",
-            "prescription_type": "printed",
-            "prescription_number": "OPD6",
-            "issue_date": "2023-08-30",
-            "patient": {
-                "name": "Patient Name",
-                "age": "13 Y",
-                "gender": "M",
-                "address": "PUNE",
-                "phone": "9423380390",
-                "patient_id": "11"
-            },
-            "doctor": {
-                "name": "Dr. Akshara",
-                "title": "M.S.",
-                "specialty": None,
-                "license_number": "MMC 2018",
-                "phone": "5465647658"
-            },
-            "hospital": {
-                "name": "SMS hospital",
-                "department": None,
-                "address": "B/503, Business Center, MG Road, Pune - 411000",
-                "phone": "5465647658"
-            },
-            "diagnosis": "MALARIA",
-            "medications": [
-                {
-                    "name": "TAB. ABCIXIMAB",
-                    "dosage": None,
-                    "quantity": "8 Tab",
-                    "frequency": "1 Morning",
-                    "duration": "8 Days",
-                    "instructions": None
-                }
-            ],
-            "notes": "TAKE BED REST, DO NOT EAT OUTSIDE FOOD",
-            "follow_up_date": "2023-09-04"
-        }
-
-        type_hint = f"\nDocument type hint: {document_type}" if document_type else ""
-
-        prompt = f"""You are an expert medical document parser specialized in extracting structured data from medical prescriptions.
-
-TASK: Extract ALL relevant information from the OCR text below into a structured JSON format.
-
-RULES:
-1. Return ONLY valid JSON - no markdown, no explanations, no preamble
-2. Use null for missing/unknown fields
-3. CRITICAL: Convert ALL dates to YYYY-MM-DD format (e.g., "30-Aug-2023" becomes "2023-08-30", "04-09-2023" becomes "2023-09-04")
-4. Extract patient information: name, age, gender, address, phone, patient_id
-5. Extract doctor information: name, title, specialty, license_number, phone
-6. Extract hospital/clinic information: name, department, address, phone
-7. Extract diagnosis if present
-8. Extract ALL medications with: name, dosage, quantity, frequency, duration, instructions
-9. CRITICAL: Extract "Advice" section into "notes" field - this includes any instructions like "TAKE BED REST", dietary advice, etc.
-10. CRITICAL: Extract "Follow Up" date into "follow_up_date" field in YYYY-MM-DD format
-11. Be thorough - capture ALL information present{type_hint}
-
-EXPECTED JSON SCHEMA:
-{json.dumps(schema_example, indent=2)}
-
-IMPORTANT:
-- "document_type" should be "prescription"
-- Extract ALL patient, doctor, and hospital information visible
-- ALL dates MUST be in YYYY-MM-DD format (convert from any format like DD-Mon-YYYY or DD-MM-YYYY)
-- For medications array, include EVERY medication found with all details
-- The "notes" field should contain ALL advice/instructions from the "Advice:" section
-- The "follow_up_date" field should contain the follow-up date from "Follow Up:" section
+        type_hint = f"Document type hint: {document_type}\n\n" if document_type else ""
 
-OCR TEXT:
+        return f"""{type_hint}OCR TEXT:
 {ocr_text}
 
 Return the extracted data as JSON:"""
+    
+    def decode_json(self, text: str) -> Dict[str, Any]:
+        """
+        Decode the JSON document in an LLM response
+
+        In structured-output mode the response is the JSON document itself
+        and is decoded in a single pass; otherwise it is scraped out of the
+        free text.
+
+        Args:
+            text: LLM response text
 
-        return prompt
+        Returns:
+            Parsed JSON dict
+        """
+        if self.structured_output:
+            return json.loads(text)
+        return self.extract_json_from_response(text)
     
     def extract_json_from_response(self, text: str) -> Dict[str, Any]:
         """
-        Extract JSON from LLM response
+        Extract JSON from free-text LLM response (non-structured mode)
         
         Args:
             text: LLM response text
@@ -155,46 +247,373 @@ Return the extracted data as JSON:"""
         
         raise ValueError("No valid JSON found in LLM response")
     
-    def call_openai(self, prompt: str) -> str:
-        """Call OpenAI API"""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
+    def build_packed_prompt(self, ocr_texts: List[str], document_type: Optional[str] = None) -> str:
+        """
+        Build the per-request part of a prompt carrying several documents
+        
+        The static system prefix is the same as for single documents, so
+        packed and single requests share the provider's prompt cache.
+        
+        Args:
+            ocr_texts: OCR text of each document
+            document_type: Optional document type hint
+            
+        Returns:
+            User turn text
+        """
+        type_hint = f"Document type hint: {document_type}\n\n" if document_type else ""
+        documents = "\n\n".join(
+            f'<document id="{i}">\n{text}\n</document>' for i, text in enumerate(ocr_texts, 1)
+        )
+
+        return f"""{type_hint}The OCR texts of {len(ocr_texts)} separate documents follow, each enclosed in <document id="N"> tags.
+Extract every document on its own - never mix information between documents - and return
+{{"documents": [...]}} with exactly one object per document, in the same order, each with
+"document_id" set to the id of its <document> tag.
+
+{documents}
+
+Return the extracted data as JSON:"""
+    
+    def build_openai_request(self, prompt: str, packed: bool = False, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Request body for the OpenAI chat completions API (packed: several documents per response)"""
+        request = {
+            "model": self.model,
+            "messages": [
                 {
                     "role": "system",
-                    "content": "You are a precise document extraction system. Return only valid JSON."
+                    "content": EXTRACTION_SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
                     "content": prompt
                 }
             ],
-            temperature=Config.LLM_TEMPERATURE,
-            max_tokens=Config.LLM_MAX_TOKENS
-        )
-        
-        return response.choices[0].message.content or ""
+            "temperature": Config.LLM_TEMPERATURE,
+            "max_tokens": max_tokens or Config.LLM_MAX_TOKENS
+        }
+        if self.structured_output and packed:
+            request["response_format"] = openai_response_format("extracted_prescriptions", PACKED_PRESCRIPTION_JSON_SCHEMA)
+        elif self.structured_output:
+            request["response_format"] = openai_response_format("extracted_prescription", PRESCRIPTION_JSON_SCHEMA)
+        return request
     
-    def call_anthropic(self, prompt: str) -> str:
-        """Call Anthropic API"""
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=Config.LLM_MAX_TOKENS,
-            temperature=Config.LLM_TEMPERATURE,
-            messages=[
+    def build_anthropic_request(self, prompt: str, packed: bool = False, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Request body for the Anthropic messages API (static prefix marked for prompt caching)"""
+        request = {
+            "model": self.model,
+            "max_tokens": max_tokens or Config.LLM_MAX_TOKENS,
+            "temperature": Config.LLM_TEMPERATURE,
+            "system": [
+                {
+                    "type": "text",
+                    "text": EXTRACTION_SYSTEM_PROMPT,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "messages": [
                 {
                     "role": "user",
                     "content": prompt
                 }
             ]
+        }
+        if self.structured_output and packed:
+            request.update(anthropic_tool(
+                "record_prescriptions",
+                "Record the data extracted from each prescription",
+                PACKED_PRESCRIPTION_JSON_SCHEMA
+            ))
+        elif self.structured_output:
+            request.update(anthropic_tool(
+                "record_prescription",
+                "Record the data extracted from the prescription",
+                PRESCRIPTION_JSON_SCHEMA
+            ))
+        return request
+    
+    def build_request(self, prompt: str, packed: bool = False, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Request body for the configured provider"""
+        if self.provider == "openai":
+            return self.build_openai_request(prompt, packed, max_tokens)
+        return self.build_anthropic_request(prompt, packed, max_tokens)
+    
+    def openai_response_text(self, response) -> str:
+        """Response text of a chat completion (raises if the model refused)"""
+        message = response.choices[0].message
+        if getattr(message, "refusal", None):
+            raise ValueError(f"Model refused the request: {message.refusal}")
+        return message.content or ""
+    
+    def anthropic_response_text(self, response) -> str:
+        """Response text of a message; in structured-output mode the forced tool call's input as JSON"""
+        for block in response.content:
+            if self.structured_output and block.type == "tool_use":
+                return json.dumps(block.input)
+            if not self.structured_output and block.type == "text":
+                return block.text
+        raise ValueError(f"No {'tool_use' if self.structured_output else 'text'} block in Anthropic response")
+    
+    def send(self, request: Dict[str, Any], call_info: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Send a request body to the configured provider
+
+        Rate limited by the shared limiter; transient failures are retried
+        with backoff.
+
+        Args:
+            request: Body from build_request
+            call_info: Optional dict that receives token usage
+
+        Returns:
+            Response text
+        """
+        if self.provider == "openai":
+            response = rate_limiter.call(request, lambda: self.client.chat.completions.create(**request))
+            record_usage(response, call_info)
+            return self.openai_response_text(response)
+
+        response = rate_limiter.call(request, lambda: self.client.messages.create(**request))
+        record_usage(response, call_info)
+        return self.anthropic_response_text(response)
+    
+    def call_openai(self, prompt: str, call_info: Optional[Dict[str, Any]] = None) -> str:
+        """Call OpenAI API (rate limited, transient failures retried with backoff)"""
+        return self.send(self.build_openai_request(prompt), call_info)
+    
+    def call_anthropic(self, prompt: str, call_info: Optional[Dict[str, Any]] = None) -> str:
+        """Call Anthropic API (rate limited, transient failures retried with backoff)"""
+        return self.send(self.build_anthropic_request(prompt), call_info)
+    
+    async def call_openai_async(self, prompt: str, call_info: Optional[Dict[str, Any]] = None) -> str:
+        """Call OpenAI API without blocking (bounded by the global LLM concurrency limit)"""
+        request = self.build_openai_request(prompt)
+
+        async def send():
+            async with llm_semaphore():
+                return await self.async_client.get().chat.completions.create(**request)
+
+        response = await rate_limiter.call_async(request, send)
+        record_usage(response, call_info)
+        return self.openai_response_text(response)
+    
+    async def call_anthropic_async(self, prompt: str, call_info: Optional[Dict[str, Any]] = None) -> str:
+        """Call Anthropic API without blocking (bounded by the global LLM concurrency limit)"""
+        request = self.build_anthropic_request(prompt)
+
+        async def send():
+            async with llm_semaphore():
+                return await self.async_client.get().messages.create(**request)
+
+        response = await rate_limiter.call_async(request, send)
+        record_usage(response, call_info)
+        return self.anthropic_response_text(response)
+    
+    def parse_document(self, response_text: str, start_time: float) -> ExtractedPrescription:
+        """
+        Turn an LLM response into a validated document
+        
+        Args:
+            response_text: LLM response text
+            start_time: Extraction start (for the log line)
+            
+        Returns:
+            ExtractedPrescription
+            
+        Raises:
+            ValueError: If the response holds no valid JSON
+            ValidationError: If the JSON doesn't match the schema
+        """
+        # Decode JSON
+        raw_json = self.decode_json(response_text)
+        
+        # Validate with Pydantic
+        document = ExtractedPrescription(**raw_json)
+        
+        logger.success(
+            f"Extraction completed: type={document.document_type}, "
+            f"medications={len(document.medications)}, time={time.time() - start_time:.2f}s"
         )
         
-        return response.content[0].text
+        return document
+    
+    def parse_packed(self, response_text: str, count: int) -> List[Optional[ExtractedPrescription]]:
+        """
+        Turn a packed response into one validated document per input
+        
+        Each element is validated on its own; elements that are missing,
+        duplicated, invalid or come back as document_type "unknown" are
+        left as None for the caller to redo individually.
+        
+        Args:
+            response_text: LLM response text
+            count: Number of documents sent
+            
+        Returns:
+            Documents in input order (None where the element failed)
+            
+        Raises:
+            ValueError: If the response holds no documents array or no valid element
+        """
+        data = self.decode_json(response_text)
+        items = data.get("documents") if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            raise ValueError("No documents array in packed LLM response")
+
+        documents: List[Optional[ExtractedPrescription]] = [None] * count
+
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.pop("document_id", position + 1)) - 1
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= index < count or documents[index] is not None:
+                continue
+
+            try:
+                document = ExtractedPrescription(**item)
+            except ValidationError as e:
+                logger.warning(f"Packed document {index + 1} failed validation: {e}")
+                continue
+
+            if document.document_type != "unknown":
+                documents[index] = document
+
+        if not any(documents):
+            raise ValueError("No valid document in packed LLM response")
+
+        return documents
+    
+    def pack_chunks(self, ocr_texts: List[str]) -> List[List[int]]:
+        """
+        Group documents into packed requests
+        
+        Args:
+            ocr_texts: OCR text of each document
+            
+        Returns:
+            Lists of document indices, each at most Config.LLM_PACK_MAX_DOCUMENTS
+            long and Config.LLM_PACK_MAX_INPUT_TOKENS of OCR text (a larger
+            document goes alone)
+        """
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for i, text in enumerate(ocr_texts):
+            tokens = text_compactor.counter.count(text)
+            if current and (
+                len(current) >= Config.LLM_PACK_MAX_DOCUMENTS
+                or current_tokens + tokens > Config.LLM_PACK_MAX_INPUT_TOKENS
+            ):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def extract_many(
+        self,
+        ocr_texts: List[str],
+        document_type: Optional[str] = None,
+        use_cache: bool = True,
+        call_infos: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Tuple[ExtractedPrescription, float]]:
+        """
+        Extract several documents with packed requests
+        
+        OCR texts are packed into shared requests (see pack_chunks), so the
+        static instructions are paid once per pack instead of once per
+        document. Any document whose element fails - or every document of a
+        pack whose response fails - is redone with a single-document call.
+        
+        Args:
+            ocr_texts: OCR text of each document
+            document_type: Optional document type hint
+            use_cache: False to bypass the LLM response cache
+            call_infos: Optional dict per document that receives per-call
+                details (as for extract, plus "packed_documents"); a pack's
+                input_tokens and cached_tokens are split across its documents
+                by their share of the OCR text tokens
+            
+        Returns:
+            List of (ExtractedPrescription, processing_time) in input order
+        """
+        results: List[Optional[Tuple[ExtractedPrescription, float]]] = [None] * len(ocr_texts)
+        infos = call_infos or [{} for _ in ocr_texts]
+
+        for chunk in self.pack_chunks(ocr_texts):
+            if len(chunk) == 1:
+                i = chunk[0]
+                results[i] = self.extract(ocr_texts[i], document_type, use_cache, infos[i])
+                continue
+
+            start_time = time.time()
+            pack_info: Dict[str, Any] = {}
+
+            try:
+                prompt = self.build_packed_prompt([ocr_texts[i] for i in chunk], document_type)
+                request = self.build_request(
+                    prompt,
+                    packed=True,
+                    max_tokens=min(Config.LLM_MAX_TOKENS * len(chunk), Config.LLM_PACK_MAX_OUTPUT_TOKENS)
+                )
+
+                def call_llm() -> str:
+                    logger.info(f"Calling {self.provider} for packed extraction of {len(chunk)} documents...")
+                    return self.send(request, pack_info)
+
+                documents = cached_completion(
+                    self.provider,
+                    request,
+                    call_llm,
+                    lambda text: self.parse_packed(text, len(chunk)),
+                    use_cache=use_cache,
+                    call_info=pack_info
+                )
+            except Exception as e:
+                logger.warning(f"Packed extraction of {len(chunk)} documents failed: {e}")
+                documents = [None] * len(chunk)
+
+            pack_time = time.time() - start_time
+            failed = [i for i, document in zip(chunk, documents) if document is None]
+
+            # Each document is charged its share of the pack, so per-document stats add up to the real usage
+            weights = [text_compactor.counter.count(ocr_texts[i]) for i in chunk]
+            shares = {
+                i: {"input_tokens": input_tokens, "cached_tokens": cached_tokens}
+                for i, input_tokens, cached_tokens in zip(
+                    chunk,
+                    split_usage(pack_info.get("input_tokens", 0), weights),
+                    split_usage(pack_info.get("cached_tokens", 0), weights)
+                )
+            }
+
+            for i, document in zip(chunk, documents):
+                if document is not None:
+                    results[i] = (document, pack_time)
+                    infos[i].update(pack_info, packed_documents=len(chunk), **shares[i])
+
+            if failed:
+                logger.warning(f"{len(failed)} of {len(chunk)} packed documents failed, extracting them individually")
+            for i in failed:
+                results[i] = self.extract(ocr_texts[i], document_type, use_cache, infos[i])
+                for key, tokens in shares[i].items():
+                    infos[i][key] = infos[i].get(key, 0) + tokens
+
+        return results
     
     def extract(
         self,
         ocr_text: str,
-        document_type: Optional[str] = None
+        document_type: Optional[str] = None,
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
     ) -> Tuple[ExtractedPrescription, float]:
         """
         Extract structured data from OCR text
@@ -202,6 +621,9 @@ Return the extracted data as JSON:"""
         Args:
             ocr_text: OCR extracted text
             document_type: Optional document type hint
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives per-call details
+                ("cache_hit", "input_tokens", "cached_tokens")
 
         Returns:
             Tuple of (ExtractedPrescription, processing_time)
@@ -212,27 +634,22 @@ Return the extracted data as JSON:"""
             # Build prompt
             prompt = self.build_extraction_prompt(ocr_text, document_type)
 
-            # Call LLM
-            logger.info(f"Calling {self.provider} for extraction...")
-            if self.provider == "openai":
-                response_text = self.call_openai(prompt)
-            else:
-                response_text = self.call_anthropic(prompt)
-
-            # Extract JSON
-            raw_json = self.extract_json_from_response(response_text)
-
-            # Validate with Pydantic
-            document = ExtractedPrescription(**raw_json)
+            # Call LLM (or answer from the response cache)
+            call = self.call_openai if self.provider == "openai" else self.call_anthropic
 
-            processing_time = time.time() - start_time
+            def call_llm() -> str:
+                logger.info(f"Calling {self.provider} for extraction...")
+                return call(prompt, call_info)
 
-            logger.success(
-                f"Extraction completed: type={document.document_type}, "
-                f"medications={len(document.medications)}, time={processing_time:.2f}s"
+            document = cached_completion(
+                self.provider,
+                self.build_request(prompt),
+                call_llm,
+                lambda text: self.parse_document(text, start_time),
+                use_cache=use_cache,
+                call_info=call_info
             )
-
-            return document, processing_time
+            return document, time.time() - start_time
 
         except ValidationError as e:
             logger.error(f"Validation error: {e}")
@@ -245,19 +662,80 @@ Return the extracted data as JSON:"""
             processing_time = time.time() - start_time
             return ExtractedPrescription(document_type="unknown"), processing_time
     
+    async def extract_async(
+        self,
+        ocr_text: str,
+        document_type: Optional[str] = None,
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ExtractedPrescription, float]:
+        """
+        Async variant of extract using the async SDK clients
+        
+        Many calls can be awaited concurrently (e.g. with asyncio.gather);
+        at most Config.LLM_MAX_CONCURRENCY are in flight at once.
+
+        Args:
+            ocr_text: OCR extracted text
+            document_type: Optional document type hint
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives per-call details
+                ("cache_hit", "input_tokens", "cached_tokens")
+
+        Returns:
+            Tuple of (ExtractedPrescription, processing_time)
+        """
+        start_time = time.time()
+
+        try:
+            prompt = self.build_extraction_prompt(ocr_text, document_type)
+            call = self.call_openai_async if self.provider == "openai" else self.call_anthropic_async
+
+            async def call_llm() -> str:
+                logger.info(f"Calling {self.provider} for extraction (async)...")
+                return await call(prompt, call_info)
+
+            document = await cached_completion_async(
+                self.provider,
+                self.build_request(prompt),
+                call_llm,
+                lambda text: self.parse_document(text, start_time),
+                use_cache=use_cache,
+                call_info=call_info
+            )
+            return document, time.time() - start_time
+
+        except ValidationError as e:
+            logger.error(f"Validation error: {e}")
+            return ExtractedPrescription(document_type="unknown"), time.time() - start_time
+
+        except Exception as e:
+            logger.error(f"LLM extraction failed: {e}")
+            return ExtractedPrescription(document_type="unknown"), time.time() - start_time
+    
     def extract_with_retry(
         self,
         ocr_text: str,
         document_type: Optional[str] = None,
-        max_retries: int = 2
+        max_retries: int = 2,
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
     ) -> Tuple[ExtractedPrescription, float]:
         """
         Extract with retry logic
 
+        Rate limits and transient API errors are already retried inside
+        each call by the shared rate limiter; the retries here cover
+        responses that failed to parse or validate, with a jittered
+        backoff between attempts.
+
         Args:
             ocr_text: OCR extracted text
             document_type: Optional document type hint
             max_retries: Maximum number of retries
+            use_cache: False to bypass the LLM response cache (retries always bypass it)
+            call_info: Optional dict that receives per-call details
+                ("cache_hit", "input_tokens", "cached_tokens")
 
         Returns:
             Tuple of (ExtractedPrescription, total_processing_time)
@@ -267,7 +745,12 @@ Return the extracted data as JSON:"""
 
         for attempt in range(max_retries + 1):
             try:
-                document, processing_time = self.extract(ocr_text, document_type)
+                document, processing_time = self.extract(
+                    ocr_text,
+                    document_type,
+                    use_cache=use_cache and attempt == 0,
+                    call_info=call_info
+                )
                 total_time += processing_time
 
                 # Check if extraction was successful
@@ -276,11 +759,13 @@ Return the extracted data as JSON:"""
 
                 if attempt < max_retries:
                     logger.warning(f"Attempt {attempt + 1} failed, retrying...")
+                    time.sleep(rate_limiter.backoff_delay(attempt))
 
             except Exception as e:
                 last_error = e
                 if attempt < max_retries:
                     logger.warning(f"Attempt {attempt + 1} failed: {e}, retrying...")
+                    time.sleep(rate_limiter.backoff_delay(attempt))
 
         # All retries failed
         logger.error(f"All extraction attempts failed. Last error: {last_error}")
@@ -2,10 +2,14 @@
 DocuVault - OCR Engine
 Robust OCR processing with PaddleOCR
 """
+import copy
+import queue
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any, List
-from paddleocr import PaddleOCR
+from typing import Tuple, Optional, Dict, Any, List, Union, TYPE_CHECKING
 from PIL import Image
 import cv2
 import numpy as np
@@ -13,66 +17,343 @@ from loguru import logger
 
 from core.config import Config
 from extraction.pdf_converter import pdf_converter
+from extraction.tiff_reader import tiff_reader
+from extraction.ocr_cache import ocr_cache
+from extraction.ocr_result import OCRResult
+from extraction.preprocessing import run_chain, validate_chain
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime - loading paddle takes seconds
+    from paddleocr import PaddleOCR
+
+
+# Anything extract_text can read: a file path, encoded image bytes or a decoded array
+ImageInput = Union[str, Path, bytes, np.ndarray]
+
+
+def paddle_box_helpers():
+    """
+    Box helpers from PaddleOCR's bundled "tools" package
+    
+    The package is registered on sys.path when paddleocr is imported and is
+    not public API; the module layout used here is that of paddleocr 2.7.x
+    (requirements.txt pins 2.7.3). Batch OCR depends on it.
+    
+    Returns:
+        Tuple of (sorted_boxes, get_rotate_crop_image)
+        
+    Raises:
+        ImportError: If the installed PaddleOCR lays its tools out differently
+    """
+    import paddleocr  # Registers the "tools" package
+    from tools.infer.predict_system import sorted_boxes
+    from tools.infer.utility import get_rotate_crop_image
+    
+    return sorted_boxes, get_rotate_crop_image
 
 
 class OCREngine:
     """OCR processing with PaddleOCR"""
     
+    # PaddleOCR settings (also part of the OCR cache key)
+    ENGINE_PARAMS = {
+        "use_angle_cls": True,  # Enable text orientation detection
+        "det_db_thresh": 0.3,   # Detection threshold
+        "det_db_box_thresh": 0.5,  # Box threshold
+        "rec_batch_num": 6,     # Batch size for recognition
+        # Detection runs on a copy shrunk to this long side; recognition
+        # still crops lines from the full-resolution image
+        "det_limit_side_len": Config.OCR_DET_LIMIT_SIDE_LEN,
+        "det_limit_type": "max"
+    }
+    
     def __init__(self):
-        """Initialize OCR engine"""
-        logger.info("Initializing PaddleOCR engine...")
-        self.engine = PaddleOCR(
+        """
+        Initialize OCR engine
+        
+        PaddleOCR itself is loaded on first use (or by warm_up), so importing
+        this module stays cheap for code paths that never run OCR.
+        """
+        self.cache = ocr_cache
+        
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        
+        # Second predictor for concurrent dual-variant OCR (created on first use;
+        # PaddleOCR predictors must not be shared between threads)
+        self._alt_engine = None
+        self._alt_engine_lock = threading.Lock()
+        
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self._warm_up_lock = threading.Lock()
+        
+        # One lock per PaddleOCR instance: its predictors are not thread-safe,
+        # and extract_batch changes their batch sizes for the duration of a call
+        self._predictor_locks: Dict[int, threading.Lock] = {}
+        self._predictor_locks_guard = threading.Lock()
+        
+        # OCR worker pool for page-parallel PDF OCR (attached by PrescriptionProcessor)
+        self.pool = None
+    
+    def _create_engine(self) -> "PaddleOCR":
+        """Create a PaddleOCR instance with the configured settings"""
+        from paddleocr import PaddleOCR
+        
+        return PaddleOCR(
             lang=Config.OCR_LANGUAGE,
             use_gpu=Config.OCR_USE_GPU,
+            cpu_threads=Config.OCR_CPU_THREADS,
             show_log=False,
-            use_angle_cls=True,  # Enable text orientation detection
-            det_db_thresh=0.3,   # Detection threshold
-            det_db_box_thresh=0.5,  # Box threshold
-            rec_batch_num=6      # Batch size for recognition
+            **self.ENGINE_PARAMS
         )
-        logger.success("OCR engine initialized")
     
-    def preprocess_image(self, image_path: str) -> np.ndarray:
+    @property
+    def engine(self) -> "PaddleOCR":
+        """Primary PaddleOCR instance, loaded on first access"""
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    logger.info("Initializing PaddleOCR engine...")
+                    start_time = time.time()
+                    self._engine = self._create_engine()
+                    logger.success(f"OCR engine initialized in {time.time() - start_time:.2f}s")
+        return self._engine
+    
+    @property
+    def alt_engine(self) -> "PaddleOCR":
+        """Secondary PaddleOCR instance used for the raw variant in dual-variant mode"""
+        if self._alt_engine is None:
+            with self._alt_engine_lock:
+                if self._alt_engine is None:
+                    logger.info("Initializing secondary PaddleOCR engine for dual-variant OCR...")
+                    self._alt_engine = self._create_engine()
+        return self._alt_engine
+    
+    def predictor_lock(self, engine: "PaddleOCR") -> threading.Lock:
+        """Lock to hold while running inference on a PaddleOCR instance"""
+        with self._predictor_locks_guard:
+            return self._predictor_locks.setdefault(id(engine), threading.Lock())
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the PaddleOCR models have been loaded"""
+        return self._engine is not None
+    
+    def warm_up(self, background: bool = False) -> Optional[threading.Thread]:
         """
-        Preprocess image for better OCR results
+        Load the OCR models and run a dummy inference
+        
+        The first real OCR call otherwise pays for model loading and
+        predictor initialization. Safe to call repeatedly.
         
         Args:
-            image_path: Path to image file
+            background: Run in a daemon thread and return immediately
             
         Returns:
-            Preprocessed image array
+            The warm-up thread when background=True, otherwise None
         """
+        if background:
+            with self._warm_up_lock:
+                if self._warm_up_thread is None:
+                    self._warm_up_thread = threading.Thread(
+                        target=self.warm_up, name="ocr-warm-up", daemon=True
+                    )
+                    self._warm_up_thread.start()
+            return self._warm_up_thread
+        
+        start_time = time.time()
+        
         try:
-            # Read image
-            img = cv2.imread(image_path)
+            # Small synthetic text line so detection, classification and recognition all run
+            dummy = np.full((64, 320, 3), 255, dtype=np.uint8)
+            cv2.putText(dummy, "Rx 500mg", (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
             
-            if img is None:
-                raise ValueError(f"Failed to load image: {image_path}")
+            engines = [self.engine]
+            if Config.OCR_DUAL_VARIANT:
+                engines.append(self.alt_engine)
+            for engine in engines:
+                with self.predictor_lock(engine):
+                    engine.ocr(dummy, cls=True)
             
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            logger.success(f"OCR engine warmed up in {time.time() - start_time:.2f}s")
+        except Exception as e:
+            logger.error(f"OCR warm-up failed: {e}")
+        
+        return None
+    
+    def load_image(self, image: ImageInput) -> np.ndarray:
+        """
+        Decode an image input into a BGR array
+
+        Args:
+            image: Path to image file, encoded image bytes or image array
+
+        Returns:
+            Image array (arrays are returned as-is)
+        """
+        if isinstance(image, np.ndarray):
+            return image
+
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            buffer = np.frombuffer(image, dtype=np.uint8)
+            img = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+            if img is None:
+                raise ValueError("Failed to decode image bytes")
+            return img
+
+        img = cv2.imread(str(image))
+        if img is None:
+            raise ValueError(f"Failed to load image: {image}")
+        return img
+
+    def describe_input(self, image: ImageInput) -> str:
+        """Short human-readable label for an image input (used in logs)"""
+        if isinstance(image, np.ndarray):
+            return f"<array {'x'.join(str(d) for d in image.shape)}>"
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return f"<{len(image)} bytes>"
+        return Path(image).name
+
+    def is_pdf_input(self, image: ImageInput) -> bool:
+        """Check whether an image input refers to a PDF file"""
+        return isinstance(image, (str, Path)) and Path(image).suffix.lower() == '.pdf'
+
+    def estimate_text_height(self, img: np.ndarray) -> Optional[float]:
+        """
+        Estimate the typical text height of an image in pixels
+        
+        Uses the median height of character-sized connected components on a
+        downscaled, Otsu-binarized copy of the image.
+        
+        Args:
+            img: Image array (BGR or grayscale)
             
-            # Apply denoising
-            denoised = cv2.fastNlMeansDenoising(gray)
+        Returns:
+            Estimated text height in original pixels, or None if too few glyphs were found
+        """
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        
+        # Work on a small copy - the estimate only needs rough glyph sizes
+        h, w = gray.shape[:2]
+        probe_scale = min(1.0, 1000 / max(h, w))
+        if probe_scale < 1.0:
+            gray = cv2.resize(gray, (round(w * probe_scale), round(h * probe_scale)), interpolation=cv2.INTER_AREA)
+        
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        
+        # Skip the background label, keep components shaped like characters
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+        widths = stats[1:, cv2.CC_STAT_WIDTH]
+        max_height = 0.1 * gray.shape[0]
+        glyphs = heights[
+            (heights >= 3) & (heights <= max_height) &
+            (widths >= 1) & (widths <= 4 * heights)
+        ]
+        
+        if len(glyphs) < 20:
+            return None
+        
+        return float(np.median(glyphs)) / probe_scale
+    
+    def normalize_resolution(self, img: np.ndarray) -> Tuple[np.ndarray, float]:
+        """
+        Downscale an image whose text is taller than Config.OCR_TARGET_TEXT_HEIGHT
+        
+        Full-resolution photos with large text cost far more in denoising
+        than the recognizer needs: it resizes every line crop to 48px high,
+        so glyphs taller than that carry no extra information. Text at or
+        below the target is left alone, since shrinking it would lose
+        recognition accuracy. The longest side is capped at
+        Config.OCR_MAX_SIDE_LEN as a guard against very large scans.
+        Images are never upscaled.
+        
+        Args:
+            img: Image array
             
-            # Apply adaptive thresholding
-            thresh = cv2.adaptiveThreshold(
-                denoised, 255, 
-                cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                cv2.THRESH_BINARY, 11, 2
-            )
+        Returns:
+            Tuple of (normalized image, scale factor applied); divide boxes
+            by the scale factor to map them back to original coordinates
+        """
+        h, w = img.shape[:2]
+        scale = Config.OCR_MAX_SIDE_LEN / max(h, w)
+        
+        text_height = self.estimate_text_height(img)
+        if text_height:
+            scale = min(scale, Config.OCR_TARGET_TEXT_HEIGHT / text_height)
+        
+        # Skip negligible resizes
+        if scale >= 0.95:
+            return img, 1.0
+        
+        resized = cv2.resize(img, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+        logger.debug(
+            f"Normalized resolution {w}x{h} -> {resized.shape[1]}x{resized.shape[0]} "
+            f"(text height {text_height or 0:.0f}px, scale {scale:.2f})"
+        )
+        return resized, scale
+    
+    def _prepare_image(self, image: ImageInput) -> Tuple[np.ndarray, float]:
+        """Decode an input and apply resolution normalization when enabled"""
+        img = self.load_image(image)
+        if Config.OCR_NORMALIZE_RESOLUTION:
+            return self.normalize_resolution(img)
+        return img, 1.0
+    
+    def get_preprocess_chain(self, category: Optional[str] = None) -> List[str]:
+        """
+        Preprocessing chain for an image category
+        
+        Args:
+            category: Prescription type hint (e.g. 'printed', 'digital')
             
-            return thresh
+        Returns:
+            Step names from Config.OCR_PREPROCESS_CHAINS, or the default chain
+        """
+        chain = Config.OCR_PREPROCESS_CHAINS.get(category, Config.OCR_PREPROCESS_CHAIN)
+        validate_chain(chain)
+        return list(chain)
+    
+    def preprocess_image(self, image: ImageInput, chain: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Preprocess image for better OCR results
+        
+        Args:
+            image: Path to image file, encoded image bytes or image array
+            chain: Preprocessing step names (defaults to Config.OCR_PREPROCESS_CHAIN)
             
+        Returns:
+            Preprocessed image array
+        """
+        processed, _ = self._preprocess(self.load_image(image), chain)
+        return processed
+    
+    def _preprocess(
+        self,
+        img: np.ndarray,
+        chain: Optional[List[str]] = None
+    ) -> Tuple[np.ndarray, Dict[str, float]]:
+        """
+        Run a preprocessing chain, falling back to the original image on failure
+        
+        Returns:
+            Tuple of (preprocessed image, per-step time in milliseconds)
+        """
+        try:
+            return run_chain(img, chain if chain is not None else self.get_preprocess_chain())
         except Exception as e:
             logger.warning(f"Image preprocessing failed: {e}. Using original.")
-            return cv2.imread(image_path)
+            return img, {}
     
     # Expected minimums for a typical prescription document
     EXPECTED_MIN_LINES = 8  # Prescription usually has at least 8 lines
     EXPECTED_MIN_CHARS = 150  # Prescription usually has at least 150 characters
 
-    def calculate_confidence(self, results: list, extracted_text: str = "") -> float:
+    def calculate_confidence(
+        self,
+        results: Union[OCRResult, list],
+        extracted_text: str = ""
+    ) -> float:
         """
         Calculate multi-factor confidence score from OCR results.
 
@@ -82,28 +363,23 @@ class OCREngine:
         3. Text length - penalizes when extracted text is too short
 
         Args:
-            results: PaddleOCR results
+            results: OCRResult (or raw PaddleOCR results)
             extracted_text: The full extracted text (for length calculation)
 
         Returns:
             Combined confidence score (0-1)
         """
-        if not results or not results[0]:
-            return 0.0
+        if not isinstance(results, OCRResult):
+            if not results or not results[0]:
+                return 0.0
+            results = OCRResult.from_paddle(results)
 
-        # Factor 1: Base OCR confidence (average of per-line confidences)
-        confidences = []
-        for page in results:
-            for line in page:
-                if len(line) >= 2 and len(line[1]) >= 2:
-                    conf = line[1][1]
-                    confidences.append(conf)
-
-        if not confidences:
+        if not len(results):
             return 0.0
 
-        base_confidence = sum(confidences) / len(confidences)
-        num_lines = len(confidences)
+        # Factor 1: Base OCR confidence (average of per-line confidences)
+        base_confidence = results.mean_confidence
+        num_lines = len(results)
         text_length = len(extracted_text)
 
         # Factor 2: Detection density score
@@ -135,15 +411,22 @@ class OCREngine:
     
     def extract_text(
         self, 
-        image_path: str, 
-        preprocess: bool = True
+        image: ImageInput, 
+        preprocess: bool = True,
+        engine: Optional["PaddleOCR"] = None,
+        preprocess_chain: Optional[List[str]] = None
     ) -> Tuple[str, float, Dict[str, Any]]:
         """
         Extract text from image using OCR
+
+        The image is decoded and preprocessed in memory and the resulting
+        array is handed straight to PaddleOCR - nothing is written to disk.
         
         Args:
-            image_path: Path to image file
+            image: Path to image file, encoded image bytes or image array
             preprocess: Whether to preprocess image
+            engine: PaddleOCR instance to run on (defaults to the primary engine)
+            preprocess_chain: Preprocessing step names (defaults to Config.OCR_PREPROCESS_CHAIN)
             
         Returns:
             Tuple of (extracted_text, confidence_score, metadata)
@@ -151,65 +434,37 @@ class OCREngine:
         start_time = time.time()
         
         try:
-            # Validate file
-            if not Path(image_path).exists():
-                raise FileNotFoundError(f"Image not found: {image_path}")
+            if isinstance(image, (str, Path)):
+                # Validate file
+                if not Path(image).exists():
+                    raise FileNotFoundError(f"Image not found: {image}")
+                
+                # Handle PDF files and multi-page TIFFs
+                if self.is_pdf_input(image):
+                    return self._extract_from_pdf(str(image))
+                if tiff_reader.is_multipage(image):
+                    return self._extract_from_tiff(str(image))
             
-            # Handle PDF files
-            if Path(image_path).suffix.lower() == '.pdf':
-                return self._extract_from_pdf(image_path)
+            name = self.describe_input(image)
+            img, scale = self._prepare_image(image)
             
             # Preprocess if requested
+            preprocess_timings = {}
             if preprocess:
-                logger.info(f"Preprocessing image: {image_path}")
-                processed_img = self.preprocess_image(image_path)
-                # Save temporarily
-                temp_path = str(Path(image_path).parent / f"_temp_{Path(image_path).name}")
-                cv2.imwrite(temp_path, processed_img)
-                ocr_input = temp_path
+                logger.info(f"Preprocessing image: {name}")
+                ocr_input, preprocess_timings = self._preprocess(img, preprocess_chain)
             else:
-                ocr_input = image_path
+                ocr_input = img
             
             # Run OCR
-            logger.info(f"Running OCR on: {Path(image_path).name}")
-            results = self.engine.ocr(ocr_input, cls=True)
-            
-            # Extract text
-            text_lines = []
-            boxes = []
-            
-            if results and results[0]:
-                for line in results[0]:
-                    if len(line) >= 2:
-                        # line[0] = bounding box, line[1] = (text, confidence)
-                        text = line[1][0]
-                        text_lines.append(text)
-                        boxes.append(line[0])
-            
-            extracted_text = "\n".join(text_lines)
-            confidence = self.calculate_confidence(results, extracted_text)
-            processing_time = time.time() - start_time
-            
-            # Metadata
-            metadata = {
-                "processing_time": processing_time,
-                "confidence": confidence,
-                "total_lines": len(text_lines),
-                "preprocessed": preprocess,
-                "boxes_count": len(boxes)
-            }
+            logger.info(f"Running OCR on: {name}")
+            engine = engine or self.engine
+            with self.predictor_lock(engine):
+                results = engine.ocr(self._to_bgr(ocr_input), cls=True)
             
-            # Cleanup temp file
-            if preprocess and Path(temp_path).exists():
-                Path(temp_path).unlink()
-            
-            logger.success(
-                f"OCR completed: {len(text_lines)} lines, "
-                f"confidence: {confidence:.2%}, "
-                f"time: {processing_time:.2f}s"
-            )
-            
-            return extracted_text, confidence, metadata
+            text, confidence, metadata = self._build_result(results, preprocess, start_time, scale)
+            metadata["preprocess_timings"] = preprocess_timings
+            return text, confidence, metadata
             
         except Exception as e:
             logger.error(f"OCR extraction failed: {e}")
@@ -221,63 +476,604 @@ class OCREngine:
                 "error": str(e)
             }
     
+    def _to_bgr(self, img: np.ndarray) -> np.ndarray:
+        """Expand single-channel (preprocessed) images to the 3-channel layout PaddleOCR expects"""
+        if img.ndim == 2:
+            return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        return img
+    
+    def _build_result(
+        self,
+        results: list,
+        preprocess: bool,
+        start_time: float,
+        scale: float = 1.0
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Turn PaddleOCR results for a single image into (text, confidence, metadata)
+        
+        Args:
+            results: PaddleOCR results
+            preprocess: Whether the image was preprocessed
+            start_time: When processing of this image started
+            scale: Resolution normalization factor; boxes are mapped back to
+                original image coordinates
+            
+        Returns:
+            Tuple of (extracted_text, confidence_score, metadata)
+        """
+        result = OCRResult.from_paddle(results, scale=scale)
+        extracted_text = result.text
+        confidence = self.calculate_confidence(result, extracted_text)
+        processing_time = time.time() - start_time
+        
+        # Metadata
+        metadata = {
+            "processing_time": processing_time,
+            "confidence": confidence,
+            "total_lines": len(result),
+            "preprocessed": preprocess,
+            "boxes_count": len(result),
+            "ocr_result": result,
+            "scale_factor": scale
+        }
+        
+        logger.success(
+            f"OCR completed: {len(result)} lines, "
+            f"confidence: {confidence:.2%}, "
+            f"time: {processing_time:.2f}s"
+        )
+        
+        return extracted_text, confidence, metadata
+    
+    def _detect(self, engine: "PaddleOCR", img: np.ndarray) -> List[np.ndarray]:
+        """
+        Run text detection only
+        
+        Args:
+            engine: PaddleOCR instance
+            img: BGR image array
+            
+        Returns:
+            Detected text boxes sorted top-to-bottom, left-to-right
+        """
+        sorted_boxes, _ = paddle_box_helpers()
+        
+        with self.predictor_lock(engine):
+            dt_boxes, _ = engine.text_detector(img.copy())
+        if dt_boxes is None or len(dt_boxes) == 0:
+            return []
+        return list(sorted_boxes(dt_boxes))
+    
+    def _recognize(self, engine: "PaddleOCR", img: np.ndarray, boxes: List[np.ndarray]) -> list:
+        """
+        Run angle classification and recognition on already-detected boxes
+        
+        Mirrors what PaddleOCR.ocr does after detection, including the
+        drop_score filter, so results are interchangeable with engine.ocr().
+        
+        Args:
+            engine: PaddleOCR instance
+            img: BGR image array the boxes were detected on
+            boxes: Boxes from _detect
+            
+        Returns:
+            PaddleOCR-style results for one image ([[box, (text, score)], ...] wrapped in a list)
+        """
+        if not boxes:
+            return [None]
+        
+        crops = self._crop_boxes(img, boxes)
+        rec_res = self._recognize_crops(engine, crops)
+        return [self._filter_lines(engine, boxes, rec_res)]
+    
+    def _crop_boxes(self, img: np.ndarray, boxes: List[np.ndarray]) -> List[np.ndarray]:
+        """Cut perspective-corrected text-line crops out of an image"""
+        _, get_rotate_crop_image = paddle_box_helpers()
+        
+        return [get_rotate_crop_image(img, copy.deepcopy(box)) for box in boxes]
+    
+    def _recognize_crops(
+        self,
+        engine: "PaddleOCR",
+        crops: List[np.ndarray],
+        batch_size: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Run angle classification and recognition on text-line crops
+        
+        A batch size override is applied to the shared predictors under
+        the engine's predictor lock, so concurrent OCR on the same engine
+        neither sees it nor runs while it is in effect.
+        
+        Args:
+            engine: PaddleOCR instance
+            crops: Text-line crops
+            batch_size: Override for the classifier/recognizer batch size
+            
+        Returns:
+            (text, score) per crop, in input order
+        """
+        classifier = engine.text_classifier if self.ENGINE_PARAMS["use_angle_cls"] else None
+        recognizer = engine.text_recognizer
+        
+        with self.predictor_lock(engine):
+            default_sizes = (classifier.cls_batch_num if classifier else None, recognizer.rec_batch_num)
+            
+            if batch_size:
+                if classifier:
+                    classifier.cls_batch_num = batch_size
+                recognizer.rec_batch_num = batch_size
+            
+            try:
+                if classifier:
+                    crops, _, _ = classifier(crops)
+                rec_res, _ = recognizer(crops)
+            finally:
+                if classifier:
+                    classifier.cls_batch_num = default_sizes[0]
+                recognizer.rec_batch_num = default_sizes[1]
+        
+        return rec_res
+    
+    def _filter_lines(
+        self,
+        engine: "PaddleOCR",
+        boxes: List[np.ndarray],
+        rec_res: List[Tuple[str, float]]
+    ) -> Optional[list]:
+        """Pair boxes with recognition results, dropping low scores like PaddleOCR.ocr does"""
+        page = [
+            [box.tolist(), res]
+            for box, res in zip(boxes, rec_res)
+            if res[1] >= engine.drop_score
+        ]
+        return page or None
+    
+    def extract_batch(
+        self,
+        images: List[ImageInput],
+        preprocess: bool = True,
+        batch_size: Optional[int] = None,
+        preprocess_chain: Optional[List[str]] = None
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Extract text from many images with cross-image recognition batching
+        
+        Detection runs per image, then the text-line crops of all images are
+        pooled and recognized in large batches (a single prescription only
+        has 8-60 lines, which leaves per-image batches underfilled). Results
+        are mapped back to their source image. PDFs are not supported here.
+        
+        Needs PaddleOCR's internal box helpers (see paddle_box_helpers); with
+        a PaddleOCR that lacks them, each image goes through extract_text.
+        
+        Args:
+            images: Image paths, encoded image bytes or image arrays
+            preprocess: Whether to preprocess images
+            batch_size: Recognition batch size (defaults to Config.OCR_BATCH_REC_SIZE)
+            preprocess_chain: Preprocessing step names (defaults to Config.OCR_PREPROCESS_CHAIN)
+            
+        Returns:
+            List of (extracted_text, confidence_score, metadata), one per input image
+        """
+        try:
+            paddle_box_helpers()
+        except ImportError as e:
+            logger.warning(f"Batch OCR unavailable with this PaddleOCR version ({e}), running images one at a time")
+            return [self.extract_text(image, preprocess, preprocess_chain=preprocess_chain) for image in images]
+        
+        start_time = time.time()
+        batch_size = batch_size or Config.OCR_BATCH_REC_SIZE
+        
+        outputs: List[Optional[Tuple[str, float, Dict[str, Any]]]] = [None] * len(images)
+        detections = {}  # image index -> (boxes, first crop index, scale factor)
+        all_crops = []
+        
+        # Stage 1: per-image detection and cropping
+        for i, image in enumerate(images):
+            try:
+                if self.is_multipage_input(image):
+                    raise ValueError("PDF and multi-page TIFF input is not supported in batch OCR")
+                
+                img, scale = self._prepare_image(image)
+                if preprocess:
+                    img, _ = self._preprocess(img, preprocess_chain)
+                img = self._to_bgr(img)
+                
+                boxes = self._detect(self.engine, img)
+                detections[i] = (boxes, len(all_crops), scale)
+                all_crops.extend(self._crop_boxes(img, boxes))
+                
+            except Exception as e:
+                logger.error(f"Batch OCR failed for {self.describe_input(image)}: {e}")
+                outputs[i] = ("", 0.0, {"processing_time": 0.0, "confidence": 0.0, "error": str(e)})
+        
+        # Stage 2: pooled recognition across all images
+        logger.info(
+            f"Batch OCR: recognizing {len(all_crops)} text lines from "
+            f"{len(detections)} images (batch size {batch_size})"
+        )
+        rec_res = self._recognize_crops(self.engine, all_crops, batch_size) if all_crops else []
+        
+        # Stage 3: map recognition results back to their images
+        per_image_time = (time.time() - start_time) / max(len(images), 1)
+        
+        for i, (boxes, offset, scale) in detections.items():
+            page = self._filter_lines(self.engine, boxes, rec_res[offset:offset + len(boxes)])
+            text, confidence, metadata = self._build_result([page], preprocess, time.time(), scale)
+            metadata["processing_time"] = per_image_time
+            metadata["batch_size"] = len(images)
+            outputs[i] = (text, confidence, metadata)
+        
+        logger.success(
+            f"Batch OCR completed: {len(images)} images, "
+            f"time: {time.time() - start_time:.2f}s"
+        )
+        
+        return outputs
+    
+    def ocr_page(self, image: ImageInput, page_index: int = 0, scale: float = 1.0) -> OCRResult:
+        """
+        Run OCR on one rendered document page (no preprocessing)
+        
+        Args:
+            image: Page image path, encoded bytes or array
+            page_index: 0-based page index recorded on the lines
+            scale: Render scale relative to the reference grid; boxes are
+                divided by it (e.g. 0.5 for a page rendered at 150 of 300 DPI)
+            
+        Returns:
+            OCRResult for the page
+        """
+        img = self._to_bgr(self.load_image(image))
+        with self.predictor_lock(self.engine):
+            results = self.engine.ocr(img, cls=True)
+        return OCRResult.from_paddle(results, page_offset=page_index, scale=scale)
+    
+    def select_pdf_dpi(self, probe: np.ndarray, probe_dpi: int) -> int:
+        """
+        Choose the rendering DPI for a PDF page from a low-DPI probe render
+        
+        Picks the DPI at which the page's text reaches
+        Config.OCR_TARGET_TEXT_HEIGHT pixels, rounded up to a multiple of 25
+        and clamped to [Config.PDF_MIN_DPI, Config.PDF_MAX_DPI]. Pages where
+        no text size can be estimated (e.g. sparse handwriting) get the
+        maximum.
+        
+        Args:
+            probe: Page rendered at probe_dpi
+            probe_dpi: DPI of the probe render
+            
+        Returns:
+            DPI to render the page at
+        """
+        if Config.PDF_SKIP_BLANK_PAGES and self.ink_coverage(self.page_thumbnail(probe)) < Config.PDF_BLANK_INK_RATIO:
+            # Blank pages are dropped before OCR; don't spend pixels on them
+            return Config.PDF_MIN_DPI
+        
+        text_height = self.estimate_text_height(probe)
+        if not text_height:
+            return Config.PDF_MAX_DPI
+        
+        needed = probe_dpi * Config.OCR_TARGET_TEXT_HEIGHT / text_height
+        dpi = int(np.ceil(needed / 25) * 25)
+        return int(np.clip(dpi, Config.PDF_MIN_DPI, Config.PDF_MAX_DPI))
+    
+    def page_thumbnail(self, img: np.ndarray, max_side: int = 256) -> np.ndarray:
+        """Small grayscale copy of a page for cheap page-level checks"""
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        h, w = gray.shape[:2]
+        scale = min(1.0, max_side / max(h, w))
+        if scale < 1.0:
+            gray = cv2.resize(gray, (max(round(w * scale), 1), max(round(h * scale), 1)), interpolation=cv2.INTER_AREA)
+        return gray
+    
+    def ink_coverage(self, thumb: np.ndarray) -> float:
+        """
+        Fraction of a page covered by ink
+        
+        Pixels clearly darker than the paper (the median gray level) count
+        as ink. A 5% margin is ignored so scanner edges and punch holes
+        don't make a blank back look printed.
+        
+        Args:
+            thumb: Grayscale page thumbnail
+            
+        Returns:
+            Ink coverage ratio (0-1)
+        """
+        h, w = thumb.shape[:2]
+        my, mx = h // 20, w // 20
+        inner = thumb[my:h - my, mx:w - mx]
+        if inner.size == 0:
+            return 0.0
+        paper = np.median(inner)
+        return float(np.count_nonzero(inner < paper - 60)) / inner.size
+    
+    def page_hash(self, thumb: np.ndarray, hash_size: int = 16) -> np.ndarray:
+        """
+        Difference hash (dHash) of a page
+        
+        Args:
+            thumb: Grayscale page thumbnail
+            hash_size: Hash grid size; the hash has hash_size**2 bits
+            
+        Returns:
+            Boolean array of hash bits
+        """
+        small = cv2.resize(thumb, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+        return (small[:, 1:] > small[:, :-1]).flatten()
+    
+    def find_skippable_page(
+        self,
+        img: np.ndarray,
+        page_index: int,
+        seen_pages: List[Tuple[int, np.ndarray, np.ndarray]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Decide whether a rendered PDF page can be skipped before OCR
+        
+        Blank pages fall below Config.PDF_BLANK_INK_RATIO ink coverage.
+        Duplicates (e.g. repeated cover sheets) have a dHash within
+        Config.PDF_DUPLICATE_MAX_DISTANCE bits of an earlier kept page and a
+        thumbnail correlation of at least Config.PDF_DUPLICATE_MIN_CORRELATION.
+        The correlation check matters: pages printed from the same template
+        with different patients hash almost alike. Kept pages are added to
+        seen_pages.
+        
+        Args:
+            img: Rendered page
+            page_index: 0-based page index
+            seen_pages: (page_index, hash, thumbnail) of pages kept so far; updated in place
+            
+        Returns:
+            Skip info ({"page", "reason", ...}) or None if the page should be OCRed
+        """
+        thumb = self.page_thumbnail(img)
+        
+        if Config.PDF_SKIP_BLANK_PAGES:
+            coverage = self.ink_coverage(thumb)
+            if coverage < Config.PDF_BLANK_INK_RATIO:
+                return {"page": page_index + 1, "reason": "blank", "ink_coverage": round(coverage, 5)}
+        
+        if Config.PDF_SKIP_DUPLICATE_PAGES:
+            page_hash = self.page_hash(thumb)
+            for seen_index, seen_hash, seen_thumb in seen_pages:
+                distance = int(np.count_nonzero(page_hash != seen_hash))
+                if distance > Config.PDF_DUPLICATE_MAX_DISTANCE or seen_thumb.shape != thumb.shape:
+                    continue
+                
+                correlation = float(cv2.matchTemplate(thumb, seen_thumb, cv2.TM_CCOEFF_NORMED)[0, 0])
+                if correlation >= Config.PDF_DUPLICATE_MIN_CORRELATION:
+                    return {
+                        "page": page_index + 1,
+                        "reason": "duplicate",
+                        "duplicate_of": seen_index + 1,
+                        "distance": distance,
+                        "correlation": round(correlation, 4)
+                    }
+            seen_pages.append((page_index, page_hash, thumb))
+        
+        return None
+    
+    def _prefetch(self, items, depth: int):
+        """
+        Produce items from an iterable in a background thread
+        
+        Keeps up to `depth` items ready ahead of the consumer, so e.g. page
+        N+1 renders while page N is being recognized. Exceptions raised by
+        the producer are re-raised in the consumer. When the consumer stops
+        early the producer stops too and closes `items` (a generator such
+        as PDFConverter.iter_pages releases its document on close); it is
+        closed from the producer thread because a running generator cannot
+        be closed from another one.
+        
+        Args:
+            items: Iterable to consume (evaluated in the background thread)
+            depth: Maximum number of produced-but-unconsumed items
+            
+        Yields:
+            Items in their original order
+        """
+        buffer = queue.Queue(maxsize=max(depth, 1))
+        done = object()
+        stop = threading.Event()
+        
+        def put(entry) -> bool:
+            """Hand an entry to the consumer; False once the consumer has stopped"""
+            while not stop.is_set():
+                try:
+                    buffer.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for item in items:
+                    if not put(("item", item)):
+                        return
+                put(("done", done))
+            except Exception as e:
+                put(("error", e))
+            finally:
+                close = getattr(items, "close", None)
+                if close:
+                    close()
+        
+        producer = threading.Thread(target=produce, name="pdf-prefetch", daemon=True)
+        producer.start()
+        
+        try:
+            while True:
+                kind, value = buffer.get()
+                if kind == "item":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            stop.set()
+            # Wait for the producer to notice (it may be mid-way through one item)
+            producer.join(timeout=Config.PDF_PREFETCH_JOIN_SECONDS)
+    
     def _extract_from_pdf(self, pdf_path: str) -> Tuple[str, float, Dict[str, Any]]:
         """
         Extract text from PDF by converting to images first
         
+        Pages that carry a usable embedded text layer (digital PDFs) are read
+        directly with a synthetic confidence; only image-only pages are
+        rasterized and OCRed. Pages are streamed from PDFConverter.iter_pages
+        straight to arrays, so memory stays bounded by the few pages in
+        flight and nothing touches the disk.
+        
         Args:
             pdf_path: Path to PDF file
             
         Returns:
             Tuple of (extracted_text, confidence_score, metadata)
         """
-        start_time = time.time()
-        
         if not pdf_converter:
             raise RuntimeError("PDF converter not available. Install PyMuPDF: pip install PyMuPDF")
         
+        logger.info(f"Processing PDF: {Path(pdf_path).name}")
+        
+        pages = pdf_converter.iter_pages(
+            pdf_path,
+            dpi=Config.PDF_DPI,
+            use_text_layer=Config.PDF_TEXT_LAYER_ENABLED,
+            dpi_selector=self.select_pdf_dpi if Config.PDF_ADAPTIVE_DPI else None
+        )
+        text, confidence, metadata = self._extract_from_pages(pages, reference_dpi=Config.PDF_DPI)
+        metadata["is_pdf"] = True
+        return text, confidence, metadata
+    
+    def _extract_from_tiff(self, tiff_path: str) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Extract text from a multi-frame TIFF (e.g. a fax), one frame per page
+        
+        Frames are decoded lazily by TIFFReader.iter_pages and go through the
+        same page pipeline as PDFs. Boxes stay in each frame's own pixels.
+        
+        Args:
+            tiff_path: Path to TIFF file
+            
+        Returns:
+            Tuple of (extracted_text, confidence_score, metadata)
+        """
+        logger.info(f"Processing multi-page TIFF: {Path(tiff_path).name}")
+        
+        text, confidence, metadata = self._extract_from_pages(tiff_reader.iter_pages(tiff_path))
+        metadata["is_tiff"] = True
+        return text, confidence, metadata
+    
+    def is_multipage_input(self, image: ImageInput) -> bool:
+        """Check whether an input is a page-based document (PDF or multi-frame TIFF)"""
+        return self.is_pdf_input(image) or (
+            isinstance(image, (str, Path)) and tiff_reader.is_multipage(image)
+        )
+    
+    def _extract_from_pages(
+        self,
+        pages,
+        reference_dpi: Optional[int] = None
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Run OCR over a stream of document pages
+        
+        Loading and OCR are pipelined: the next page is loaded in a
+        background thread while the current one is recognized. When an OCR
+        worker pool is attached, pages are spread across the workers as soon
+        as they are loaded. Blank and duplicate pages are skipped. Page order
+        and per-page confidences are kept.
+        
+        Args:
+            pages: Iterable of (page_index, page, dpi) where page is a BGR
+                array or a ready OCRResult (e.g. a PDF text layer)
+            reference_dpi: DPI grid to report boxes in; pages rendered at a
+                different DPI are rescaled (None keeps each page's own pixels)
+            
+        Returns:
+            Tuple of (extracted_text, confidence_score, metadata)
+        """
+        start_time = time.time()
+        total_pages = 0
+        pages = self._prefetch(pages, Config.PDF_PREFETCH_PAGES)
+        
         try:
-            logger.info(f"Processing PDF: {Path(pdf_path).name}")
+            page_results = []
+            page_dpis = []
+            text_layer_pages = []
+            skipped_pages = []
+            seen_pages = []
+            in_flight = deque()
+            
+            for i, page, page_dpi in pages:
+                total_pages += 1
+                page_dpis.append(page_dpi)
+                # Boxes are reported on the reference grid whatever the page was rendered at
+                scale = page_dpi / reference_dpi if reference_dpi else 1.0
+                if isinstance(page, OCRResult):
+                    logger.debug(f"Page {i + 1}: using embedded text layer ({len(page)} lines)")
+                    text_layer_pages.append(i)
+                    page_results.append(page)
+                    continue
+                
+                skip = self.find_skippable_page(page, i, seen_pages)
+                if skip:
+                    logger.info(f"Skipping page {i + 1}: {skip['reason']}")
+                    skipped_pages.append(skip)
+                    page_results.append(OCRResult())
+                elif self.pool:
+                    # Submit each page as soon as it is rendered; collected in page order below.
+                    # Queued jobs keep their page array alive, so cap the pages in flight
+                    if len(in_flight) >= self.pool.num_workers * 2:
+                        in_flight.popleft().result()
+                    future = self.pool.submit_page(page, i, scale)
+                    in_flight.append(future)
+                    page_results.append(future)
+                else:
+                    logger.info(f"Processing page {i + 1} at {page_dpi} DPI")
+                    page_results.append(self.ocr_page(page, i, scale))
             
-            # Convert PDF to images
-            image_paths = pdf_converter.convert_to_images(pdf_path, dpi=300)
+            ocr_pages = total_pages - len(text_layer_pages) - len(skipped_pages)
+            if self.pool and ocr_pages:
+                logger.info(f"Dispatched {ocr_pages} pages to {self.pool.num_workers} OCR workers")
+            page_results = [
+                result if isinstance(result, OCRResult) else result.result()
+                for result in page_results
+            ]
             
-            if not image_paths:
-                raise ValueError("PDF conversion produced no images")
+            if not total_pages:
+                raise ValueError("Document produced no pages")
             
-            # Extract text from each page
+            # Combine pages in order
             all_text = []
             all_confidences = []
-            total_lines = 0
+            page_confidences = []
             
-            for i, image_path in enumerate(image_paths, 1):
-                logger.info(f"Processing page {i}/{len(image_paths)}")
-                
-                # Run OCR on page image
-                results = self.engine.ocr(image_path, cls=True)
-                
-                # Extract text
-                if results and results[0]:
-                    page_lines = []
-                    for line in results[0]:
-                        if len(line) >= 2:
-                            text = line[1][0]
-                            page_lines.append(text)
-                    
-                    if page_lines:
-                        all_text.append(f"\n--- Page {i} ---\n")
-                        all_text.extend(page_lines)
-                        total_lines += len(page_lines)
+            skipped = {skip["page"] for skip in skipped_pages}
+            
+            for i, page_result in enumerate(page_results, 1):
+                page_confidence = None if i in skipped else 0.0
+                if len(page_result):
+                    all_text.append(f"\n--- Page {i} ---\n")
+                    all_text.extend(page_result.texts)
 
-                    # Calculate page confidence (pass page text for length scoring)
-                    page_text = "\n".join(page_lines)
-                    page_confidence = self.calculate_confidence(results, page_text)
+                    if i - 1 in text_layer_pages:
+                        page_confidence = Config.PDF_TEXT_LAYER_CONFIDENCE
+                    else:
+                        # Calculate page confidence (pass page text for length scoring)
+                        page_confidence = self.calculate_confidence(page_result, page_result.text)
                     all_confidences.append(page_confidence)
+                page_confidences.append(page_confidence)
             
-            # Cleanup temporary images
-            pdf_converter.cleanup_temp_images(image_paths)
+            ocr_result = OCRResult.concatenate(page_results)
+            total_lines = len(ocr_result)
             
-            # Combine results
             extracted_text = "\n".join(all_text)
             avg_confidence = sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
             processing_time = time.time() - start_time
@@ -286,13 +1082,20 @@ class OCREngine:
                 "processing_time": processing_time,
                 "confidence": avg_confidence,
                 "total_lines": total_lines,
-                "total_pages": len(image_paths),
+                "total_pages": total_pages,
+                "page_confidences": page_confidences,
+                "page_dpis": page_dpis,
+                "text_layer_pages": text_layer_pages,
+                "ocr_pages": ocr_pages,
+                "skipped_pages": skipped_pages,
                 "preprocessed": False,
-                "is_pdf": True
+                "ocr_workers": self.pool.num_workers if self.pool else 1,
+                "ocr_result": ocr_result
             }
             
             logger.success(
-                f"PDF OCR completed: {len(image_paths)} pages, "
+                f"Document OCR completed: {total_pages} pages "
+                f"({len(text_layer_pages)} from text layer, {len(skipped_pages)} skipped), "
                 f"{total_lines} lines, "
                 f"confidence: {avg_confidence:.2%}, "
                 f"time: {processing_time:.2f}s"
@@ -301,30 +1104,160 @@ class OCREngine:
             return extracted_text, avg_confidence, metadata
             
         except Exception as e:
-            logger.error(f"PDF OCR extraction failed: {e}")
+            logger.error(f"Document OCR extraction failed: {e}")
             processing_time = time.time() - start_time
             
             return "", 0.0, {
                 "processing_time": processing_time,
                 "confidence": 0.0,
-                "error": str(e),
-                "is_pdf": True
+                "error": str(e)
             }
+        
+        finally:
+            # Stops the render thread and releases the document if OCR ended early
+            pages.close()
     
-    def extract_with_fallback(self, image_path: str) -> Tuple[str, float, Dict[str, Any]]:
+    def cache_params(self, preprocess_chain: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Parameters that affect OCR output and therefore the cache key"""
+        return {
+            "language": Config.OCR_LANGUAGE,
+            "engine": self.ENGINE_PARAMS,
+            "preprocess": preprocess_chain if preprocess_chain is not None else self.get_preprocess_chain(),
+            "normalize": (
+                Config.OCR_NORMALIZE_RESOLUTION,
+                Config.OCR_TARGET_TEXT_HEIGHT,
+                Config.OCR_MAX_SIDE_LEN
+            ),
+            "confidence_threshold": Config.OCR_CONFIDENCE_THRESHOLD,
+            "dual_variant": Config.OCR_DUAL_VARIANT,
+            "pdf_dpi": (
+                Config.PDF_DPI,
+                Config.PDF_ADAPTIVE_DPI,
+                Config.PDF_PROBE_DPI,
+                Config.PDF_MIN_DPI,
+                Config.PDF_MAX_DPI
+            ),
+            "pdf_page_skip": (
+                Config.PDF_SKIP_BLANK_PAGES,
+                Config.PDF_BLANK_INK_RATIO,
+                Config.PDF_SKIP_DUPLICATE_PAGES,
+                Config.PDF_DUPLICATE_MAX_DISTANCE,
+                Config.PDF_DUPLICATE_MIN_CORRELATION
+            ),
+            "pdf_text_layer": (
+                Config.PDF_TEXT_LAYER_ENABLED,
+                Config.PDF_TEXT_LAYER_MIN_CHARS,
+                Config.PDF_TEXT_LAYER_CONFIDENCE,
+                Config.PDF_TEXT_LAYER_MAX_IMAGE_AREA
+            )
+        }
+    
+    def read_bytes(self, image: ImageInput) -> bytes:
+        """
+        Raw bytes identifying an image input (used for cache keys)
+        
+        Args:
+            image: Path to image file, encoded image bytes or image array
+            
+        Returns:
+            File contents, the bytes themselves, or the array buffer prefixed with its shape
+        """
+        if isinstance(image, np.ndarray):
+            header = f"{image.dtype}:{image.shape}".encode("utf-8")
+            return header + np.ascontiguousarray(image).tobytes()
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return bytes(image)
+        return Path(image).read_bytes()
+    
+    def extract_with_fallback(
+        self,
+        image: ImageInput,
+        use_cache: bool = True,
+        preprocess_chain: Optional[List[str]] = None
+    ) -> Tuple[str, float, Dict[str, Any]]:
         """
         Extract text with fallback strategy
         
-        First tries with preprocessing, then without if confidence is low
+        First tries with preprocessing, then without if confidence is low.
+        Results are cached by image content, so re-uploads of the same
+        prescription skip OCR entirely.
         
         Args:
-            image_path: Path to image file
+            image: Path to image file, encoded image bytes or image array
+            use_cache: Whether to consult and update the OCR result cache
+            preprocess_chain: Preprocessing step names (defaults to Config.OCR_PREPROCESS_CHAIN)
             
         Returns:
             Tuple of (extracted_text, confidence_score, metadata)
         """
+        cache = self.cache if use_cache else None
+        cache_key = None
+        
+        if cache:
+            lookup_start = time.time()
+            try:
+                image_bytes = self.read_bytes(image)
+                cache_key = cache.make_key(image_bytes, self.cache_params(preprocess_chain))
+            except Exception as e:
+                logger.warning(f"OCR cache key computation failed: {e}")
+            
+            if cache_key:
+                cached = cache.get(cache_key)
+                if cached:
+                    text, confidence, metadata = cached
+                    metadata["ocr_processing_time"] = metadata.get("processing_time", 0.0)
+                    metadata["processing_time"] = time.time() - lookup_start
+                    metadata["cache"] = {"hit": True, **cache.stats()}
+                    logger.info(
+                        f"OCR cache hit for {self.describe_input(image)} "
+                        f"({metadata['processing_time'] * 1000:.1f}ms)"
+                    )
+                    return text, confidence, metadata
+                
+                # Decode from the bytes we already hold instead of reading the file again
+                if isinstance(image, (str, Path)) and not self.is_multipage_input(image):
+                    image = image_bytes
+        
+        text, confidence, metadata = self._extract_with_fallback(image, preprocess_chain)
+        
+        if cache:
+            if cache_key and "error" not in metadata:
+                cache.put(cache_key, text, confidence, metadata)
+            metadata["cache"] = {"hit": False, **cache.stats()}
+        
+        return text, confidence, metadata
+    
+    def _extract_with_fallback(
+        self,
+        image: ImageInput,
+        preprocess_chain: Optional[List[str]] = None
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Run OCR with preprocessing, retrying on the raw image if confidence is low
+        
+        Args:
+            image: Path to image file, encoded image bytes or image array
+            preprocess_chain: Preprocessing step names (defaults to Config.OCR_PREPROCESS_CHAIN)
+            
+        Returns:
+            Tuple of (extracted_text, confidence_score, metadata)
+        """
+        # Page-based documents go through the page pipeline, which doesn't
+        # preprocess - a second pass would repeat the same work
+        if self.is_multipage_input(image):
+            return self.extract_text(image)
+        
+        # Decode once so both passes reuse the same pixels
+        try:
+            image = self.load_image(image)
+        except Exception:
+            pass  # extract_text reports the failure
+        
+        if Config.OCR_DUAL_VARIANT and isinstance(image, np.ndarray):
+            return self.extract_dual_variant(image, preprocess_chain)
+        
         # Try with preprocessing
-        text, confidence, metadata = self.extract_text(image_path, preprocess=True)
+        text, confidence, metadata = self.extract_text(image, preprocess=True, preprocess_chain=preprocess_chain)
         
         # If confidence is low, try without preprocessing
         if confidence < Config.OCR_CONFIDENCE_THRESHOLD:
@@ -333,7 +1266,7 @@ class OCREngine:
                 f"retrying without preprocessing..."
             )
             text_alt, confidence_alt, metadata_alt = self.extract_text(
-                image_path, 
+                image, 
                 preprocess=False
             )
             
@@ -343,6 +1276,119 @@ class OCREngine:
                 return text_alt, confidence_alt, metadata_alt
         
         return text, confidence, metadata
+    
+    def extract_dual_variant(
+        self,
+        image: ImageInput,
+        preprocess_chain: Optional[List[str]] = None
+    ) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Run the preprocessed and raw variants concurrently and keep the better one
+        
+        Each variant runs on its own PaddleOCR instance in its own thread, so
+        hard images no longer pay for two sequential OCR passes. With
+        Config.OCR_DUAL_VARIANT_EARLY_CANCEL, detection results are compared
+        first and recognition is skipped for a variant that clearly lost.
+        
+        Args:
+            image: Path to image file, encoded image bytes or image array
+            preprocess_chain: Preprocessing step names (defaults to Config.OCR_PREPROCESS_CHAIN)
+            
+        Returns:
+            Tuple of (extracted_text, confidence_score, metadata)
+        """
+        start_time = time.time()
+        
+        try:
+            img, scale = self._prepare_image(image)
+            img = self._to_bgr(img)
+            logger.info(f"Running dual-variant OCR on: {self.describe_input(image)}")
+            
+            preprocessed, preprocess_timings = self._preprocess(img, preprocess_chain)
+            variants = {
+                "preprocessed": (self._to_bgr(preprocessed), self.engine),
+                "raw": (img, self.alt_engine)
+            }
+            
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-variant") as pool:
+                # Detection for both variants
+                detect_futures = {
+                    name: pool.submit(self._detect, engine, variant_img)
+                    for name, (variant_img, engine) in variants.items()
+                }
+                boxes = {name: future.result() for name, future in detect_futures.items()}
+                
+                # Drop a variant that clearly lost on detection
+                candidates = list(variants)
+                if Config.OCR_DUAL_VARIANT_EARLY_CANCEL:
+                    winner = self._detection_winner(
+                        len(boxes["preprocessed"]),
+                        len(boxes["raw"])
+                    )
+                    if winner:
+                        logger.info(
+                            f"Dual-variant early cancel: keeping {winner} "
+                            f"({len(boxes['preprocessed'])} vs {len(boxes['raw'])} boxes)"
+                        )
+                        candidates = [winner]
+                
+                # Recognition for the remaining variants
+                recognize_futures = {
+                    name: pool.submit(self._recognize, variants[name][1], variants[name][0], boxes[name])
+                    for name in candidates
+                }
+                results = {name: future.result() for name, future in recognize_futures.items()}
+            
+            built = {
+                name: self._build_result(variant_results, name == "preprocessed", start_time, scale)
+                for name, variant_results in results.items()
+            }
+            
+            # Prefer the preprocessed result unless the raw one is strictly better
+            best = "preprocessed" if "preprocessed" in built else "raw"
+            if "raw" in built and built["raw"][1] > built[best][1]:
+                best = "raw"
+            
+            text, confidence, metadata = built[best]
+            metadata["processing_time"] = time.time() - start_time
+            metadata["preprocess_timings"] = preprocess_timings
+            metadata["dual_variant"] = {
+                "selected": best,
+                "boxes": {name: len(b) for name, b in boxes.items()},
+                "confidences": {name: result[1] for name, result in built.items()},
+                "early_cancelled": [name for name in variants if name not in built]
+            }
+            
+            logger.info(f"Dual-variant OCR selected {best} variant: confidence={confidence:.2%}")
+            return text, confidence, metadata
+            
+        except Exception as e:
+            logger.error(f"Dual-variant OCR failed: {e}")
+            processing_time = time.time() - start_time
+            
+            return "", 0.0, {
+                "processing_time": processing_time,
+                "confidence": 0.0,
+                "error": str(e)
+            }
+    
+    def _detection_winner(self, preprocessed_boxes: int, raw_boxes: int) -> Optional[str]:
+        """
+        Decide whether one variant clearly wins on detection alone
+        
+        A variant wins when it found at least the expected number of lines and
+        Config.OCR_DUAL_VARIANT_CANCEL_RATIO times as many boxes as the other.
+        
+        Returns:
+            "preprocessed", "raw" or None if both should be recognized
+        """
+        ratio = Config.OCR_DUAL_VARIANT_CANCEL_RATIO
+        
+        if preprocessed_boxes >= self.EXPECTED_MIN_LINES and preprocessed_boxes >= ratio * max(raw_boxes, 1):
+            return "preprocessed"
+        if raw_boxes >= self.EXPECTED_MIN_LINES and raw_boxes >= ratio * max(preprocessed_boxes, 1):
+            return "raw"
+        return None
 
 
 # Global OCR instance
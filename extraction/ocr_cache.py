@@ -0,0 +1,204 @@
+"""
+DocuVault - OCR Result Cache
+Content-addressed on-disk cache for OCR results with LRU eviction
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Tuple, Optional, Dict, Any
+from loguru import logger
+
+from core.config import Config
+from extraction.ocr_result import OCRResult
+
+
+class OCRCache:
+    """
+    Disk cache for OCR results keyed by image content
+
+    Entries are JSON files named after the SHA-256 of the image bytes plus
+    the preprocessing/engine parameters, so the same prescription uploaded
+    under a different filename still hits. Recency is tracked through the
+    file modification time; when the cache grows past its size cap the
+    least recently used entries are removed first.
+    """
+
+    # Bump when the stored entry layout changes
+    VERSION = 2
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_size_mb: Optional[float] = None
+    ):
+        """
+        Initialize OCR cache
+
+        Args:
+            cache_dir: Directory for cache entries (defaults to Config.OCR_CACHE_DIR)
+            max_size_mb: Size cap in MB (defaults to Config.OCR_CACHE_MAX_MB)
+        """
+        self.cache_dir = Path(cache_dir or Config.OCR_CACHE_DIR)
+        self.max_bytes = int((max_size_mb or Config.OCR_CACHE_MAX_MB) * 1024 * 1024)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = sum(f.stat().st_size for f in self._entries())
+
+        logger.debug(
+            f"OCR cache at {self.cache_dir}: "
+            f"{self._total_bytes / (1024 * 1024):.1f}MB used, "
+            f"cap {self.max_bytes / (1024 * 1024):.0f}MB"
+        )
+
+    def make_key(self, image_bytes: bytes, params: Dict[str, Any]) -> str:
+        """
+        Build a content-addressed cache key
+
+        Args:
+            image_bytes: Raw image (or PDF) bytes
+            params: Preprocessing and engine parameters that affect the result
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256(image_bytes)
+        digest.update(json.dumps({"v": self.VERSION, **params}, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Entry path, sharded by the first two hex characters"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entries(self):
+        """Iterate over all entry files"""
+        return self.cache_dir.glob("*/*.json")
+
+    def get(self, key: str) -> Optional[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Look up a cached OCR result
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Tuple of (extracted_text, confidence_score, metadata) or None on miss
+        """
+        path = self._path(key)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path, None)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        metadata = entry["metadata"]
+        if "ocr_result" in metadata:
+            metadata["ocr_result"] = OCRResult.from_dict(metadata["ocr_result"])
+
+        return entry["text"], entry["confidence"], metadata
+
+    def put(self, key: str, text: str, confidence: float, metadata: Dict[str, Any]):
+        """
+        Store an OCR result
+
+        Args:
+            key: Cache key from make_key
+            text: Extracted text
+            confidence: Confidence score
+            metadata: OCR metadata (JSON-serializable apart from an OCRResult under "ocr_result")
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if isinstance(metadata.get("ocr_result"), OCRResult):
+            metadata = {**metadata, "ocr_result": metadata["ocr_result"].to_dict()}
+
+        entry = {
+            "text": text,
+            "confidence": confidence,
+            "metadata": metadata,
+            "created_at": time.time()
+        }
+
+        # Write to a temp file first so concurrent readers never see a partial entry
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(temp_path, path)
+            new_size = path.stat().st_size
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write OCR cache entry: {e}")
+            temp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._total_bytes += new_size - old_size
+            over_cap = self._total_bytes > self.max_bytes
+
+        if over_cap:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache is under 90% of its cap"""
+        target = int(self.max_bytes * 0.9)
+
+        entries = []
+        for f in self._entries():
+            try:
+                stat = f.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, f))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, f in sorted(entries, key=lambda e: e[0]):
+            if total <= target:
+                break
+            try:
+                f.unlink()
+                total -= size
+                removed += 1
+            except FileNotFoundError:
+                total -= size
+
+        with self._lock:
+            self._total_bytes = total
+
+        logger.info(f"OCR cache eviction removed {removed} entries ({total / (1024 * 1024):.1f}MB left)")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Remove every entry"""
+        for f in self._entries():
+            f.unlink(missing_ok=True)
+        with self._lock:
+            self._total_bytes = 0
+
+
+# Global cache instance
+try:
+    ocr_cache = OCRCache() if Config.OCR_CACHE_ENABLED else None
+except Exception as e:
+    logger.warning(f"Failed to initialize OCR cache: {e}")
+    ocr_cache = None
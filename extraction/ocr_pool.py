@@ -0,0 +1,173 @@
+"""
+DocuVault - OCR Worker Pool
+Multi-process PaddleOCR workers for batch processing
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, Future
+from pathlib import Path
+from typing import Tuple, Optional, Dict, Any, List, Iterable
+from loguru import logger
+
+from core.config import Config
+
+
+# Per-process OCR engine, loaded once by _init_worker
+_worker_engine = None
+
+
+def _init_worker(cpu_threads: int):
+    """
+    Worker process initializer - loads the OCR model once per process
+
+    Args:
+        cpu_threads: Math library threads for this worker's PaddleOCR instance
+    """
+    global _worker_engine
+
+    # Keep each worker on its share of the cores instead of every
+    # process spinning up one thread per core
+    os.environ["OMP_NUM_THREADS"] = str(cpu_threads)
+    Config.OCR_CPU_THREADS = cpu_threads
+
+    # Imported here so the engine is built after the thread settings are applied
+    from extraction.ocr import ocr_engine
+    ocr_engine.warm_up()
+    _worker_engine = ocr_engine
+
+    logger.info(f"OCR worker {os.getpid()} ready ({cpu_threads} threads)")
+
+
+def _run_job(image, preprocess_chain: Optional[List[str]] = None) -> Tuple[str, float, Dict[str, Any]]:
+    """Run OCR for one image inside a worker process"""
+    text, confidence, metadata = _worker_engine.extract_with_fallback(image, preprocess_chain=preprocess_chain)
+    metadata["worker_pid"] = os.getpid()
+    return text, confidence, metadata
+
+
+def _run_page_job(image, page_index: int, scale: float = 1.0):
+    """Run OCR for one rendered PDF page inside a worker process"""
+    return _worker_engine.ocr_page(image, page_index, scale)
+
+
+class OCRWorkerPool:
+    """
+    Pool of OCR worker processes
+
+    Each worker loads PaddleOCR once at startup and then pulls image jobs
+    from the executor's queue, returning (text, confidence, metadata)
+    tuples - the same shape as OCREngine.extract_with_fallback.
+    """
+
+    def __init__(
+        self,
+        num_workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None
+    ):
+        """
+        Initialize worker pool (processes start on first job)
+
+        Args:
+            num_workers: Number of worker processes (defaults to Config.OCR_WORKERS)
+            threads_per_worker: CPU threads per worker (defaults to Config.OCR_WORKER_THREADS)
+        """
+        self.num_workers = num_workers or Config.OCR_WORKERS
+        self.threads_per_worker = threads_per_worker or Config.OCR_WORKER_THREADS
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Start the worker processes"""
+        if self._executor is not None:
+            return
+
+        logger.info(
+            f"Starting OCR worker pool: {self.num_workers} workers x "
+            f"{self.threads_per_worker} threads"
+        )
+
+        # Paddle is not fork-safe, so workers always start from a clean interpreter
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,)
+        )
+
+    def submit(self, image, preprocess_chain: Optional[List[str]] = None) -> Future:
+        """
+        Queue one image for OCR
+
+        Args:
+            image: Path to image file, encoded image bytes or image array
+            preprocess_chain: Preprocessing step names (defaults to the worker's configured chain)
+
+        Returns:
+            Future resolving to (extracted_text, confidence_score, metadata)
+        """
+        self.start()
+        if isinstance(image, Path):
+            image = str(image)
+        return self._executor.submit(_run_job, image, preprocess_chain)
+
+    def submit_page(self, image, page_index: int, scale: float = 1.0) -> Future:
+        """
+        Queue one rendered PDF page for OCR
+
+        Args:
+            image: Path to the page image, encoded image bytes or image array
+            page_index: 0-based page index recorded on the lines
+            scale: Render scale relative to the reference grid (see OCREngine.ocr_page)
+
+        Returns:
+            Future resolving to an OCRResult for the page
+        """
+        self.start()
+        if isinstance(image, Path):
+            image = str(image)
+        return self._executor.submit(_run_page_job, image, page_index, scale)
+
+    def map(
+        self,
+        images: Iterable,
+        preprocess_chains: Optional[List[Optional[List[str]]]] = None
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Run OCR for many images across the pool, preserving input order
+
+        A job that fails in the pool (e.g. a crashed worker) yields an
+        empty result with the error in its metadata.
+
+        Args:
+            images: Image paths, bytes or arrays
+            preprocess_chains: Optional preprocessing chain per image
+
+        Returns:
+            List of (extracted_text, confidence_score, metadata) tuples
+        """
+        images = list(images)
+        chains = preprocess_chains or [None] * len(images)
+        futures = [self.submit(image, chain) for image, chain in zip(images, chains)]
+        results = []
+
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"OCR worker job failed: {e}")
+                results.append(("", 0.0, {"processing_time": 0.0, "confidence": 0.0, "error": str(e)}))
+
+        return results
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("OCR worker pool stopped")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
@@ -0,0 +1,185 @@
+"""
+DocuVault - OCR Result
+Compact, array-backed container for OCR lines and their geometry
+"""
+from typing import List, Optional, Dict, Any, Sequence
+import numpy as np
+
+
+class OCRResult:
+    """
+    OCR output for one document
+
+    Holds one entry per recognized text line:
+    - texts: line strings
+    - confidences: float32 array (N,)
+    - boxes: float32 array (N, 4, 2) of corner points in original image coordinates
+    - page_indices: int32 array (N,) with the 0-based page of each line
+    """
+
+    __slots__ = ("texts", "confidences", "boxes", "page_indices")
+
+    def __init__(
+        self,
+        texts: Optional[List[str]] = None,
+        confidences: Optional[np.ndarray] = None,
+        boxes: Optional[np.ndarray] = None,
+        page_indices: Optional[np.ndarray] = None
+    ):
+        self.texts = list(texts) if texts else []
+        count = len(self.texts)
+
+        self.confidences = (
+            np.asarray(confidences, dtype=np.float32).reshape(count)
+            if confidences is not None else np.zeros(count, dtype=np.float32)
+        )
+        self.boxes = (
+            np.asarray(boxes, dtype=np.float32).reshape(count, 4, 2)
+            if boxes is not None else np.zeros((count, 4, 2), dtype=np.float32)
+        )
+        self.page_indices = (
+            np.asarray(page_indices, dtype=np.int32).reshape(count)
+            if page_indices is not None else np.zeros(count, dtype=np.int32)
+        )
+
+    @classmethod
+    def from_paddle(cls, results: list, page_offset: int = 0, scale: float = 1.0) -> "OCRResult":
+        """
+        Build from PaddleOCR's nested list output
+
+        Args:
+            results: PaddleOCR results (one entry per page, each a list of [box, (text, score)])
+            page_offset: Page index of the first entry in results
+            scale: Resolution normalization factor; boxes are divided by it to
+                map them back to original image coordinates
+
+        Returns:
+            OCRResult
+        """
+        texts, confidences, boxes, pages = [], [], [], []
+
+        for page_index, page in enumerate(results or [], start=page_offset):
+            for line in page or []:
+                if len(line) >= 2 and len(line[1]) >= 2:
+                    # line[0] = bounding box, line[1] = (text, confidence)
+                    texts.append(line[1][0])
+                    confidences.append(line[1][1])
+                    boxes.append(line[0])
+                    pages.append(page_index)
+
+        result = cls(texts, confidences, boxes, pages)
+        if scale != 1.0:
+            result.boxes /= scale
+        return result
+
+    @classmethod
+    def concatenate(cls, results: Sequence["OCRResult"]) -> "OCRResult":
+        """Join several results (e.g. one per page) into one"""
+        results = [r for r in results if len(r)]
+        if not results:
+            return cls()
+
+        return cls(
+            [text for r in results for text in r.texts],
+            np.concatenate([r.confidences for r in results]),
+            np.concatenate([r.boxes for r in results]),
+            np.concatenate([r.page_indices for r in results])
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __repr__(self) -> str:
+        pages = len(np.unique(self.page_indices)) if len(self) else 0
+        return f"OCRResult(lines={len(self)}, pages={pages})"
+
+    @property
+    def text(self) -> str:
+        """All lines joined with newlines"""
+        return "\n".join(self.texts)
+
+    @property
+    def mean_confidence(self) -> float:
+        """Average per-line recognition confidence (0.0 when empty)"""
+        return float(self.confidences.mean()) if len(self) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the arrays and strings"""
+        return (
+            self.confidences.nbytes + self.boxes.nbytes + self.page_indices.nbytes
+            + sum(len(t.encode("utf-8")) for t in self.texts)
+        )
+
+    def select(self, mask: np.ndarray) -> "OCRResult":
+        """
+        Subset of lines
+
+        Args:
+            mask: Boolean mask or index array over lines
+
+        Returns:
+            New OCRResult with the selected lines
+        """
+        indices = np.arange(len(self))[mask]
+        return OCRResult(
+            [self.texts[i] for i in indices],
+            self.confidences[indices],
+            self.boxes[indices],
+            self.page_indices[indices]
+        )
+
+    def page(self, page_index: int) -> "OCRResult":
+        """Lines of a single page"""
+        return self.select(self.page_indices == page_index)
+
+    def bounding_rects(self) -> np.ndarray:
+        """
+        Axis-aligned bounding rectangles of all lines
+
+        Returns:
+            int32 array (N, 4) of [x_min, y_min, x_max, y_max]
+        """
+        if not len(self):
+            return np.zeros((0, 4), dtype=np.int32)
+        mins = np.floor(self.boxes.min(axis=1))
+        maxs = np.ceil(self.boxes.max(axis=1))
+        return np.concatenate([mins, maxs], axis=1).astype(np.int32)
+
+    def crop(self, image: np.ndarray, index: int, padding: int = 0) -> np.ndarray:
+        """
+        Cut the region of one line out of its page image
+
+        Args:
+            image: Page image in original coordinates
+            index: Line index
+            padding: Extra pixels around the box
+
+        Returns:
+            Image crop
+        """
+        x0, y0, x1, y1 = self.bounding_rects()[index]
+        h, w = image.shape[:2]
+        return image[
+            max(y0 - padding, 0):min(y1 + padding, h),
+            max(x0 - padding, 0):min(x1 + padding, w)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable representation (used by the OCR cache)"""
+        return {
+            "texts": self.texts,
+            "confidences": np.round(self.confidences, 4).tolist(),
+            "boxes": np.round(self.boxes, 1).tolist(),
+            "page_indices": self.page_indices.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OCRResult":
+        """Rebuild from to_dict output"""
+        return cls(
+            data.get("texts"),
+            data.get("confidences"),
+            data.get("boxes"),
+            data.get("page_indices")
+        )
@@ -4,7 +4,9 @@ Convert PDF pages to images for OCR processing
 """
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+import cv2
+import numpy as np
 from loguru import logger
 
 try:
@@ -15,13 +17,14 @@ except ImportError:
     logger.warning("PyMuPDF not available. PDF support will be limited.")
 
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     PDF2IMAGE_AVAILABLE = True
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
     logger.warning("pdf2image not available. Falling back to PyMuPDF.")
 
 from core.config import Config
+from extraction.ocr_result import OCRResult
 
 
 class PDFConverter:
@@ -132,17 +135,19 @@ class PDFConverter:
         
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Convert PDF to images
-        images = convert_from_path(pdf_path, dpi=dpi)
+        # Convert PDF to images one page at a time (convert_from_path without
+        # a page range would hold every page in memory at once)
+        page_count = self.get_page_count(pdf_path)
         image_paths = []
         
         base_name = Path(pdf_path).stem
         
-        for i, image in enumerate(images):
+        for i in range(page_count):
+            image = convert_from_path(pdf_path, dpi=dpi, first_page=i + 1, last_page=i + 1)[0]
             image_path = output_dir / f"{base_name}_page_{i + 1}.png"
             image.save(str(image_path), 'PNG')
             image_paths.append(str(image_path))
-            logger.debug(f"Converted page {i + 1}/{len(images)}: {image_path.name}")
+            logger.debug(f"Converted page {i + 1}/{page_count}: {image_path.name}")
         
         logger.success(f"Converted PDF to {len(image_paths)} images using pdf2image")
         return image_paths
@@ -179,6 +184,243 @@ class PDFConverter:
             logger.error(f"PDF conversion failed: {e}")
             raise
     
+    def get_page_count(self, pdf_path: str) -> int:
+        """
+        Count the pages of a PDF without rendering them
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Returns:
+            Number of pages
+        """
+        if self.method == "pymupdf":
+            with fitz.open(pdf_path) as doc:
+                return len(doc)
+        return pdfinfo_from_path(pdf_path)["Pages"]
+    
+    def pixmap_to_array(self, pix) -> np.ndarray:
+        """
+        Convert a PyMuPDF pixmap to a BGR image array
+        
+        Wraps the pixmap's sample buffer without copying it; the only copy
+        is the RGB -> BGR conversion, which yields an array that owns its
+        memory and outlives the pixmap.
+        
+        Args:
+            pix: fitz.Pixmap in RGB (optionally with alpha)
+            
+        Returns:
+            BGR uint8 array (H, W, 3)
+        """
+        samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+        code = cv2.COLOR_RGBA2BGR if pix.alpha else cv2.COLOR_RGB2BGR
+        return cv2.cvtColor(samples, code)
+    
+    def render_page_array(self, pdf_path: str, page_index: int, dpi: int = 300) -> np.ndarray:
+        """
+        Render a single PDF page straight to an image array (no PNG, no disk I/O)
+        
+        Args:
+            pdf_path: Path to PDF file
+            page_index: 0-based page index
+            dpi: Resolution for conversion
+            
+        Returns:
+            BGR uint8 array (H, W, 3)
+        """
+        if self.method == "pymupdf":
+            with fitz.open(pdf_path) as doc:
+                image = self._render_fitz_page(doc[page_index], dpi)
+        else:
+            image = self._render_pdf2image_page(pdf_path, page_index, dpi)
+        
+        logger.debug(f"Rendered page {page_index + 1} in memory: {image.shape[1]}x{image.shape[0]}")
+        return image
+    
+    def _render_fitz_page(self, page, dpi: int) -> np.ndarray:
+        """Render an open PyMuPDF page to a BGR array"""
+        zoom = dpi / 72  # 72 is the default DPI
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=False)
+        return self.pixmap_to_array(pix)
+    
+    def _render_pdf2image_page(self, pdf_path: str, page_index: int, dpi: int) -> np.ndarray:
+        """Render one page with pdf2image (only that page is decoded) to a BGR array"""
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=page_index + 1, last_page=page_index + 1)
+        return cv2.cvtColor(np.asarray(images[0].convert("RGB")), cv2.COLOR_RGB2BGR)
+    
+    def iter_pages(
+        self,
+        pdf_path: str,
+        dpi: int = 300,
+        use_text_layer: bool = False,
+        dpi_selector: Optional[Callable[[np.ndarray, int], int]] = None
+    ) -> Iterator[Tuple[int, Union[np.ndarray, OCRResult], int]]:
+        """
+        Stream PDF pages one at a time
+        
+        Only the page being yielded is held in memory, so large scanned
+        records can be processed without materializing every page. With
+        PyMuPDF the document stays open for the whole iteration; with
+        pdf2image each page is decoded on its own via first_page/last_page.
+        
+        Args:
+            pdf_path: Path to PDF file
+            dpi: Resolution for conversion (and for text-layer boxes)
+            use_text_layer: Yield the embedded text layer (see
+                extract_text_layer) instead of rendering pages that have one
+            dpi_selector: Optional callback choosing the DPI per page; it gets
+                a probe render at Config.PDF_PROBE_DPI and the probe DPI
+            
+        Yields:
+            Tuples of (page_index, page, page_dpi) where page is a BGR uint8
+            array, or an OCRResult for text-layer pages
+        """
+        if not self.is_pdf(pdf_path):
+            raise ValueError(f"File is not a PDF: {pdf_path}")
+        
+        if self.method == "pymupdf":
+            with fitz.open(pdf_path) as doc:
+                for page_index in range(len(doc)):
+                    page = doc[page_index]
+                    text_layer = self._fitz_text_layer(page, page_index, dpi) if use_text_layer else None
+                    if text_layer is not None:
+                        yield page_index, text_layer, dpi
+                        continue
+                    
+                    page_dpi = dpi
+                    if dpi_selector:
+                        page_dpi = dpi_selector(self._render_fitz_page(page, Config.PDF_PROBE_DPI), Config.PDF_PROBE_DPI)
+                    yield page_index, self._render_fitz_page(page, page_dpi), page_dpi
+        else:
+            for page_index in range(self.get_page_count(pdf_path)):
+                page_dpi = dpi
+                if dpi_selector:
+                    probe = self._render_pdf2image_page(pdf_path, page_index, Config.PDF_PROBE_DPI)
+                    page_dpi = dpi_selector(probe, Config.PDF_PROBE_DPI)
+                yield page_index, self._render_pdf2image_page(pdf_path, page_index, page_dpi), page_dpi
+    
+    def convert_to_arrays(self, pdf_path: str, dpi: int = 300) -> List[np.ndarray]:
+        """
+        Convert every PDF page to an in-memory image array
+        
+        Args:
+            pdf_path: Path to PDF file
+            dpi: Resolution for conversion
+            
+        Returns:
+            List of BGR uint8 arrays, one per page
+        """
+        if not self.is_pdf(pdf_path):
+            raise ValueError(f"File is not a PDF: {pdf_path}")
+        
+        return [image for _, image, _ in self.iter_pages(pdf_path, dpi)]
+    
+    def extract_text_layer(self, pdf_path: str, page_index: int, dpi: int = 300) -> Optional[OCRResult]:
+        """
+        Read a page's embedded text layer as OCR-style lines
+        
+        PDFs generated by hospital systems carry their text, so rasterizing
+        and OCRing them is wasted work. Words are grouped into lines the way
+        PyMuPDF reports them, boxes are scaled to the pixel grid the page
+        would be rendered at, and every line gets the synthetic
+        Config.PDF_TEXT_LAYER_CONFIDENCE.
+        
+        A page can carry a digital header above a scanned or handwritten
+        body; its text layer then misses most of the content. Pages where
+        images without any text layer over them cover more than
+        Config.PDF_TEXT_LAYER_MAX_IMAGE_AREA of the page are therefore left
+        to OCR. Searchable scans (invisible OCR text over the page image)
+        keep using their text layer.
+        
+        Args:
+            pdf_path: Path to PDF file
+            page_index: 0-based page index
+            dpi: Resolution the boxes are expressed in (matches render_page_array)
+            
+        Returns:
+            OCRResult for the page, or None if the page has no usable text
+            layer (image-only page, fewer than Config.PDF_TEXT_LAYER_MIN_CHARS
+            characters, or large images without text) or PyMuPDF is not available
+        """
+        if self.method != "pymupdf":
+            return None
+        
+        with fitz.open(pdf_path) as doc:
+            return self._fitz_text_layer(doc[page_index], page_index, dpi)
+    
+    def _fitz_text_layer(self, page, page_index: int, dpi: int) -> Optional[OCRResult]:
+        """Text layer of an open PyMuPDF page (see extract_text_layer)"""
+        words = page.get_text("words", sort=True)
+        
+        char_count = sum(len(word[4].strip()) for word in words)
+        if char_count < Config.PDF_TEXT_LAYER_MIN_CHARS:
+            return None
+        
+        image_area = self._untexted_image_area(page, words)
+        if image_area > Config.PDF_TEXT_LAYER_MAX_IMAGE_AREA:
+            logger.debug(
+                f"Page {page_index + 1}: images without text cover {image_area:.0%} of the page, "
+                f"OCRing instead of using the text layer"
+            )
+            return None
+        
+        # Group words into lines keyed by (block_no, line_no), keeping reading order
+        lines = {}
+        for x0, y0, x1, y1, text, block_no, line_no, _ in words:
+            line = lines.setdefault((block_no, line_no), {"words": [], "rect": [x0, y0, x1, y1]})
+            line["words"].append(text)
+            rect = line["rect"]
+            line["rect"] = [min(rect[0], x0), min(rect[1], y0), max(rect[2], x1), max(rect[3], y1)]
+        
+        zoom = dpi / 72  # 72 is the default DPI
+        texts, boxes = [], []
+        for line in lines.values():
+            x0, y0, x1, y1 = (v * zoom for v in line["rect"])
+            texts.append(" ".join(line["words"]))
+            boxes.append([[x0, y0], [x1, y0], [x1, y1], [x0, y1]])
+        
+        return OCRResult(
+            texts,
+            np.full(len(texts), Config.PDF_TEXT_LAYER_CONFIDENCE, dtype=np.float32),
+            boxes,
+            np.full(len(texts), page_index, dtype=np.int32)
+        )
+    
+    def _untexted_image_area(self, page, words) -> float:
+        """
+        Fraction of a page covered by images that have no text layer over them
+        
+        Args:
+            page: Open PyMuPDF page
+            words: page.get_text("words") output
+            
+        Returns:
+            Covered fraction of the page area (0-1); an image counts as
+            covered by text when at least Config.PDF_TEXT_LAYER_MIN_CHARS
+            characters of words have their center inside it
+        """
+        page_rect = page.rect
+        page_area = page_rect.width * page_rect.height
+        if page_area <= 0:
+            return 0.0
+        
+        untexted = 0.0
+        for info in page.get_image_info():
+            rect = fitz.Rect(info["bbox"]) & page_rect
+            if rect.is_empty:
+                continue
+            
+            chars_inside = sum(
+                len(text.strip())
+                for x0, y0, x1, y1, text, *_ in words
+                if rect.contains(fitz.Point((x0 + x1) / 2, (y0 + y1) / 2))
+            )
+            if chars_inside < Config.PDF_TEXT_LAYER_MIN_CHARS:
+                untexted += rect.width * rect.height
+        
+        return min(untexted / page_area, 1.0)
+    
     def cleanup_temp_images(self, image_paths: List[str]):
         """
         Clean up temporary image files
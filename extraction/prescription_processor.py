@@ -3,15 +3,21 @@ DocuVault - Medical Prescription Processor
 Intelligent processing pipeline that combines OCR with LLM vision capabilities
 for handling handwritten prescriptions and signature detection
 """
+import asyncio
+import threading
 import time
 from pathlib import Path
 from typing import Tuple, Optional, Dict, Any, Union
 from loguru import logger
 
 from core.config import Config
+from extraction.batch_api import BatchClient
 from extraction.ocr import ocr_engine
+from extraction.ocr_pool import OCRWorkerPool
 from extraction.llm_extractor import llm_extractor
+from extraction.provider_router import provider_router
 from extraction.schema import ExtractedPrescription, HandwritingAnalysis, SignatureInfo
+from extraction.text_compaction import text_compactor
 from extraction.vision_extractor import vision_extractor
 
 
@@ -34,6 +40,9 @@ class PrescriptionProcessor:
         self.ocr = ocr_engine
         self.vision = vision_extractor
         self.llm_text = llm_extractor  # For text-to-JSON structuring (no vision)
+        self.llm_router = provider_router  # Hedged single-document structuring across both providers (if configured)
+        self.ocr_pool: Optional[OCRWorkerPool] = None  # Started on first batch
+        self._ocr_lock = threading.Lock()  # In-process OCR engine is shared by all callers
 
         if not self.vision:
             logger.warning(
@@ -47,25 +56,18 @@ class PrescriptionProcessor:
                 "High-confidence OCR will fall back to regex parsing."
             )
 
-    def classify_prescription_type(
-        self,
-        image_path: Union[str, Path],
-        ocr_confidence: float
-    ) -> str:
+    def folder_prescription_type(self, image_path: Union[str, Path]) -> Optional[str]:
         """
-        Classify prescription type based on source folder or OCR confidence
+        Prescription type hinted by the source folder name
 
         Args:
             image_path: Path to the image
-            ocr_confidence: OCR confidence score
 
         Returns:
-            Prescription type: 'handwritten', 'printed', 'mixed', or 'digital'
+            'handwritten', 'printed', 'mixed', 'digital' or None if the folder gives no hint
         """
-        path = Path(image_path)
-        parent_folder = path.parent.name.lower()
+        parent_folder = Path(image_path).parent.name.lower()
 
-        # Check folder name for hints
         if "handwrit" in parent_folder:
             return "handwritten"
         elif "print" in parent_folder:
@@ -75,6 +77,28 @@ class PrescriptionProcessor:
         elif "screen" in parent_folder or "digital" in parent_folder:
             return "digital"
 
+        return None
+
+    def classify_prescription_type(
+        self,
+        image_path: Union[str, Path],
+        ocr_confidence: float
+    ) -> str:
+        """
+        Classify prescription type based on source folder or OCR confidence
+
+        Args:
+            image_path: Path to the image
+            ocr_confidence: OCR confidence score
+
+        Returns:
+            Prescription type: 'handwritten', 'printed', 'mixed', or 'digital'
+        """
+        # Check folder name for hints
+        folder_type = self.folder_prescription_type(image_path)
+        if folder_type:
+            return folder_type
+
         # Infer from OCR confidence
         if ocr_confidence < 0.5:
             return "handwritten"
@@ -116,7 +140,13 @@ class PrescriptionProcessor:
     def process(
         self,
         image_path: Union[str, Path],
-        force_vision: bool = False
+        force_vision: bool = False,
+        ocr_result: Optional[Tuple[str, float, Dict[str, Any]]] = None,
+        use_llm_cache: bool = True,
+        llm_text_result: Optional[Tuple[ExtractedPrescription, float, Dict[str, Any]]] = None,
+        vision_result: Optional[Tuple[ExtractedPrescription, float, Dict[str, Any]]] = None,
+        signature_result: Optional[Tuple[SignatureInfo, float, Dict[str, Any]]] = None,
+        prompt_result: Optional[Tuple[str, Optional[Dict[str, Any]]]] = None
     ) -> Tuple[ExtractedPrescription, Dict[str, Any]]:
         """
         Process a prescription image with intelligent OCR/Vision fallback
@@ -124,6 +154,19 @@ class PrescriptionProcessor:
         Args:
             image_path: Path to the prescription image
             force_vision: Force using LLM vision regardless of OCR confidence
+            ocr_result: Precomputed (text, confidence, metadata) from OCR,
+                e.g. from the worker pool; OCR runs in-process when omitted
+            use_llm_cache: False to bypass the LLM response cache (e.g. forced reprocessing)
+            llm_text_result: Precomputed (prescription, time, call_info) from
+                LLM text structuring, e.g. from a packed batch request; used
+                when the document takes the LLM text path
+            vision_result: Precomputed (prescription, time, call_info) from
+                vision extraction (e.g. deferred batch); used on the vision path
+            signature_result: Precomputed (signature_info, time, call_info)
+                from signature analysis; used when stage 3 runs
+            prompt_result: Precomputed (prompt_text, compaction stats) from
+                prompt_compaction_result, e.g. by pack_llm_text; used instead of
+                compacting the OCR text again
 
         Returns:
             Tuple of (ExtractedPrescription, processing_metadata)
@@ -132,8 +175,159 @@ class PrescriptionProcessor:
         image_path = Path(image_path)
 
         logger.info(f"Processing prescription: {image_path.name}")
+        metadata = self._new_metadata(image_path)
+
+        # Stage 1: OCR Extraction
+        ocr_text, ocr_confidence, prescription_type = self._run_ocr_stage(image_path, metadata, ocr_result)
+
+        # Stage 2: Vision, LLM text structuring or regex parsing
+        method = self.choose_extraction_method(force_vision, ocr_confidence, prescription_type)
+        if method == "regex":
+            prompt_text = ocr_text
+        elif prompt_result is not None:
+            prompt_text, compaction = prompt_result
+            if compaction:
+                metadata["prompt_compaction"] = compaction
+        else:
+            prompt_text = self.compact_prompt_text(ocr_text, metadata)
+
+        if method == "vision":
+            logger.info("Stage 2: OCR confidence low or handwritten content detected - using LLM Vision...")
+
+            # Use vision extractor with OCR text as supplementary context
+            if vision_result is not None:
+                prescription, vision_time, call_info = vision_result
+            else:
+                call_info = {}
+                prescription, vision_time = self.vision.extract_from_image(
+                    image_path,
+                    ocr_text=prompt_text,
+                    ocr_confidence=ocr_confidence,
+                    use_cache=use_llm_cache,
+                    call_info=call_info
+                )
+            self._record_vision_stage(prescription, vision_time, metadata, prescription_type, ocr_confidence, call_info)
+
+        elif method == "llm_text":
+            logger.info("Stage 2: OCR confidence sufficient - using LLM text structuring (no vision)...")
+
+            # Use LLM to structure OCR text into JSON
+            if llm_text_result is not None:
+                prescription, llm_time, call_info = llm_text_result
+            else:
+                call_info = {}
+                prescription, llm_time = (self.llm_router or self.llm_text).extract(
+                    prompt_text,
+                    document_type="prescription",
+                    use_cache=use_llm_cache,
+                    call_info=call_info
+                )
+            self._record_llm_text_stage(prescription, llm_time, metadata, prescription_type, ocr_confidence, call_info)
+
+        else:
+            prescription = self._run_regex_stage(ocr_text, ocr_confidence, prescription_type, metadata)
+
+        # Assign OCR text to the prescription object
+        prescription.ocr_text = ocr_text
+
+        # Stage 3: Signature detection (always use vision if available)
+        if self.needs_signature_detection(prescription):
+            logger.info("Stage 3: Running dedicated signature detection...")
+            if signature_result is not None:
+                signature_info, sig_time, call_info = signature_result
+            else:
+                call_info = {}
+                signature_info, sig_time = self.vision.analyze_signature_only(
+                    image_path,
+                    use_cache=use_llm_cache,
+                    call_info=call_info
+                )
+            self._record_signature_stage(prescription, signature_info, sig_time, metadata, call_info)
+
+        return self._finalize(prescription, metadata, start_time, ocr_confidence)
+
+    async def process_async(
+        self,
+        image_path: Union[str, Path],
+        force_vision: bool = False,
+        ocr_result: Optional[Tuple[str, float, Dict[str, Any]]] = None,
+        use_llm_cache: bool = True
+    ) -> Tuple[ExtractedPrescription, Dict[str, Any]]:
+        """
+        Async variant of process
+
+        OCR runs in a worker thread (one document at a time, since the
+        in-process engine is shared); the LLM stages use the async clients,
+        so many documents can wait on the API concurrently.
+
+        Args:
+            image_path: Path to the prescription image
+            force_vision: Force using LLM vision regardless of OCR confidence
+            ocr_result: Precomputed (text, confidence, metadata) from OCR
+            use_llm_cache: False to bypass the LLM response cache
+
+        Returns:
+            Tuple of (ExtractedPrescription, processing_metadata)
+        """
+        start_time = time.time()
+        image_path = Path(image_path)
+
+        logger.info(f"Processing prescription (async): {image_path.name}")
+        metadata = self._new_metadata(image_path)
+
+        # Stage 1: OCR Extraction
+        ocr_text, ocr_confidence, prescription_type = await asyncio.to_thread(
+            self._run_ocr_stage, image_path, metadata, ocr_result
+        )
+
+        # Stage 2: Vision, LLM text structuring or regex parsing
+        method = self.choose_extraction_method(force_vision, ocr_confidence, prescription_type)
+        prompt_text = self.compact_prompt_text(ocr_text, metadata) if method != "regex" else ocr_text
+
+        if method == "vision":
+            logger.info("Stage 2: OCR confidence low or handwritten content detected - using LLM Vision...")
+            call_info = {}
+            prescription, vision_time = await self.vision.extract_from_image_async(
+                image_path,
+                ocr_text=prompt_text,
+                ocr_confidence=ocr_confidence,
+                use_cache=use_llm_cache,
+                call_info=call_info
+            )
+            self._record_vision_stage(prescription, vision_time, metadata, prescription_type, ocr_confidence, call_info)
+
+        elif method == "llm_text":
+            logger.info("Stage 2: OCR confidence sufficient - using LLM text structuring (no vision)...")
+            call_info = {}
+            prescription, llm_time = await (self.llm_router or self.llm_text).extract_async(
+                prompt_text,
+                document_type="prescription",
+                use_cache=use_llm_cache,
+                call_info=call_info
+            )
+            self._record_llm_text_stage(prescription, llm_time, metadata, prescription_type, ocr_confidence, call_info)
+
+        else:
+            prescription = self._run_regex_stage(ocr_text, ocr_confidence, prescription_type, metadata)
+
+        prescription.ocr_text = ocr_text
 
-        metadata = {
+        # Stage 3: Signature detection (always use vision if available)
+        if self.needs_signature_detection(prescription):
+            logger.info("Stage 3: Running dedicated signature detection...")
+            call_info = {}
+            signature_info, sig_time = await self.vision.analyze_signature_only_async(
+                image_path,
+                use_cache=use_llm_cache,
+                call_info=call_info
+            )
+            self._record_signature_stage(prescription, signature_info, sig_time, metadata, call_info)
+
+        return self._finalize(prescription, metadata, start_time, ocr_confidence)
+
+    def _new_metadata(self, image_path: Path) -> Dict[str, Any]:
+        """Initial processing metadata for a document"""
+        return {
             "file_name": image_path.name,
             "file_path": str(image_path),
             "ocr_used": True,
@@ -142,117 +336,278 @@ class PrescriptionProcessor:
             "processing_stages": []
         }
 
-        # Stage 1: OCR Extraction
+    def _run_ocr_stage(
+        self,
+        image_path: Path,
+        metadata: Dict[str, Any],
+        ocr_result: Optional[Tuple[str, float, Dict[str, Any]]] = None
+    ) -> Tuple[str, float, str]:
+        """
+        Stage 1: run (or take precomputed) OCR and classify the prescription
+
+        Args:
+            image_path: Path to the prescription image
+            metadata: Processing metadata, updated in place
+            ocr_result: Precomputed (text, confidence, metadata) from OCR
+
+        Returns:
+            Tuple of (ocr_text, ocr_confidence, prescription_type)
+        """
         logger.info("Stage 1: Running OCR extraction...")
         ocr_start = time.time()
 
         # Added logging to capture raw OCR text and metadata for debugging purposes
-        ocr_text, ocr_confidence, ocr_metadata = self.ocr.extract_with_fallback(str(image_path))
-        ocr_time = time.time() - ocr_start
+        if ocr_result is not None:
+            ocr_text, ocr_confidence, ocr_metadata = ocr_result
+            ocr_time = ocr_metadata.get("processing_time", 0.0)
+        else:
+            ocr_text, ocr_confidence, ocr_metadata = self.run_ocr(image_path)
+            ocr_time = time.time() - ocr_start
 
         # Log raw OCR text and metadata for debugging
         logger.debug(f"Raw OCR Text: {ocr_text}")
         logger.debug(f"OCR Metadata: {ocr_metadata}")
 
+        cache_info = ocr_metadata.get("cache", {})
         metadata["processing_stages"].append({
             "stage": "ocr",
             "time": ocr_time,
             "confidence": ocr_confidence,
-            "text_length": len(ocr_text)
+            "text_length": len(ocr_text),
+            "cache_hit": cache_info.get("hit", False),
+            "cache_hits": cache_info.get("hits", 0),
+            "cache_misses": cache_info.get("misses", 0)
         })
 
         logger.info(f"OCR completed: confidence={ocr_confidence:.2%}, lines={ocr_metadata.get('total_lines', 0)}")
 
+        # Keep line geometry so later consumers don't have to re-run OCR
+        metadata["ocr_result"] = ocr_metadata.get("ocr_result")
+
         # Classify prescription type
         prescription_type = self.classify_prescription_type(image_path, ocr_confidence)
         logger.info(f"Prescription type detected: {prescription_type}")
 
-        # Stage 2: Determine if vision enhancement is needed
+        return ocr_text, ocr_confidence, prescription_type
+
+    def run_ocr(self, image_path: Union[str, Path]) -> Tuple[str, float, Dict[str, Any]]:
+        """
+        Run OCR in-process with the preprocessing chain for the image's folder
+
+        Args:
+            image_path: Path to the prescription image
+
+        Returns:
+            Tuple of (extracted_text, confidence_score, metadata)
+        """
+        if self.ocr.is_multipage_input(str(image_path)):
+            # Spread document pages across the OCR workers (no-op when OCR_WORKERS <= 1)
+            self.get_ocr_pool()
+        with self._ocr_lock:
+            return self.ocr.extract_with_fallback(
+                str(image_path),
+                preprocess_chain=self.ocr.get_preprocess_chain(self.folder_prescription_type(image_path))
+            )
+
+    def compact_prompt_text(self, ocr_text: str, metadata: Dict[str, Any]) -> str:
+        """
+        Compact the OCR text that goes into LLM prompts
+
+        Args:
+            ocr_text: Raw OCR text
+            metadata: Processing metadata; receives the size reduction under "prompt_compaction"
+
+        Returns:
+            Text to paste into the prompt (unchanged when compaction is disabled)
+        """
+        if not Config.LLM_PROMPT_COMPACTION or not ocr_text:
+            return ocr_text
+
+        compacted, stats = text_compactor.compact(ocr_text, metadata.get("ocr_result"))
+        metadata["prompt_compaction"] = stats
+
+        logger.info(
+            f"Prompt OCR text compacted: {stats['original_tokens']} -> {stats['compacted_tokens']} tokens "
+            f"({stats['token_reduction']:.0%} reduction)"
+        )
+
+        return compacted
+
+    def prompt_compaction_result(
+        self,
+        ocr_text: str,
+        ocr_metadata: Dict[str, Any]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Compact a document's prompt text ahead of process(), e.g. for a batch request
+
+        Args:
+            ocr_text: Raw OCR text
+            ocr_metadata: The document's OCR metadata (for the line geometry)
+
+        Returns:
+            Tuple of (prompt_text, compaction stats or None), to pass to process() as prompt_result
+        """
+        compaction_metadata = {"ocr_result": ocr_metadata.get("ocr_result")}
+        prompt_text = self.compact_prompt_text(ocr_text, compaction_metadata)
+        return prompt_text, compaction_metadata.get("prompt_compaction")
+
+    def choose_extraction_method(
+        self,
+        force_vision: bool,
+        ocr_confidence: float,
+        prescription_type: str
+    ) -> str:
+        """
+        Pick the stage 2 extraction method
+
+        Args:
+            force_vision: Force using LLM vision regardless of OCR confidence
+            ocr_confidence: OCR confidence score
+            prescription_type: Type of prescription
+
+        Returns:
+            'vision', 'llm_text' or 'regex'
+        """
         use_vision = force_vision or self.needs_vision_enhancement(ocr_confidence, prescription_type)
 
         if use_vision and self.vision:
-            logger.info("Stage 2: OCR confidence low or handwritten content detected - using LLM Vision...")
-            vision_start = time.time()
+            return "vision"
 
-            # Use vision extractor with OCR text as supplementary context
-            prescription, vision_time = self.vision.extract_from_image(
-                image_path,
-                ocr_text=ocr_text,
-                ocr_confidence=ocr_confidence
-            )
+        # OCR confidence is high - use LLM text extractor (text-to-JSON, no vision)
+        # This is cheaper than vision but more accurate than regex
+        if self.llm_text:
+            return "llm_text"
 
-            metadata["vision_used"] = True
-            metadata["extraction_method"] = "ocr_plus_llm_vision"
-            metadata["processing_stages"].append({
-                "stage": "vision",
-                "time": vision_time,
-                "reason": f"prescription_type={prescription_type}, ocr_confidence={ocr_confidence:.2%}"
-            })
+        return "regex"
 
-            # Update prescription metadata
-            prescription.prescription_type = prescription_type
-            prescription.extraction_method = "ocr_plus_llm"
-            prescription.ocr_confidence = ocr_confidence
-            prescription.llm_enhanced = True
+    def llm_call_stats(self, call_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Per-call LLM details for a processing stage entry
 
-        else:
-            # OCR confidence is high - use LLM text extractor (text-to-JSON, no vision)
-            # This is cheaper than vision but more accurate than regex
-            if self.llm_text:
-                logger.info("Stage 2: OCR confidence sufficient - using LLM text structuring (no vision)...")
-                llm_start = time.time()
-
-                # Use LLM to structure OCR text into JSON
-                prescription, llm_time = self.llm_text.extract(ocr_text, document_type="prescription")
-
-                metadata["extraction_method"] = "ocr_plus_llm_text"
-                metadata["vision_used"] = False
-                metadata["llm_text_used"] = True
-                metadata["processing_stages"].append({
-                    "stage": "llm_text_structuring",
-                    "time": llm_time,
-                    "reason": f"OCR confidence sufficient ({ocr_confidence:.2%}), using LLM for JSON structuring"
-                })
-
-                # Update prescription metadata
-                prescription.prescription_type = prescription_type
-                prescription.extraction_method = "ocr_plus_llm_text"
-                prescription.ocr_confidence = ocr_confidence
-                prescription.llm_enhanced = True  # LLM was used (text mode, not vision)
+        Args:
+            call_info: Dict filled in by the extractor call
 
-            else:
-                # Fallback to regex parsing if LLM text extractor not available
-                logger.warning("Stage 2: LLM text extractor not available - falling back to regex parsing...")
-                from extraction.ocr_parser import ocr_parser
-                prescription = ocr_parser.parse(ocr_text, ocr_confidence)
-                prescription.prescription_type = prescription_type
-
-                metadata["extraction_method"] = "ocr_only_regex"
-                metadata["vision_used"] = False
-                metadata["processing_stages"].append({
-                    "stage": "ocr_parsing_regex",
-                    "time": 0.0,
-                    "reason": f"LLM not available, using regex fallback"
-                })
+        Returns:
+            Dict with cache_hit (response cache), deferred (Batch API),
+            input_tokens and cached_tokens (prompt tokens served from the
+            provider's prefix cache)
+        """
+        call_info = call_info or {}
+        return {
+            "cache_hit": call_info.get("cache_hit", False),
+            "deferred": call_info.get("deferred", False),
+            "input_tokens": call_info.get("input_tokens", 0),
+            "cached_tokens": call_info.get("cached_tokens", 0)
+        }
 
-        # Assign OCR text to the prescription object
-        prescription.ocr_text = ocr_text
+    def _record_vision_stage(
+        self,
+        prescription: ExtractedPrescription,
+        vision_time: float,
+        metadata: Dict[str, Any],
+        prescription_type: str,
+        ocr_confidence: float,
+        call_info: Optional[Dict[str, Any]] = None
+    ):
+        """Record the vision stage in the metadata and tag the prescription"""
+        metadata["vision_used"] = True
+        metadata["extraction_method"] = "ocr_plus_llm_vision"
+        metadata["processing_stages"].append({
+            "stage": "vision",
+            "time": vision_time,
+            "reason": f"prescription_type={prescription_type}, ocr_confidence={ocr_confidence:.2%}",
+            **self.llm_call_stats(call_info)
+        })
 
-        # Stage 3: Signature detection (always use vision if available)
-        if VISION_ALWAYS_FOR_SIGNATURES and self.vision and not prescription.doctor_signature:
-            logger.info("Stage 3: Running dedicated signature detection...")
-            sig_start = time.time()
-            signature_info, sig_time = self.vision.analyze_signature_only(image_path)
+        # Update prescription metadata
+        prescription.prescription_type = prescription_type
+        prescription.extraction_method = "ocr_plus_llm"
+        prescription.ocr_confidence = ocr_confidence
+        prescription.llm_enhanced = True
+
+    def _record_llm_text_stage(
+        self,
+        prescription: ExtractedPrescription,
+        llm_time: float,
+        metadata: Dict[str, Any],
+        prescription_type: str,
+        ocr_confidence: float,
+        call_info: Optional[Dict[str, Any]] = None
+    ):
+        """Record the LLM text structuring stage in the metadata and tag the prescription"""
+        metadata["extraction_method"] = "ocr_plus_llm_text"
+        metadata["vision_used"] = False
+        metadata["llm_text_used"] = True
+        metadata["processing_stages"].append({
+            "stage": "llm_text_structuring",
+            "time": llm_time,
+            "reason": f"OCR confidence sufficient ({ocr_confidence:.2%}), using LLM for JSON structuring",
+            "packed_documents": (call_info or {}).get("packed_documents", 1),
+            "provider": (call_info or {}).get("provider", self.llm_text.provider if self.llm_text else None),
+            "hedged": (call_info or {}).get("hedged", False),
+            **self.llm_call_stats(call_info)
+        })
 
-            prescription.doctor_signature = signature_info
+        # Update prescription metadata
+        prescription.prescription_type = prescription_type
+        prescription.extraction_method = "ocr_plus_llm_text"
+        prescription.ocr_confidence = ocr_confidence
+        prescription.llm_enhanced = True  # LLM was used (text mode, not vision)
 
-            metadata["processing_stages"].append({
-                "stage": "signature_detection",
-                "time": sig_time,
-                "signature_found": signature_info.is_present
-            })
+    def _run_regex_stage(
+        self,
+        ocr_text: str,
+        ocr_confidence: float,
+        prescription_type: str,
+        metadata: Dict[str, Any]
+    ) -> ExtractedPrescription:
+        """Fallback to regex parsing if LLM text extractor not available"""
+        logger.warning("Stage 2: LLM text extractor not available - falling back to regex parsing...")
+        from extraction.ocr_parser import ocr_parser
+        prescription = ocr_parser.parse(ocr_text, ocr_confidence)
+        prescription.prescription_type = prescription_type
 
-        # Finalize metadata
+        metadata["extraction_method"] = "ocr_only_regex"
+        metadata["vision_used"] = False
+        metadata["processing_stages"].append({
+            "stage": "ocr_parsing_regex",
+            "time": 0.0,
+            "reason": f"LLM not available, using regex fallback"
+        })
+
+        return prescription
+
+    def needs_signature_detection(self, prescription: ExtractedPrescription) -> bool:
+        """Whether stage 3 (dedicated signature detection) should run"""
+        return bool(VISION_ALWAYS_FOR_SIGNATURES and self.vision and not prescription.doctor_signature)
+
+    def _record_signature_stage(
+        self,
+        prescription: ExtractedPrescription,
+        signature_info: SignatureInfo,
+        sig_time: float,
+        metadata: Dict[str, Any],
+        call_info: Optional[Dict[str, Any]] = None
+    ):
+        """Attach the signature analysis and record the stage"""
+        prescription.doctor_signature = signature_info
+
+        metadata["processing_stages"].append({
+            "stage": "signature_detection",
+            "time": sig_time,
+            "signature_found": signature_info.is_present,
+            **self.llm_call_stats(call_info)
+        })
+
+    def _finalize(
+        self,
+        prescription: ExtractedPrescription,
+        metadata: Dict[str, Any],
+        start_time: float,
+        ocr_confidence: float
+    ) -> Tuple[ExtractedPrescription, Dict[str, Any]]:
+        """Finalize metadata and log the outcome"""
         total_time = time.time() - start_time
         metadata["total_processing_time"] = total_time
         metadata["final_confidence"] = prescription.confidence_score or ocr_confidence
@@ -267,6 +622,92 @@ class PrescriptionProcessor:
 
         return prescription, metadata
 
+    def get_ocr_pool(self) -> Optional[OCRWorkerPool]:
+        """
+        Get the OCR worker pool, starting it on first use
+
+        Returns:
+            Worker pool, or None when Config.OCR_WORKERS <= 1 (in-process OCR)
+        """
+        if Config.OCR_WORKERS <= 1:
+            return None
+
+        if self.ocr_pool is None:
+            self.ocr_pool = OCRWorkerPool()
+            self.ocr_pool.start()
+            self.ocr.pool = self.ocr_pool
+
+        return self.ocr_pool
+
+    def close(self):
+        """Release background resources (OCR worker processes)"""
+        if self.ocr_pool is not None:
+            self.ocr_pool.shutdown()
+            self.ocr_pool = None
+            self.ocr.pool = None
+
+    def pack_llm_text(
+        self,
+        image_paths: list,
+        ocr_results: list,
+        prompt_results: Optional[list] = None
+    ) -> list:
+        """
+        Run LLM text structuring for a batch's high-confidence documents in packed requests
+
+        Documents that take the LLM text path with OCR confidence of at
+        least Config.LLM_PACK_MIN_OCR_CONFIDENCE are sent several per
+        request (LLMExtractor.extract_many). Missing OCR results are filled
+        in place, so process() reuses them instead of running OCR again.
+
+        Args:
+            image_paths: List of image paths
+            ocr_results: (text, confidence, metadata) or None per image, updated in place
+            prompt_results: Optional list with an entry per image; receives the
+                (prompt_text, compaction stats) of each packed document for process()
+
+        Returns:
+            (prescription, time, call_info) or None per image
+        """
+        packed = [None] * len(image_paths)
+        indices, texts = [], []
+
+        for i, path in enumerate(image_paths):
+            if ocr_results[i] is None or "error" in ocr_results[i][2]:
+                try:
+                    ocr_results[i] = self.run_ocr(path)
+                except Exception as e:
+                    # Left to process(), which reports the failure for this document
+                    logger.error(f"OCR failed for {Path(path).name}: {e}")
+                    ocr_results[i] = None
+                    continue
+
+            ocr_text, ocr_confidence, ocr_metadata = ocr_results[i]
+            prescription_type = self.classify_prescription_type(path, ocr_confidence)
+            if (
+                ocr_confidence < Config.LLM_PACK_MIN_OCR_CONFIDENCE
+                or self.choose_extraction_method(False, ocr_confidence, prescription_type) != "llm_text"
+            ):
+                continue
+
+            prompt_result = self.prompt_compaction_result(ocr_text, ocr_metadata)
+            if prompt_results is not None:
+                prompt_results[i] = prompt_result
+            indices.append(i)
+            texts.append(prompt_result[0])
+
+        if len(indices) < 2:
+            return packed
+
+        logger.info(f"Packing LLM text structuring for {len(indices)} high-confidence documents...")
+        call_infos = [{} for _ in indices]
+        results = self.llm_text.extract_many(texts, document_type="prescription", call_infos=call_infos)
+
+        for i, (prescription, llm_time), call_info in zip(indices, results, call_infos):
+            packed[i] = (prescription, llm_time, call_info)
+
+        return packed
+
     def process_batch(
         self,
         image_paths: list,
@@ -275,6 +716,12 @@ class PrescriptionProcessor:
         """
         Process multiple prescription images
 
+        When an OCR worker pool is configured, OCR for the whole batch runs
+        across the worker processes first and the LLM stages then consume
+        the precomputed results. With Config.LLM_PACK_DOCUMENTS,
+        high-confidence printed documents share packed LLM text requests
+        (see pack_llm_text).
+
         Args:
             image_paths: List of image paths
             force_vision: Force vision for all
@@ -285,11 +732,42 @@ class PrescriptionProcessor:
         results = []
         total = len(image_paths)
 
-        for i, path in enumerate(image_paths, 1):
+        ocr_results = [None] * total
+        pool = self.get_ocr_pool()
+        if pool:
+            logger.info(f"Running OCR for {total} images on {pool.num_workers} workers...")
+            ocr_start = time.time()
+            ocr_results = pool.map(
+                [str(path) for path in image_paths],
+                [self.ocr.get_preprocess_chain(self.folder_prescription_type(path)) for path in image_paths]
+            )
+            logger.info(f"Batch OCR completed in {time.time() - ocr_start:.2f}s")
+
+        llm_text_results = [None] * total
+        prompt_results = [None] * total
+        if Config.LLM_PACK_DOCUMENTS and self.llm_text and not force_vision:
+            try:
+                llm_text_results = self.pack_llm_text(image_paths, ocr_results, prompt_results)
+            except Exception as e:
+                logger.error(f"Packed LLM text structuring failed, extracting documents individually: {e}")
+
+        for i, (path, ocr_result, llm_text_result, prompt_result) in enumerate(
+            zip(image_paths, ocr_results, llm_text_results, prompt_results), 1
+        ):
             logger.info(f"Processing {i}/{total}: {Path(path).name}")
 
+            # Jobs lost to a crashed worker are redone in-process
+            if ocr_result is not None and "error" in ocr_result[2]:
+                ocr_result = None
+
             try:
-                prescription, metadata = self.process(path, force_vision)
+                prescription, metadata = self.process(
+                    path,
+                    force_vision,
+                    ocr_result=ocr_result,
+                    llm_text_result=llm_text_result,
+                    prompt_result=prompt_result
+                )
                 results.append((prescription, metadata))
             except Exception as e:
                 logger.error(f"Failed to process {path}: {e}")
@@ -300,6 +778,305 @@ class PrescriptionProcessor:
 
         return results
 
+    def ocr_batch(self, image_paths: list) -> list:
+        """
+        Run OCR for every image (across the worker pool when configured)
+
+        Args:
+            image_paths: List of image paths
+
+        Returns:
+            (text, confidence, metadata) or None (OCR failed) per image
+        """
+        pool = self.get_ocr_pool()
+        if pool:
+            ocr_results = pool.map(
+                [str(path) for path in image_paths],
+                [self.ocr.get_preprocess_chain(self.folder_prescription_type(path)) for path in image_paths]
+            )
+        else:
+            ocr_results = [None] * len(image_paths)
+
+        for i, path in enumerate(image_paths):
+            if ocr_results[i] is None or "error" in ocr_results[i][2]:
+                try:
+                    ocr_results[i] = self.run_ocr(path)
+                except Exception as e:
+                    logger.error(f"OCR failed for {Path(path).name}: {e}")
+                    ocr_results[i] = None
+
+        return ocr_results
+
+    def build_deferred_requests(
+        self,
+        image_paths: list,
+        ocr_results: list,
+        force_vision: bool = False,
+        prompt_results: Optional[list] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the Batch API requests for a batch's LLM stages
+
+        Custom IDs are "<index>:vision", "<index>:llm_text" and
+        "<index>:signature". Signature analysis is requested for documents
+        that don't take the vision path (vision results normally carry the
+        signature; process() runs it interactively when one doesn't).
+        LLM text requests are only deferred for the OpenAI provider.
+
+        Args:
+            image_paths: List of image paths
+            ocr_results: (text, confidence, metadata) or None per image
+            force_vision: Force vision for all
+            prompt_results: Optional list with an entry per image; receives the
+                (prompt_text, compaction stats) used in each document's requests
+
+        Returns:
+            {custom_id: chat completions request body}
+        """
+        requests = {}
+
+        for i, (path, ocr_result) in enumerate(zip(image_paths, ocr_results)):
+            if ocr_result is None:
+                continue
+
+            ocr_text, ocr_confidence, ocr_metadata = ocr_result
+            prescription_type = self.classify_prescription_type(path, ocr_confidence)
+            method = self.choose_extraction_method(force_vision, ocr_confidence, prescription_type)
+            if method == "regex" and not self.vision:
+                continue
+
+            prompt_result = self.prompt_compaction_result(ocr_text, ocr_metadata)
+            if prompt_results is not None:
+                prompt_results[i] = prompt_result
+            prompt_text = prompt_result[0]
+
+            try:
+                if method == "vision":
+                    requests[f"{i}:vision"] = self.vision.build_prescription_request(
+                        self.vision.prepare_images(path), prompt_text, ocr_confidence
+                    )
+                    continue
+
+                if method == "llm_text" and self.llm_text.provider == "openai":
+                    requests[f"{i}:llm_text"] = self.llm_text.build_request(
+                        self.llm_text.build_extraction_prompt(prompt_text, "prescription")
+                    )
+
+                if self.vision and VISION_ALWAYS_FOR_SIGNATURES:
+                    requests[f"{i}:signature"] = self.vision.build_signature_request(self.vision.prepare_images(path))
+            except Exception as e:
+                # process() redoes the document's LLM stages interactively
+                logger.error(f"Failed to build batch requests for {Path(path).name}: {e}")
+
+        return requests
+
+    def _deferred_result(self, result: Optional[Dict[str, Any]], parse, batch_time: float):
+        """
+        Turn one Batch API result into a (value, time, call_info) stage result
+
+        Args:
+            result: Entry from BatchClient.fetch_results (None when missing)
+            parse: Turns the response text into the stage's value
+            batch_time: Batch turnaround, recorded as the stage time
+
+        Returns:
+            Stage result, or None if the request failed (process() then makes the call interactively)
+        """
+        if result is None:
+            return None
+        if result["error"]:
+            logger.warning(f"Batch request failed: {result['error']}")
+            return None
+
+        try:
+            value = parse(result["text"])
+        except Exception as e:
+            logger.warning(f"Batch response failed to parse: {e}")
+            return None
+
+        usage = result.get("usage") or {}
+        call_info = {
+            "cache_hit": False,
+            "deferred": True,
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        }
+        return value, batch_time, call_info
+
+    def _run_deferred_batch(
+        self,
+        batch_client: Optional[BatchClient],
+        requests: Dict[str, Dict[str, Any]],
+        description: str
+    ) -> Tuple[Dict[str, Dict[str, Any]], float]:
+        """
+        Submit one batch and wait for it
+
+        Args:
+            batch_client: Batch API client (defaults to BatchClient())
+            requests: {custom_id: request body}
+            description: Batch description suffix
+
+        Returns:
+            Tuple of ({custom_id: result}, batch turnaround in seconds); no
+            results if the batch could not be run
+        """
+        if not requests:
+            return {}, 0.0
+
+        batch_start = time.time()
+        try:
+            results = (batch_client or BatchClient()).run(requests, description=f"DocuVault deferred batch ({description})")
+        except Exception as e:
+            logger.error(f"Batch processing failed, falling back to interactive calls: {e}")
+            results = {}
+
+        return results, time.time() - batch_start
+
+    def process_batch_deferred(
+        self,
+        image_paths: list,
+        force_vision: bool = False,
+        batch_client: Optional[BatchClient] = None
+    ) -> list:
+        """
+        Process multiple prescriptions with the LLM stages run through the Batch API
+
+        For backfills that don't need interactive latency: OCR runs first,
+        then every vision, LLM text and signature request goes into a
+        JSONL batch that is submitted, polled until complete and merged
+        back by custom ID. Vision results that come back without a
+        signature get their signature analysis in a second, smaller batch.
+        Requests that fail in the batch are redone interactively by process().
+
+        Args:
+            image_paths: List of image paths
+            force_vision: Force vision for all
+            batch_client: Batch API client (defaults to BatchClient(); pass
+                one with base_url pointing at extraction.batch_server to run offline)
+
+        Returns:
+            List of (prescription, metadata) tuples, in input order
+        """
+        total = len(image_paths)
+        logger.info(f"Deferred processing of {total} prescriptions: running OCR...")
+        ocr_results = self.ocr_batch(image_paths)
+
+        prompt_results = [None] * total
+        requests = self.build_deferred_requests(image_paths, ocr_results, force_vision, prompt_results)
+        batch_results, batch_time = self._run_deferred_batch(batch_client, requests, f"{total} documents")
+
+        vision_results, llm_text_results, signature_results = [], [], []
+        for i, ocr_result in enumerate(ocr_results):
+            ocr_confidence = ocr_result[1] if ocr_result else 0.0
+            start_time = time.time()
+            vision_results.append(self._deferred_result(
+                batch_results.get(f"{i}:vision"),
+                lambda text: self.vision.parse_prescription(text, ocr_confidence, start_time),
+                batch_time
+            ))
+            llm_text_results.append(self._deferred_result(
+                batch_results.get(f"{i}:llm_text"),
+                lambda text: self.llm_text.parse_document(text, start_time),
+                batch_time
+            ))
+            signature_results.append(self._deferred_result(
+                batch_results.get(f"{i}:signature"),
+                self.vision.parse_signature,
+                batch_time
+            ) if self.vision else None)
+
+        # Second round: signatures for vision results that came back without one
+        signature_requests = {}
+        for i, vision_result in enumerate(vision_results):
+            if vision_result is not None and self.needs_signature_detection(vision_result[0]):
+                try:
+                    signature_requests[f"{i}:signature"] = self.vision.build_signature_request(
+                        self.vision.prepare_images(image_paths[i])
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to build signature request for {Path(image_paths[i]).name}: {e}")
+
+        if signature_requests:
+            signature_batch, signature_time = self._run_deferred_batch(
+                batch_client, signature_requests, f"signatures for {len(signature_requests)} documents"
+            )
+            for custom_id, result in signature_batch.items():
+                i = int(custom_id.split(":")[0])
+                signature_results[i] = self._deferred_result(result, self.vision.parse_signature, signature_time)
+
+        results = []
+        for i, (path, ocr_result) in enumerate(zip(image_paths, ocr_results)):
+            try:
+                results.append(self.process(
+                    path,
+                    force_vision,
+                    ocr_result=ocr_result,
+                    llm_text_result=llm_text_results[i],
+                    vision_result=vision_results[i],
+                    signature_result=signature_results[i],
+                    prompt_result=prompt_results[i]
+                ))
+            except Exception as e:
+                logger.error(f"Failed to process {path}: {e}")
+                results.append((
+                    ExtractedPrescription(document_type="prescription"),
+                    {"error": str(e), "file_path": str(path)}
+                ))
+
+        return results
+
+    async def process_batch_async(
+        self,
+        image_paths: list,
+        force_vision: bool = False
+    ) -> list:
+        """
+        Process multiple prescription images with concurrent LLM calls
+
+        OCR runs first (across the worker pool when configured, otherwise
+        in-process one document at a time), while the LLM stages of all
+        documents overlap, bounded by Config.LLM_MAX_CONCURRENCY.
+
+        Args:
+            image_paths: List of image paths
+            force_vision: Force vision for all
+
+        Returns:
+            List of (prescription, metadata) tuples, in input order
+        """
+        total = len(image_paths)
+
+        ocr_results = [None] * total
+        pool = self.get_ocr_pool()
+        if pool:
+            logger.info(f"Running OCR for {total} images on {pool.num_workers} workers...")
+            ocr_start = time.time()
+            ocr_results = await asyncio.to_thread(
+                pool.map,
+                [str(path) for path in image_paths],
+                [self.ocr.get_preprocess_chain(self.folder_prescription_type(path)) for path in image_paths]
+            )
+            logger.info(f"Batch OCR completed in {time.time() - ocr_start:.2f}s")
+
+        async def process_one(path, ocr_result):
+            # Jobs lost to a crashed worker are redone in-process
+            if ocr_result is not None and "error" in ocr_result[2]:
+                ocr_result = None
+
+            try:
+                return await self.process_async(path, force_vision, ocr_result=ocr_result)
+            except Exception as e:
+                logger.error(f"Failed to process {path}: {e}")
+                return (
+                    ExtractedPrescription(document_type="prescription"),
+                    {"error": str(e), "file_path": str(path)}
+                )
+
+        return list(await asyncio.gather(*(
+            process_one(path, ocr_result) for path, ocr_result in zip(image_paths, ocr_results)
+        )))
+
 
 # Global processor instance
 prescription_processor = PrescriptionProcessor()
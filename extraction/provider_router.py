@@ -0,0 +1,378 @@
+"""
+DocuVault - LLM Provider Router
+Hedged LLM text extraction across OpenAI and Anthropic with per-provider circuit breakers
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+from core.config import Config
+from extraction.llm_async import background_loop
+from extraction.llm_extractor import LLMExtractor
+from extraction.schema import ExtractedPrescription
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider"""
+
+    def __init__(self, window: Optional[int] = None):
+        """
+        Args:
+            window: Latencies kept (defaults to Config.LLM_LATENCY_WINDOW)
+        """
+        self.samples = deque(maxlen=window or Config.LLM_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def record(self, seconds: float):
+        """Add a latency sample"""
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the recorded latencies
+
+        Args:
+            percentile: 0-100
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker
+
+    closed: requests flow; Config.LLM_BREAKER_FAILURE_THRESHOLD consecutive
+    failures open the circuit.
+    open: no requests until Config.LLM_BREAKER_COOLDOWN_SECONDS have passed.
+    half_open: a single probe request is let through; its success closes
+    the circuit, its failure opens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = None, cooldown: Optional[float] = None):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open
+        """
+        self.failure_threshold = failure_threshold or Config.LLM_BREAKER_FAILURE_THRESHOLD
+        self.cooldown = cooldown or Config.LLM_BREAKER_COOLDOWN_SECONDS
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent (takes the probe slot when half-open)"""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self.probe_in_flight = False
+
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """A request returned a valid response"""
+        with self._lock:
+            if self.state != "closed":
+                logger.info("LLM provider recovered, closing circuit")
+            self.state = "closed"
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        """A request failed or returned an unusable response"""
+        with self._lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def record_cancelled(self):
+        """A request was abandoned (lost a hedge race) without an outcome"""
+        with self._lock:
+            self.probe_in_flight = False
+
+
+class ProviderRouter:
+    """
+    LLM text extraction routed across providers
+
+    Each request goes to the primary provider first. If it has not
+    answered after Config.LLM_HEDGE_PERCENTILE of the primary's recent
+    latencies, the same request is also sent to the secondary; the first
+    valid response wins and the other call is cancelled. A primary that
+    fails outright is replaced by the secondary immediately instead of
+    waiting for the hedge delay.
+
+    Providers whose circuit breaker is open are skipped, so a provider
+    that keeps failing stops receiving traffic until a probe succeeds.
+
+    Hedged requests are paid for on both providers (the cancelled call is
+    still billed for whatever it consumed), which is why routing is opt-in
+    through Config.LLM_HEDGING.
+    """
+
+    def __init__(self, extractors: Dict[str, LLMExtractor], primary: Optional[str] = None):
+        """
+        Initialize provider router
+
+        Args:
+            extractors: {provider: LLMExtractor}
+            primary: Provider tried first (defaults to Config.LLM_PRIMARY_PROVIDER)
+        """
+        primary = primary or Config.LLM_PRIMARY_PROVIDER
+        if primary not in extractors:
+            raise ValueError(f"Primary provider {primary!r} not among {sorted(extractors)}")
+
+        self.extractors = extractors
+        self.order = [primary] + [name for name in extractors if name != primary]
+        self.latencies = {name: LatencyTracker() for name in extractors}
+        self.breakers = {name: CircuitBreaker() for name in extractors}
+        self._metrics = {name: {"requests": 0, "wins": 0, "failures": 0, "hedges": 0, "cancelled": 0} for name in extractors}
+        self._lock = threading.Lock()
+
+        logger.info(f"LLM provider router initialized: {' -> '.join(self.order)}")
+
+    @property
+    def primary(self) -> LLMExtractor:
+        """Extractor of the primary provider"""
+        return self.extractors[self.order[0]]
+
+    def _count(self, provider: str, key: str):
+        """Bump a metric"""
+        with self._lock:
+            self._metrics[provider][key] += 1
+
+    def hedge_delay(self, provider: str) -> float:
+        """
+        Seconds to wait on a provider before hedging
+
+        Args:
+            provider: Provider the request went to
+
+        Returns:
+            Config.LLM_HEDGE_PERCENTILE of its recent latencies (at least
+            Config.LLM_HEDGE_MIN_DELAY), or Config.LLM_HEDGE_DEFAULT_DELAY
+            until Config.LLM_HEDGE_MIN_SAMPLES calls have been recorded
+        """
+        tracker = self.latencies[provider]
+        if len(tracker) < Config.LLM_HEDGE_MIN_SAMPLES:
+            return Config.LLM_HEDGE_DEFAULT_DELAY
+        return max(tracker.percentile(Config.LLM_HEDGE_PERCENTILE), Config.LLM_HEDGE_MIN_DELAY)
+
+    async def _attempt(
+        self,
+        provider: str,
+        ocr_text: str,
+        document_type: Optional[str],
+        use_cache: bool,
+        call_info: Dict[str, Any]
+    ) -> Tuple[str, Optional[ExtractedPrescription]]:
+        """
+        Run one provider's extraction and record the outcome
+
+        Returns:
+            Tuple of (provider, document), document None if the call failed
+        """
+        self._count(provider, "requests")
+        start = time.monotonic()
+
+        try:
+            document, _ = await self.extractors[provider].extract_async(
+                ocr_text, document_type, use_cache=use_cache, call_info=call_info
+            )
+        except asyncio.CancelledError:
+            self._count(provider, "cancelled")
+            self.breakers[provider].record_cancelled()
+            raise
+        except Exception as e:
+            logger.error(f"{provider} extraction failed: {e}")
+            document = None
+
+        if document is None or document.document_type == "unknown":
+            self._count(provider, "failures")
+            self.breakers[provider].record_failure()
+            return provider, None
+
+        self.breakers[provider].record_success()
+        if not call_info.get("cache_hit"):
+            # Cache hits would drag the percentile down to ~0 and hedge every call
+            self.latencies[provider].record(time.monotonic() - start)
+        return provider, document
+
+    async def extract_async(
+        self,
+        ocr_text: str,
+        document_type: Optional[str] = None,
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ExtractedPrescription, float]:
+        """
+        Extract structured data from OCR text with hedging and failover
+
+        Args:
+            ocr_text: OCR extracted text
+            document_type: Optional document type hint
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives the winning call's details
+                plus "provider" (who answered) and "hedged" (a second
+                provider was called)
+
+        Returns:
+            Tuple of (ExtractedPrescription, processing_time)
+        """
+        start_time = time.time()
+        candidates = list(self.order)
+        launched = []
+        tasks: Dict[asyncio.Task, Dict[str, Any]] = {}
+        winner: Optional[Tuple[str, ExtractedPrescription, Dict[str, Any]]] = None
+
+        def launch_next() -> Optional[str]:
+            """Start the next provider whose circuit allows it"""
+            while candidates:
+                provider = candidates.pop(0)
+                if not self.breakers[provider].allow_request():
+                    logger.warning(f"Skipping {provider}: circuit {self.breakers[provider].state}")
+                    continue
+                info: Dict[str, Any] = {}
+                task = asyncio.create_task(self._attempt(provider, ocr_text, document_type, use_cache, info))
+                tasks[task] = info
+                launched.append(provider)
+                return provider
+            return None
+
+        first = launch_next()
+        hedge_at = time.monotonic() + self.hedge_delay(first) if first else None
+
+        try:
+            while tasks and winner is None:
+                timeout = max(hedge_at - time.monotonic(), 0.0) if candidates and hedge_at else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Primary is slower than its usual tail: race the next provider
+                    hedge_at = None
+                    provider = launch_next()
+                    if provider:
+                        self._count(provider, "hedges")
+                        logger.info(f"{first} slower than p{Config.LLM_HEDGE_PERCENTILE}, hedging to {provider}")
+                    continue
+
+                for task in done:
+                    info = tasks.pop(task)
+                    provider, document = task.result()
+                    if document is not None and winner is None:
+                        winner = (provider, document, info)
+
+                if winner is None and not tasks:
+                    # Everything in flight failed: fail over without waiting for the hedge delay
+                    provider = launch_next()
+                    if provider:
+                        logger.warning(f"Failing over to {provider}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        processing_time = time.time() - start_time
+
+        if winner is None:
+            logger.error("LLM extraction failed on every available provider")
+            return ExtractedPrescription(document_type="unknown"), processing_time
+
+        provider, document, info = winner
+        self._count(provider, "wins")
+        if call_info is not None:
+            call_info.update(info)
+            call_info["provider"] = provider
+            call_info["hedged"] = len(launched) > 1
+
+        return document, processing_time
+
+    def extract(
+        self,
+        ocr_text: str,
+        document_type: Optional[str] = None,
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ExtractedPrescription, float]:
+        """
+        Synchronous wrapper around extract_async
+
+        Runs on the shared background event loop, so the async SDK clients
+        and their connection pools are created once and reused by every call.
+
+        Args:
+            ocr_text: OCR extracted text
+            document_type: Optional document type hint
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives per-call details (see extract_async)
+
+        Returns:
+            Tuple of (ExtractedPrescription, processing_time)
+        """
+        return background_loop.run(self.extract_async(ocr_text, document_type, use_cache, call_info))
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider counters, circuit state and hedge delay"""
+        with self._lock:
+            metrics = {name: dict(counters) for name, counters in self._metrics.items()}
+
+        for name in metrics:
+            tracker = self.latencies[name]
+            metrics[name].update({
+                "circuit": self.breakers[name].state,
+                "latency_samples": len(tracker),
+                "latency_p50": tracker.percentile(50),
+                f"latency_p{Config.LLM_HEDGE_PERCENTILE}": tracker.percentile(Config.LLM_HEDGE_PERCENTILE),
+                "hedge_delay": self.hedge_delay(name)
+            })
+        return metrics
+
+
+def build_provider_router() -> Optional[ProviderRouter]:
+    """
+    Router over both providers, if hedging is enabled and both API keys are configured
+
+    Returns:
+        ProviderRouter, or None when hedging is disabled or only one provider is available
+    """
+    if not Config.LLM_HEDGING or not (Config.OPENAI_API_KEY and Config.ANTHROPIC_API_KEY):
+        return None
+
+    extractors: Dict[str, LLMExtractor] = {}
+    for provider in ("openai", "anthropic"):
+        extractors[provider] = LLMExtractor(provider=provider)
+    return ProviderRouter(extractors)
+
+
+# Global router instance (None unless Config.LLM_HEDGING is on and both providers are configured)
+try:
+    provider_router = build_provider_router()
+except Exception as e:
+    logger.warning(f"Failed to initialize LLM provider router: {e}")
+    provider_router = None
@@ -0,0 +1,322 @@
+"""
+DocuVault - LLM Rate Limiter
+Client-side RPM/TPM token buckets with rate-limit-aware retries
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import anthropic
+import openai
+from loguru import logger
+
+from core.config import Config
+
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying (529 is Anthropic's "overloaded")
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a fixed rate
+
+    reserve() always takes the amount and lets the balance go negative; the
+    caller sleeps for the returned time. Callers are therefore served in
+    arrival order and the bucket never needs a wake-up signal.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Args:
+            capacity: Maximum burst size
+            refill_per_second: Steady-state rate
+        """
+        self.capacity = capacity
+        self.rate = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take tokens from the bucket (caller holds the limiter lock)
+
+        Args:
+            amount: Tokens to take
+            now: Current time.monotonic()
+
+        Returns:
+            Seconds to wait before the reservation is covered
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RateLimiter:
+    """
+    Shared requests/minute and tokens/minute limiter for LLM calls
+
+    Each model has its own pair of buckets sized from Config.LLM_RATE_LIMITS
+    (less Config.LLM_RATE_LIMIT_HEADROOM), shared by every extractor and
+    thread in the process. A burst of batch jobs is spread out to just under
+    the quota instead of firing all at once and collecting 429s.
+
+    When a request still fails with a retryable error it is retried with
+    exponential backoff and full jitter. A Retry-After header from a 429
+    pauses the whole model, not only the request that received it.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            limits: {model: (requests_per_minute, tokens_per_minute)} (defaults to Config.LLM_RATE_LIMITS)
+            max_retries: Retries per request (defaults to Config.LLM_MAX_RETRIES)
+            base_delay: First backoff step in seconds (defaults to Config.LLM_RETRY_BASE_DELAY)
+            max_delay: Backoff cap in seconds (defaults to Config.LLM_RETRY_MAX_DELAY)
+        """
+        self.limits = limits or Config.LLM_RATE_LIMITS
+        self.max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = base_delay or Config.LLM_RETRY_BASE_DELAY
+        self.max_delay = max_delay or Config.LLM_RETRY_MAX_DELAY
+
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def limits_for(self, model: str) -> Tuple[int, int]:
+        """(requests_per_minute, tokens_per_minute) for a model"""
+        return self.limits.get(model, Config.LLM_DEFAULT_RATE_LIMIT)
+
+    def _model_state(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        """Buckets for a model, created on first use (caller holds the lock)"""
+        if model not in self._buckets:
+            rpm, tpm = self.limits_for(model)
+            rpm *= Config.LLM_RATE_LIMIT_HEADROOM
+            tpm *= Config.LLM_RATE_LIMIT_HEADROOM
+            self._buckets[model] = (TokenBucket(rpm, rpm / 60), TokenBucket(tpm, tpm / 60))
+            self._metrics[model] = {
+                "requests": 0,
+                "tokens": 0,
+                "throttled": 0,
+                "throttle_wait_seconds": 0.0,
+                "rate_limited": 0,
+                "retries": 0,
+                "failures": 0
+            }
+        return self._buckets[model]
+
+    def _count(self, model: str, key: str, amount: float = 1):
+        """Bump a metric"""
+        with self._lock:
+            self._model_state(model)
+            self._metrics[model][key] += amount
+
+    def estimate_tokens(self, request: Dict[str, Any]) -> int:
+        """
+        Estimate the tokens a request counts against the TPM quota
+
+        Providers count the completion limit (max_tokens) up front, so it is
+        added to a ~4 characters per token estimate of the prompt; each
+        inline image adds Config.LLM_IMAGE_TOKEN_ESTIMATE.
+
+        Args:
+            request: Request body (OpenAI or Anthropic shape)
+
+        Returns:
+            Estimated token count
+        """
+        chars = 0
+        images = 0
+        contents = [request.get("system")] + [message.get("content") for message in request.get("messages", [])]
+
+        for content in contents:
+            if isinstance(content, str):
+                chars += len(content)
+                continue
+            for part in content or []:
+                if part.get("type") == "text":
+                    chars += len(part.get("text", ""))
+                elif part.get("type") in ("image_url", "image"):
+                    images += 1
+
+        return chars // 4 + images * Config.LLM_IMAGE_TOKEN_ESTIMATE + request.get("max_tokens", 0)
+
+    def reserve(self, model: str, tokens: int) -> float:
+        """
+        Reserve one request and its tokens for a model
+
+        Args:
+            model: Model name
+            tokens: Estimated tokens (see estimate_tokens)
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        with self._lock:
+            request_bucket, token_bucket = self._model_state(model)
+            now = time.monotonic()
+            wait = max(
+                request_bucket.reserve(1, now),
+                token_bucket.reserve(tokens, now),
+                self._paused_until.get(model, 0.0) - now
+            )
+
+            metrics = self._metrics[model]
+            metrics["requests"] += 1
+            metrics["tokens"] += tokens
+            if wait > 0:
+                metrics["throttled"] += 1
+                metrics["throttle_wait_seconds"] += wait
+
+        return max(wait, 0.0)
+
+    def pause(self, model: str, seconds: float):
+        """Hold back every request for a model (e.g. after a 429 with Retry-After)"""
+        with self._lock:
+            self._model_state(model)
+            until = time.monotonic() + seconds
+            self._paused_until[model] = max(self._paused_until.get(model, 0.0), until)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check whether an SDK error is transient (rate limit, overload, timeout, connection)"""
+        if isinstance(error, (openai.APIConnectionError, anthropic.APIConnectionError)):
+            return True
+        return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """
+        Read the server's requested delay from an SDK error
+
+        Args:
+            error: Exception raised by the OpenAI or Anthropic SDK
+
+        Returns:
+            Delay in seconds, or None if the response carried no hint
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            value = headers.get("retry-after")
+            if not value:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def backoff_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Delay before retry number attempt + 1
+
+        Args:
+            attempt: 0-based number of the failed attempt
+            error: The error that failed it (its Retry-After header wins if present)
+
+        Returns:
+            Seconds to wait
+        """
+        hinted = self.retry_after(error) if error is not None else None
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+
+        # Full jitter keeps concurrent retries from lining up again
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _on_failure(self, model: str, attempt: int, error: Exception) -> float:
+        """Record a failed attempt and return the retry delay (re-raises when out of retries)"""
+        if not self.is_retryable(error) or attempt >= self.max_retries:
+            self._count(model, "failures")
+            raise error
+
+        delay = self.backoff_delay(attempt, error)
+        if getattr(error, "status_code", None) == 429:
+            self._count(model, "rate_limited")
+            if self.retry_after(error) is not None:
+                self.pause(model, delay)
+
+        self._count(model, "retries")
+        logger.warning(
+            f"{model} request failed ({type(error).__name__}: {error}), "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+        )
+        return delay
+
+    def call(self, request: Dict[str, Any], send: Callable[[], T]) -> T:
+        """
+        Send a request under the rate limits, retrying transient failures
+
+        Args:
+            request: Request body (for the model name and token estimate)
+            send: Performs the API call
+
+        Returns:
+            Result of send()
+        """
+        model = request.get("model", "")
+        tokens = self.estimate_tokens(request)
+
+        for attempt in range(self.max_retries + 1):
+            wait = self.reserve(model, tokens)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return send()
+            except Exception as e:
+                time.sleep(self._on_failure(model, attempt, e))
+
+    async def call_async(self, request: Dict[str, Any], send: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async variant of call
+
+        Throttling and backoff sleeps happen before send() is awaited, so
+        callers waiting on the limiter don't hold an LLM concurrency slot.
+
+        Args:
+            request: Request body (for the model name and token estimate)
+            send: Coroutine function performing the API call
+
+        Returns:
+            Result of send()
+        """
+        model = request.get("model", "")
+        tokens = self.estimate_tokens(request)
+
+        for attempt in range(self.max_retries + 1):
+            wait = self.reserve(model, tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await send()
+            except Exception as e:
+                await asyncio.sleep(self._on_failure(model, attempt, e))
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-model counters: requests, tokens, throttled, throttle_wait_seconds, rate_limited, retries, failures"""
+        with self._lock:
+            return {model: dict(counters) for model, counters in self._metrics.items()}
+
+
+# Global limiter shared by all LLM extractors
+rate_limiter = RateLimiter()
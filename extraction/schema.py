@@ -95,6 +95,7 @@ class ExtractedPrescription(BaseModel):
 
     # Date information
     issue_date: Optional[str] = Field(default=None, description="Date prescription was issued")
+    follow_up_date: Optional[str] = Field(default=None, description="Follow-up visit date (YYYY-MM-DD)")
 
     # People involved
     patient: PatientInfo = Field(default_factory=PatientInfo)
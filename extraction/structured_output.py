@@ -0,0 +1,124 @@
+"""
+DocuVault - Structured Output Schemas
+JSON schemas for the providers' structured-output modes, generated from the Pydantic models
+"""
+import copy
+from typing import Any, Dict, Iterable, Type
+from pydantic import BaseModel
+
+from extraction.schema import ExtractedPrescription, SignatureInfo
+
+
+# Fields filled in by the pipeline, not by the model
+PIPELINE_FIELDS = ("extraction_method", "ocr_confidence", "llm_enhanced", "ocr_text")
+
+# Keywords outside the subset OpenAI's strict mode accepts (validation still happens in Pydantic)
+UNSUPPORTED_KEYWORDS = ("default", "title", "minimum", "maximum", "example", "examples")
+
+
+def _strict(node: Any, defs: Dict[str, Any]) -> Any:
+    """Inline $refs and tighten every object for strict mode"""
+    if isinstance(node, list):
+        return [_strict(item, defs) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    if "$ref" in node:
+        return _strict(copy.deepcopy(defs[node["$ref"].split("/")[-1]]), defs)
+
+    node = {
+        key: _strict(value, defs)
+        for key, value in node.items()
+        if key not in UNSUPPORTED_KEYWORDS and key != "$defs"
+    }
+
+    if node.get("type") == "object" and "properties" in node:
+        # Strict mode needs every property listed as required; optional
+        # fields stay optional through their null branch
+        node["required"] = list(node["properties"])
+        node["additionalProperties"] = False
+
+    return node
+
+
+def strict_json_schema(model: Type[BaseModel], exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Build a strict-mode JSON schema from a Pydantic model
+
+    References are inlined (Anthropic tool schemas and OpenAI strict mode
+    both accept the flat form), every object gets additionalProperties:
+    false with all properties required, and keywords strict mode rejects
+    are dropped.
+
+    Args:
+        model: Pydantic model class
+        exclude: Top-level fields to leave out
+
+    Returns:
+        JSON schema dict
+    """
+    schema = model.model_json_schema()
+    for field in exclude:
+        schema["properties"].pop(field, None)
+    return _strict(schema, schema.get("$defs", {}))
+
+
+def openai_response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """response_format for OpenAI chat completions in strict JSON-schema mode"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": schema
+        }
+    }
+
+
+def anthropic_tool(name: str, description: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Forced tool call for Anthropic messages (the tool input is the structured output)
+
+    Args:
+        name: Tool name
+        description: Tool description
+        schema: Input JSON schema
+
+    Returns:
+        Keyword arguments (tools, tool_choice) to merge into the request
+    """
+    return {
+        "tools": [{"name": name, "description": description, "input_schema": schema}],
+        "tool_choice": {"type": "tool", "name": name}
+    }
+
+
+def packed_json_schema(item_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Schema for several documents extracted in one response
+
+    Args:
+        item_schema: Strict schema of one document
+
+    Returns:
+        Strict schema of {"documents": [item, ...]}, each item carrying a document_id
+    """
+    item = copy.deepcopy(item_schema)
+    item["properties"] = {
+        "document_id": {"type": "integer", "description": "id attribute of the <document> the data came from"},
+        **item["properties"]
+    }
+    item["required"] = list(item["properties"])
+
+    return {
+        "type": "object",
+        "properties": {"documents": {"type": "array", "items": item}},
+        "required": ["documents"],
+        "additionalProperties": False
+    }
+
+
+# Built once at import; the same dicts are reused for every request
+PRESCRIPTION_JSON_SCHEMA = strict_json_schema(ExtractedPrescription, exclude=PIPELINE_FIELDS)
+SIGNATURE_JSON_SCHEMA = strict_json_schema(SignatureInfo)
+PACKED_PRESCRIPTION_JSON_SCHEMA = packed_json_schema(PRESCRIPTION_JSON_SCHEMA)
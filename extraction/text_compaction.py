@@ -0,0 +1,212 @@
+"""
+DocuVault - OCR Text Compaction
+Shrink OCR text before it is pasted into LLM prompts
+"""
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from loguru import logger
+
+from core.config import Config
+from extraction.ocr_result import OCRResult
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Separators inserted between pages by OCREngine._extract_from_pages
+PAGE_SEPARATOR = re.compile(r"^-{3}\s*Page\s+\d+\s*-{3}$", re.IGNORECASE)
+WORD_OR_SYMBOL = re.compile(r"\w+|[^\w\s]")
+WHITESPACE = re.compile(r"\s+")
+
+
+class TokenCounter:
+    """
+    Offline token counter
+
+    Uses tiktoken's o200k_base encoding (GPT-4o family) when the package
+    and its encoding file are available locally, otherwise a word-piece
+    estimate: each word costs one token per 4 characters (at least one)
+    and each punctuation mark one token.
+    """
+
+    def __init__(self):
+        self.encoding = None
+        if TIKTOKEN_AVAILABLE:
+            try:
+                self.encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                logger.debug(f"tiktoken encoding unavailable, using heuristic token counts: {e}")
+
+    @property
+    def name(self) -> str:
+        """Counter used for the estimates ("tiktoken" or "heuristic")"""
+        return "tiktoken" if self.encoding else "heuristic"
+
+    def count(self, text: str) -> int:
+        """
+        Count tokens in a text
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Token count (estimated when tiktoken is unavailable)
+        """
+        if self.encoding:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return sum(
+            max(1, math.ceil(len(piece) / 4)) if piece[0].isalnum() or piece[0] == "_" else 1
+            for piece in WORD_OR_SYMBOL.findall(text)
+        )
+
+
+class TextCompactor:
+    """
+    Remove noise from OCR text before prompting
+
+    The steps, in order:
+    - drop page separators and lines whose OCR confidence is below
+      Config.LLM_COMPACT_MIN_LINE_CONFIDENCE (needs the OCRResult)
+    - collapse runs of whitespace
+    - drop fragments with fewer than Config.LLM_COMPACT_MIN_LINE_CHARS
+      letters or digits (stray marks read as single characters)
+    - drop repeated lines: consecutive repeats always, other repeats only
+      when at least Config.LLM_COMPACT_DEDUPE_MIN_CHARS long (headers and
+      footers repeated on every page); short repeats such as "1 Morning"
+      are table cells of different medications and are kept
+    - cut the tail once the text exceeds the token budget
+
+    The stored prescription keeps the raw OCR text; only the prompt copy
+    is compacted.
+    """
+
+    TRUNCATION_MARKER = "[... truncated]"
+
+    def __init__(self, counter: Optional[TokenCounter] = None):
+        """
+        Args:
+            counter: Token counter (defaults to a new TokenCounter)
+        """
+        self.counter = counter or TokenCounter()
+
+    def low_confidence_lines(self, ocr_result: Optional[OCRResult], min_confidence: float) -> Counter:
+        """
+        Lines to drop for low recognition confidence
+
+        A line text that was also recognized confidently elsewhere in the
+        document is only dropped as many times as it was misread.
+
+        Args:
+            ocr_result: OCR lines with confidences
+            min_confidence: Lines below this are dropped
+
+        Returns:
+            Counter of line text -> occurrences to drop
+        """
+        if ocr_result is None or not len(ocr_result):
+            return Counter()
+
+        return Counter(
+            text.strip()
+            for text, confidence in zip(ocr_result.texts, ocr_result.confidences)
+            if confidence < min_confidence
+        )
+
+    def compact(
+        self,
+        text: str,
+        ocr_result: Optional[OCRResult] = None,
+        token_budget: Optional[int] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Compact OCR text for a prompt
+
+        Args:
+            text: Raw OCR text
+            ocr_result: OCR lines with confidences (enables the confidence filter)
+            token_budget: Maximum tokens to keep (defaults to Config.LLM_OCR_TOKEN_BUDGET)
+
+        Returns:
+            Tuple of (compacted_text, stats) where stats records the
+            character and token counts before and after plus what was dropped
+        """
+        token_budget = token_budget or Config.LLM_OCR_TOKEN_BUDGET
+        to_drop = self.low_confidence_lines(ocr_result, Config.LLM_COMPACT_MIN_LINE_CONFIDENCE)
+        dropped = {"low_confidence": 0, "garbage": 0, "duplicates": 0, "page_separators": 0}
+
+        lines: List[str] = []
+        seen = set()
+
+        for raw_line in text.splitlines():
+            stripped = raw_line.strip()
+            if not stripped:
+                continue
+
+            if PAGE_SEPARATOR.match(stripped):
+                dropped["page_separators"] += 1
+                continue
+
+            if to_drop[stripped] > 0:
+                to_drop[stripped] -= 1
+                dropped["low_confidence"] += 1
+                continue
+
+            line = WHITESPACE.sub(" ", stripped)
+
+            if sum(ch.isalnum() for ch in line) < Config.LLM_COMPACT_MIN_LINE_CHARS:
+                dropped["garbage"] += 1
+                continue
+
+            key = line.casefold()
+            if (lines and lines[-1].casefold() == key) or (
+                len(line) >= Config.LLM_COMPACT_DEDUPE_MIN_CHARS and key in seen
+            ):
+                dropped["duplicates"] += 1
+                continue
+
+            seen.add(key)
+            lines.append(line)
+
+        # Enforce the token budget line by line, keeping document order
+        kept: List[str] = []
+        used = 0
+        truncated_lines = 0
+        for i, line in enumerate(lines):
+            cost = self.counter.count(line) + 1  # + newline
+            if used + cost > token_budget:
+                truncated_lines = len(lines) - i
+                kept.append(self.TRUNCATION_MARKER)
+                break
+            kept.append(line)
+            used += cost
+
+        compacted = "\n".join(kept)
+
+        original_tokens = self.counter.count(text)
+        compacted_tokens = self.counter.count(compacted)
+        stats = {
+            "original_chars": len(text),
+            "compacted_chars": len(compacted),
+            "original_tokens": original_tokens,
+            "compacted_tokens": compacted_tokens,
+            "token_reduction": 1 - compacted_tokens / original_tokens if original_tokens else 0.0,
+            "dropped_lines": dropped,
+            "truncated_lines": truncated_lines,
+            "token_counter": self.counter.name
+        }
+
+        logger.debug(
+            f"Compacted OCR text for prompt: {original_tokens} -> {compacted_tokens} tokens "
+            f"({stats['token_reduction']:.0%} less, {self.counter.name})"
+        )
+
+        return compacted, stats
+
+
+# Global compactor instance
+text_compactor = TextCompactor()
@@ -0,0 +1,167 @@
+"""
+DocuVault - TIFF Reader
+Stream frames of multi-page TIFF files (e.g. from fax gateways)
+"""
+import io
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+import cv2
+import numpy as np
+from PIL import Image
+from loguru import logger
+
+
+class TIFFReader:
+    """Decode multi-frame TIFF documents one frame at a time"""
+
+    TIFF_SUFFIXES = (".tif", ".tiff")
+
+    # Fax TIFFs often carry no resolution tag; 200 DPI is the fine fax mode
+    DEFAULT_DPI = 200
+
+    def is_tiff(self, file_path: Union[str, Path]) -> bool:
+        """
+        Check if file is a TIFF
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            True if TIFF, False otherwise
+        """
+        return Path(file_path).suffix.lower() in self.TIFF_SUFFIXES
+
+    def get_frame_count(self, tiff_path: Union[str, Path]) -> int:
+        """
+        Count the frames of a TIFF without decoding them
+
+        Args:
+            tiff_path: Path to TIFF file
+
+        Returns:
+            Number of frames (pages)
+        """
+        with Image.open(tiff_path) as image:
+            return getattr(image, "n_frames", 1)
+
+    def is_multipage(self, file_path: Union[str, Path]) -> bool:
+        """Check whether a file is a TIFF with more than one frame"""
+        if not self.is_tiff(file_path):
+            return False
+        try:
+            return self.get_frame_count(file_path) > 1
+        except Exception as e:
+            logger.warning(f"Failed to read TIFF frame count for {Path(file_path).name}: {e}")
+            return False
+
+    def frame_to_8bit(self, frame: Image.Image) -> Image.Image:
+        """
+        Convert a decoded frame to an 8-bit grayscale or RGB image
+
+        Bilevel (1-bit) fax frames are expanded to 8-bit. 16- and 32-bit
+        grayscale frames are rescaled by their peak value: PIL's
+        convert("L") clips them at 255, which turns most of a 16-bit scan
+        white, and scaling by the peak rather than the container range also
+        keeps 12-bit scanner data from coming out dark.
+
+        Args:
+            frame: PIL image positioned on a frame
+
+        Returns:
+            Image in mode "L" or "RGB"
+        """
+        if frame.mode.startswith("I") or frame.mode == "F":
+            data = np.asarray(frame, dtype=np.float64)
+            peak = data.max() if data.size else 0
+            if peak > 255:
+                data = data * (255 / peak)
+            return Image.fromarray(np.clip(data, 0, 255).astype(np.uint8), "L")
+        if frame.mode in ("1", "L"):
+            return frame.convert("L")
+        return frame.convert("RGB")
+
+    def frame_to_array(self, frame: Image.Image) -> np.ndarray:
+        """
+        Convert a decoded frame to a BGR image array
+
+        Args:
+            frame: PIL image positioned on a frame
+
+        Returns:
+            BGR uint8 array (H, W, 3)
+        """
+        image = self.frame_to_8bit(frame)
+        if image.mode == "L":
+            return cv2.cvtColor(np.asarray(image), cv2.COLOR_GRAY2BGR)
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+
+    def frame_dpi(self, frame: Image.Image) -> int:
+        """Vertical resolution of a frame (fax frames are often 204x98 or 204x196)"""
+        dpi = frame.info.get("dpi")
+        if dpi and len(dpi) == 2 and dpi[1]:
+            return int(round(float(dpi[1])))
+        return self.DEFAULT_DPI
+
+    def iter_pages(self, tiff_path: Union[str, Path]) -> Iterator[Tuple[int, np.ndarray, int]]:
+        """
+        Stream TIFF frames one at a time
+
+        The file stays open for the whole iteration and each frame is only
+        decoded when it is reached, so large faxes never hold more than one
+        page in memory.
+
+        Args:
+            tiff_path: Path to TIFF file
+
+        Yields:
+            Tuples of (frame_index, BGR uint8 array, dpi) - the same shape
+            as PDFConverter.iter_pages
+        """
+        with Image.open(tiff_path) as image:
+            for frame_index in range(getattr(image, "n_frames", 1)):
+                image.seek(frame_index)
+                yield frame_index, self.frame_to_array(image), self.frame_dpi(image)
+
+    def encode_frame_png(self, tiff_path: Union[str, Path], frame_index: int = 0) -> bytes:
+        """
+        Encode one frame as PNG (e.g. for vision APIs, which don't accept TIFF)
+
+        Args:
+            tiff_path: Path to TIFF file
+            frame_index: 0-based frame index
+
+        Returns:
+            PNG bytes
+        """
+        with Image.open(tiff_path) as image:
+            image.seek(frame_index)
+            return self._encode_png(image)
+
+    def encode_frames_png(self, tiff_path: Union[str, Path], max_frames: Optional[int] = None) -> List[bytes]:
+        """
+        Encode every frame as PNG, in page order
+
+        Args:
+            tiff_path: Path to TIFF file
+            max_frames: Stop after this many frames (None for all)
+
+        Returns:
+            PNG bytes per frame
+        """
+        frames = []
+        with Image.open(tiff_path) as image:
+            frame_count = getattr(image, "n_frames", 1)
+            for frame_index in range(min(frame_count, max_frames or frame_count)):
+                image.seek(frame_index)
+                frames.append(self._encode_png(image))
+        return frames
+
+    def _encode_png(self, frame: Image.Image) -> bytes:
+        """PNG bytes of the current frame"""
+        buffer = io.BytesIO()
+        self.frame_to_8bit(frame).save(buffer, format="PNG", optimize=False)
+        return buffer.getvalue()
+
+
+# Global reader instance
+tiff_reader = TIFFReader()
@@ -3,92 +3,33 @@ DocuVault - Vision-based LLM Extractor
 Extracts data from prescription images using GPT-4o vision capabilities
 Handles handwritten text and signature detection that OCR cannot process
 """
+import asyncio
 import json
 import re
 import time
 import base64
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, Union
-from openai import OpenAI
+from typing import Dict, Any, List, Optional, Tuple, Union
+from openai import OpenAI, AsyncOpenAI
 from loguru import logger
 from pydantic import ValidationError
 
 from core.config import Config
+from extraction.llm_async import LoopLocal, llm_semaphore
+from extraction.llm_cache import cached_completion, cached_completion_async
+from extraction.llm_extractor import record_usage
+from extraction.rate_limiter import rate_limiter
 from extraction.schema import ExtractedPrescription, SignatureInfo, HandwritingAnalysis
+from extraction.structured_output import PRESCRIPTION_JSON_SCHEMA, SIGNATURE_JSON_SCHEMA, openai_response_format
+from extraction.tiff_reader import tiff_reader
 
 
-class VisionExtractor:
-    """Extract structured data from prescription images using LLM vision"""
-
-    def __init__(self):
-        """Initialize Vision extractor with OpenAI GPT-4o"""
-        if not Config.OPENAI_API_KEY:
-            raise ValueError("OPENAI_API_KEY not configured - required for vision extraction")
-
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        self.model = "gpt-4o"  # Vision-capable model
-
-        logger.info(f"Vision Extractor initialized with {self.model}")
-
-    def encode_image(self, image_path: Union[str, Path]) -> str:
-        """
-        Encode image to base64 for API transmission
-
-        Args:
-            image_path: Path to the image file
-
-        Returns:
-            Base64 encoded string
-        """
-        image_path = Path(image_path)
-
-        if not image_path.exists():
-            raise FileNotFoundError(f"Image not found: {image_path}")
-
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
-
-    def get_image_media_type(self, image_path: Union[str, Path]) -> str:
-        """Get the media type based on file extension"""
-        ext = Path(image_path).suffix.lower()
-        media_types = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".webp": "image/webp"
-        }
-        return media_types.get(ext, "image/jpeg")
-
-    def build_prescription_prompt(self, ocr_text: Optional[str] = None, ocr_confidence: Optional[float] = None) -> str:
-        """
-        Build the extraction prompt for medical prescriptions
-
-        Args:
-            ocr_text: Optional OCR-extracted text to supplement vision analysis
-            ocr_confidence: Confidence score from OCR (if available)
-
-        Returns:
-            Formatted prompt string
-        """
-        ocr_section = ""
-        if ocr_text:
-            confidence_note = f" (OCR confidence: {ocr_confidence:.1%})" if ocr_confidence else ""
-            ocr_section = f"""
-
-OCR-EXTRACTED TEXT{confidence_note}:
-The following text was extracted by OCR. Use this as a reference, but rely on your vision
-for handwritten text, signatures, and anything the OCR might have missed or misread:
-
-{ocr_text}
-
----
-"""
-
-        prompt = f"""You are an expert medical document analyzer specializing in reading medical prescriptions,
+# Static instructions and schema sent as the system message, so every request
+# starts with a byte-identical prefix that OpenAI's prompt cache can reuse
+PRESCRIPTION_SYSTEM_PROMPT = """You are an expert medical document analyzer specializing in reading medical prescriptions,
 including HANDWRITTEN text and SIGNATURES that traditional OCR systems cannot process.
 
-TASK: Analyze this medical prescription image and extract ALL information into structured JSON.
+TASK: Analyze the medical prescription image in the user message and extract ALL information into structured JSON.
 
 CRITICAL CAPABILITIES YOU MUST USE:
 1. **SIGNATURE DETECTION**: Identify and describe any signatures present. Note:
@@ -108,44 +49,45 @@ CRITICAL CAPABILITIES YOU MUST USE:
    - Printed/typed text (higher OCR reliability)
    - Handwritten text (requires your vision capabilities)
    - Unclear or ambiguous text (note these in unclear_text field)
-{ocr_section}
+
 EXPECTED JSON SCHEMA:
-{{
+{
     "document_type": "prescription",
     "prescription_type": "handwritten" | "printed" | "mixed" | "digital",
     "prescription_number": "string or null",
     "barcode": "string or null",
     "issue_date": "YYYY-MM-DD or original format",
+    "follow_up_date": "YYYY-MM-DD or null",
 
-    "patient": {{
+    "patient": {
         "name": "string or null",
         "age": "string or null",
         "gender": "string or null",
         "address": "string or null",
         "phone": "string or null",
         "patient_id": "string or null"
-    }},
+    },
 
-    "doctor": {{
+    "doctor": {
         "name": "string or null",
         "title": "string or null (e.g., ThS.BS, Dr.)",
         "specialty": "string or null",
         "license_number": "string or null",
         "phone": "string or null"
-    }},
+    },
 
-    "hospital": {{
+    "hospital": {
         "name": "string or null",
         "department": "string or null",
         "address": "string or null",
         "phone": "string or null",
         "pharmacy_counter": "string or null"
-    }},
+    },
 
     "diagnosis": "string or null",
 
     "medications": [
-        {{
+        {
             "name": "medication name",
             "dosage": "e.g., 400mg",
             "quantity": "e.g., 30 tablets",
@@ -153,30 +95,30 @@ EXPECTED JSON SCHEMA:
             "duration": "e.g., 7 days",
             "instructions": "special instructions",
             "is_handwritten": true/false
-        }}
+        }
     ],
 
-    "doctor_signature": {{
+    "doctor_signature": {
         "is_present": true/false,
         "signer_name": "name if legible",
         "signer_title": "title if visible",
         "location": "where on document",
         "is_legible": true/false,
         "confidence": 0.0-1.0
-    }},
+    },
 
-    "handwriting_analysis": {{
+    "handwriting_analysis": {
         "has_handwritten_content": true/false,
         "handwritten_sections": ["list of sections with handwriting"],
         "ocr_confidence": 0.0-1.0,
         "llm_interpretation": "your interpretation of difficult-to-read text",
         "unclear_text": ["list of text you couldn't clearly read"]
-    }},
+    },
 
     "notes": "any additional notes",
     "total_items": number,
     "confidence_score": 0.0-1.0
-}}
+}
 
 IMPORTANT RULES:
 1. Return ONLY valid JSON - no markdown code blocks, no explanations
@@ -184,15 +126,302 @@ IMPORTANT RULES:
 3. For Vietnamese prescriptions: preserve Vietnamese text exactly as written
 4. ALWAYS analyze signatures even if they're just scribbles
 5. Note which medications are handwritten vs printed
-6. Be thorough with handwriting - this is your main advantage over OCR
+6. Be thorough with handwriting - this is your main advantage over OCR"""
+
+SIGNATURE_PROMPT = """Analyze the document image in the user message and focus ONLY on signature detection.
 
+Return JSON with signature information:
+{
+    "is_present": true/false,
+    "signer_name": "name if you can read it from the signature or nearby text",
+    "signer_title": "title if visible (e.g., 'Doctor', 'BÁC SĨ ĐIỀU TRỊ')",
+    "location": "where on the document (e.g., 'bottom right', 'bottom center')",
+    "is_legible": true/false,
+    "confidence": 0.0-1.0
+}
+
+Look for:
+- Handwritten signatures (cursive writing that looks like a name)
+- Signature lines or boxes
+- Text labels like "Signature", "Ký tên", "BÁC SĨ KHÁM BỆNH"
+- Any name printed near or under the signature
+
+Return ONLY JSON, no explanations."""
+
+
+class VisionExtractor:
+    """Extract structured data from prescription images using LLM vision"""
+
+    def __init__(self):
+        """Initialize Vision extractor with OpenAI GPT-4o"""
+        if not Config.OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not configured - required for vision extraction")
+
+        # Retries are handled by the shared rate limiter, not the SDK
+        self.client = OpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0)
+        self.async_client = LoopLocal(lambda: AsyncOpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0))
+        self.model = "gpt-4o"  # Vision-capable model
+        self.structured_output = Config.LLM_STRUCTURED_OUTPUT
+
+        logger.info(f"Vision Extractor initialized with {self.model}")
+
+    def encode_images(self, image_path: Union[str, Path]) -> List[str]:
+        """
+        Encode an image to base64 for API transmission, one string per page
+
+        TIFF files (e.g. multi-page faxes) are not accepted by the vision API,
+        so each frame is re-encoded as PNG, up to Config.VISION_MAX_PAGES.
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Base64 encoded strings in page order
+        """
+        image_path = Path(image_path)
+
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image not found: {image_path}")
+
+        if tiff_reader.is_tiff(image_path):
+            frames = tiff_reader.encode_frames_png(image_path, Config.VISION_MAX_PAGES)
+            frame_count = tiff_reader.get_frame_count(image_path)
+            if frame_count > len(frames):
+                logger.warning(
+                    f"{image_path.name} has {frame_count} pages; sending the first {len(frames)} to the vision model"
+                )
+            return [base64.b64encode(frame).decode("utf-8") for frame in frames]
+
+        with open(image_path, "rb") as image_file:
+            return [base64.b64encode(image_file.read()).decode("utf-8")]
+
+    def get_image_media_type(self, image_path: Union[str, Path]) -> str:
+        """Get the media type based on file extension"""
+        ext = Path(image_path).suffix.lower()
+        media_types = {
+            ".jpg": "image/jpeg",
+            ".jpeg": "image/jpeg",
+            ".png": "image/png",
+            ".gif": "image/gif",
+            ".webp": "image/webp",
+            ".tif": "image/png",  # Re-encoded by encode_images
+            ".tiff": "image/png"
+        }
+        return media_types.get(ext, "image/jpeg")
+
+    def prepare_images(self, image_path: Union[str, Path]) -> List[Tuple[str, str]]:
+        """
+        Encode an image for the vision API
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            (base64_image, media_type) per page - one entry except for multi-page TIFFs
+        """
+        media_type = self.get_image_media_type(image_path)
+        return [(base64_image, media_type) for base64_image in self.encode_images(image_path)]
+
+    def build_vision_request(
+        self,
+        prompt: str,
+        images: List[Tuple[str, str]],
+        max_tokens: int,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Request body for an image chat completion
+
+        The user turn carries the images first (one per page, in order)
+        and the prompt text last, so static instructions belong in
+        system_prompt where they form a cacheable prefix.
+
+        Args:
+            prompt: User prompt text (per-request part; may be empty)
+            images: (base64_image, media_type) per page, from prepare_images
+            max_tokens: Completion token limit
+            system_prompt: Optional system message
+            response_format: Optional structured-output format
+
+        Returns:
+            Keyword arguments for chat.completions.create
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+
+        content = [
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:{media_type};base64,{base64_image}",
+                    "detail": "high"  # High detail for better text reading
+                }
+            }
+            for base64_image, media_type in images
+        ]
+        if prompt:
+            content.append({"type": "text", "text": prompt})
+
+        messages.append({"role": "user", "content": content})
+
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.1  # Low temperature for consistent extraction
+        }
+        if response_format:
+            request["response_format"] = response_format
+        return request
+
+    def structured_format(self, name: str, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """response_format for a schema, or None when structured output is disabled"""
+        return openai_response_format(name, schema) if self.structured_output else None
+
+    def build_prescription_request(
+        self,
+        images: List[Tuple[str, str]],
+        ocr_text: Optional[str] = None,
+        ocr_confidence: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Request body for full prescription extraction"""
+        return self.build_vision_request(
+            self.build_prescription_prompt(ocr_text, ocr_confidence),
+            images,
+            max_tokens=4096,
+            system_prompt=PRESCRIPTION_SYSTEM_PROMPT,
+            response_format=self.structured_format("extracted_prescription", PRESCRIPTION_JSON_SCHEMA)
+        )
+
+    def build_signature_request(self, images: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """Request body for signature-only analysis"""
+        return self.build_vision_request(
+            "",
+            images,
+            max_tokens=500,
+            system_prompt=SIGNATURE_PROMPT,
+            response_format=self.structured_format("signature_info", SIGNATURE_JSON_SCHEMA)
+        )
+
+    def parse_prescription(
+        self,
+        response_text: str,
+        ocr_confidence: Optional[float],
+        start_time: float
+    ) -> ExtractedPrescription:
+        """
+        Turn a vision response into a validated prescription
+
+        Args:
+            response_text: LLM response text
+            ocr_confidence: OCR confidence score to record
+            start_time: Extraction start (for the log line)
+
+        Returns:
+            ExtractedPrescription
+
+        Raises:
+            ValueError: If the response holds no valid JSON
+            ValidationError: If the JSON doesn't match the schema
+        """
+        # Decode JSON
+        raw_json = self.decode_json(response_text)
+
+        # Add extraction method metadata
+        raw_json["extraction_method"] = "llm_vision"
+        raw_json["llm_enhanced"] = True
+        if ocr_confidence:
+            raw_json["ocr_confidence"] = ocr_confidence
+
+        # Validate with Pydantic
+        prescription = ExtractedPrescription(**raw_json)
+
+        logger.success(
+            f"Vision extraction completed: "
+            f"medications={len(prescription.medications)}, "
+            f"signature_detected={prescription.doctor_signature.is_present if prescription.doctor_signature else False}, "
+            f"time={time.time() - start_time:.2f}s"
+        )
+
+        return prescription
+
+    def parse_signature(self, response_text: str) -> SignatureInfo:
+        """Turn a signature analysis response into SignatureInfo (raises on bad responses)"""
+        return SignatureInfo(**self.decode_json(response_text))
+
+    def response_text(self, response) -> str:
+        """Response text of a chat completion (raises if the model refused)"""
+        message = response.choices[0].message
+        if getattr(message, "refusal", None):
+            raise ValueError(f"Model refused the request: {message.refusal}")
+        return message.content or ""
+
+    def _complete(self, request: Dict[str, Any], call_info: Optional[Dict[str, Any]] = None) -> str:
+        """Send a chat completion request and return the response text (rate limited, retried with backoff)"""
+        response = rate_limiter.call(request, lambda: self.client.chat.completions.create(**request))
+        record_usage(response, call_info)
+        return self.response_text(response)
+
+    async def _complete_async(self, request: Dict[str, Any], call_info: Optional[Dict[str, Any]] = None) -> str:
+        """Async variant of _complete, bounded by the global LLM concurrency limit"""
+        async def send():
+            async with llm_semaphore():
+                return await self.async_client.get().chat.completions.create(**request)
+
+        response = await rate_limiter.call_async(request, send)
+        record_usage(response, call_info)
+        return self.response_text(response)
+
+    def build_prescription_prompt(self, ocr_text: Optional[str] = None, ocr_confidence: Optional[float] = None) -> str:
+        """
+        Build the per-document part of the prescription prompt
+
+        The instructions and schema are the static PRESCRIPTION_SYSTEM_PROMPT,
+        so only the OCR text changes between requests and it comes last.
+
+        Args:
+            ocr_text: Optional OCR-extracted text to supplement vision analysis
+            ocr_confidence: Confidence score from OCR (if available)
+
+        Returns:
+            User turn text
+        """
+        if not ocr_text:
+            return "Analyze the prescription image now:"
+
+        confidence_note = f" (OCR confidence: {ocr_confidence:.1%})" if ocr_confidence else ""
+        return f"""OCR-EXTRACTED TEXT{confidence_note}:
+The following text was extracted by OCR. Use this as a reference, but rely on your vision
+for handwritten text, signatures, and anything the OCR might have missed or misread:
+
+{ocr_text}
+
+---
 Analyze the prescription image now:"""
 
-        return prompt
+    def decode_json(self, text: str) -> Dict[str, Any]:
+        """
+        Decode the JSON document in a vision response
+
+        In structured-output mode the response is the JSON document itself
+        and is decoded in a single pass; otherwise it is scraped out of the
+        free text.
+
+        Args:
+            text: LLM response text
+
+        Returns:
+            Parsed JSON dict
+        """
+        if self.structured_output:
+            return json.loads(text)
+        return self.extract_json_from_response(text)
 
     def extract_json_from_response(self, text: str) -> Dict[str, Any]:
         """
-        Extract JSON from LLM response
+        Extract JSON from free-text LLM response (non-structured mode)
 
         Args:
             text: LLM response text
@@ -216,7 +445,9 @@ Analyze the prescription image now:"""
         self,
         image_path: Union[str, Path],
         ocr_text: Optional[str] = None,
-        ocr_confidence: Optional[float] = None
+        ocr_confidence: Optional[float] = None,
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
     ) -> Tuple[ExtractedPrescription, float]:
         """
         Extract prescription data directly from image using vision
@@ -225,6 +456,9 @@ Analyze the prescription image now:"""
             image_path: Path to the prescription image
             ocr_text: Optional OCR text to supplement analysis
             ocr_confidence: OCR confidence score
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives per-call details
+                ("cache_hit", "input_tokens", "cached_tokens")
 
         Returns:
             Tuple of (ExtractedPrescription, processing_time)
@@ -233,67 +467,25 @@ Analyze the prescription image now:"""
 
         try:
             # Encode image
-            base64_image = self.encode_image(image_path)
-            media_type = self.get_image_media_type(image_path)
-
-            # Build prompt
-            prompt = self.build_prescription_prompt(ocr_text, ocr_confidence)
-
-            logger.info(f"Calling GPT-4o Vision for prescription extraction...")
-
-            # Call GPT-4o with vision
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert medical prescription analyzer with advanced capabilities for reading handwritten text and detecting signatures. Return only valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{media_type};base64,{base64_image}",
-                                    "detail": "high"  # High detail for better text reading
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=4096,
-                temperature=0.1  # Low temperature for consistent extraction
-            )
-
-            response_text = response.choices[0].message.content or ""
-
-            # Extract JSON
-            raw_json = self.extract_json_from_response(response_text)
-
-            # Add extraction method metadata
-            raw_json["extraction_method"] = "llm_vision"
-            raw_json["llm_enhanced"] = True
-            if ocr_confidence:
-                raw_json["ocr_confidence"] = ocr_confidence
-
-            # Validate with Pydantic
-            prescription = ExtractedPrescription(**raw_json)
-
-            processing_time = time.time() - start_time
-
-            logger.success(
-                f"Vision extraction completed: "
-                f"medications={len(prescription.medications)}, "
-                f"signature_detected={prescription.doctor_signature.is_present if prescription.doctor_signature else False}, "
-                f"time={processing_time:.2f}s"
+            images = self.prepare_images(image_path)
+
+            request = self.build_prescription_request(images, ocr_text, ocr_confidence)
+
+            def call_vision() -> str:
+                logger.info(f"Calling GPT-4o Vision for prescription extraction...")
+                return self._complete(request, call_info)
+
+            # Call GPT-4o with vision (or answer from the response cache)
+            prescription = cached_completion(
+                "openai",
+                request,
+                call_vision,
+                lambda text: self.parse_prescription(text, ocr_confidence, start_time),
+                use_cache=use_cache,
+                call_info=call_info
             )
 
-            return prescription, processing_time
+            return prescription, time.time() - start_time
 
         except ValidationError as e:
             logger.error(f"Validation error in vision extraction: {e}")
@@ -315,13 +507,18 @@ Analyze the prescription image now:"""
 
     def analyze_signature_only(
         self,
-        image_path: Union[str, Path]
+        image_path: Union[str, Path],
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
     ) -> Tuple[SignatureInfo, float]:
         """
         Analyze image specifically for signature detection
 
         Args:
             image_path: Path to the document image
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives per-call details
+                ("cache_hit", "input_tokens", "cached_tokens")
 
         Returns:
             Tuple of (SignatureInfo, processing_time)
@@ -329,54 +526,123 @@ Analyze the prescription image now:"""
         start_time = time.time()
 
         try:
-            base64_image = self.encode_image(image_path)
-            media_type = self.get_image_media_type(image_path)
+            images = self.prepare_images(image_path)
+
+            request = self.build_signature_request(images)
+            signature_info = cached_completion(
+                "openai",
+                request,
+                lambda: self._complete(request, call_info),
+                self.parse_signature,
+                use_cache=use_cache,
+                call_info=call_info
+            )
+            processing_time = time.time() - start_time
 
-            prompt = """Analyze this document image and focus ONLY on signature detection.
+            logger.info(f"Signature analysis complete: present={signature_info.is_present}, time={processing_time:.2f}s")
 
-Return JSON with signature information:
-{
-    "is_present": true/false,
-    "signer_name": "name if you can read it from the signature or nearby text",
-    "signer_title": "title if visible (e.g., 'Doctor', 'BÁC SĨ ĐIỀU TRỊ')",
-    "location": "where on the document (e.g., 'bottom right', 'bottom center')",
-    "is_legible": true/false,
-    "confidence": 0.0-1.0
-}
+            return signature_info, processing_time
 
-Look for:
-- Handwritten signatures (cursive writing that looks like a name)
-- Signature lines or boxes
-- Text labels like "Signature", "Ký tên", "BÁC SĨ KHÁM BỆNH"
-- Any name printed near or under the signature
+        except Exception as e:
+            logger.error(f"Signature analysis failed: {e}")
+            processing_time = time.time() - start_time
+            return SignatureInfo(is_present=False), processing_time
 
-Return ONLY JSON, no explanations."""
+    async def extract_from_image_async(
+        self,
+        image_path: Union[str, Path],
+        ocr_text: Optional[str] = None,
+        ocr_confidence: Optional[float] = None,
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ExtractedPrescription, float]:
+        """
+        Async variant of extract_from_image using the async SDK client
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{media_type};base64,{base64_image}",
-                                    "detail": "high"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=500,
-                temperature=0.1
+        Image encoding runs in a worker thread; the request itself is bounded
+        by the global LLM concurrency limit (Config.LLM_MAX_CONCURRENCY).
+
+        Args:
+            image_path: Path to the prescription image
+            ocr_text: Optional OCR text to supplement analysis
+            ocr_confidence: OCR confidence score
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives per-call details
+                ("cache_hit", "input_tokens", "cached_tokens")
+
+        Returns:
+            Tuple of (ExtractedPrescription, processing_time)
+        """
+        start_time = time.time()
+
+        try:
+            images = await asyncio.to_thread(self.prepare_images, image_path)
+
+            request = self.build_prescription_request(images, ocr_text, ocr_confidence)
+
+            async def call_vision() -> str:
+                logger.info(f"Calling GPT-4o Vision for prescription extraction (async)...")
+                return await self._complete_async(request, call_info)
+
+            prescription = await cached_completion_async(
+                "openai",
+                request,
+                call_vision,
+                lambda text: self.parse_prescription(text, ocr_confidence, start_time),
+                use_cache=use_cache,
+                call_info=call_info
             )
 
-            response_text = response.choices[0].message.content or ""
-            raw_json = self.extract_json_from_response(response_text)
+            return prescription, time.time() - start_time
 
-            signature_info = SignatureInfo(**raw_json)
+        except ValidationError as e:
+            logger.error(f"Validation error in vision extraction: {e}")
+            return ExtractedPrescription(
+                document_type="prescription",
+                extraction_method="llm_vision",
+                llm_enhanced=True
+            ), time.time() - start_time
+
+        except Exception as e:
+            logger.error(f"Vision extraction failed: {e}")
+            return ExtractedPrescription(
+                document_type="prescription",
+                extraction_method="llm_vision",
+                llm_enhanced=True
+            ), time.time() - start_time
+
+    async def analyze_signature_only_async(
+        self,
+        image_path: Union[str, Path],
+        use_cache: bool = True,
+        call_info: Optional[Dict[str, Any]] = None
+    ) -> Tuple[SignatureInfo, float]:
+        """
+        Async variant of analyze_signature_only
+
+        Args:
+            image_path: Path to the document image
+            use_cache: False to bypass the LLM response cache
+            call_info: Optional dict that receives per-call details
+                ("cache_hit", "input_tokens", "cached_tokens")
+
+        Returns:
+            Tuple of (SignatureInfo, processing_time)
+        """
+        start_time = time.time()
+
+        try:
+            images = await asyncio.to_thread(self.prepare_images, image_path)
+
+            request = self.build_signature_request(images)
+            signature_info = await cached_completion_async(
+                "openai",
+                request,
+                lambda: self._complete_async(request, call_info),
+                self.parse_signature,
+                use_cache=use_cache,
+                call_info=call_info
+            )
             processing_time = time.time() - start_time
 
             logger.info(f"Signature analysis complete: present={signature_info.is_present}, time={processing_time:.2f}s")
@@ -385,8 +651,7 @@ Return ONLY JSON, no explanations."""
 
         except Exception as e:
             logger.error(f"Signature analysis failed: {e}")
-            processing_time = time.time() - start_time
-            return SignatureInfo(is_present=False), processing_time
+            return SignatureInfo(is_present=False), time.time() - start_time
 
     def read_handwritten_text(
         self,
@@ -406,8 +671,7 @@ Return ONLY JSON, no explanations."""
         start_time = time.time()
 
         try:
-            base64_image = self.encode_image(image_path)
-            media_type = self.get_image_media_type(image_path)
+            images = self.prepare_images(image_path)
 
             region_instruction = f"\nFocus especially on: {region_hint}" if region_hint else ""
 
@@ -422,28 +686,8 @@ Instructions:
 Return your transcription as plain text, preserving line breaks where appropriate.
 Mark unclear portions with [unclear: your best guess]."""
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{media_type};base64,{base64_image}",
-                                    "detail": "high"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=2000,
-                temperature=0.1
-            )
-
-            extracted_text = response.choices[0].message.content or ""
+            request = self.build_vision_request(prompt, images, max_tokens=2000)
+            extracted_text = cached_completion("openai", request, lambda: self._complete(request), lambda text: text)
             processing_time = time.time() - start_time
 
             logger.info(f"Handwritten text extraction complete: {len(extracted_text)} chars, time={processing_time:.2f}s")
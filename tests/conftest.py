@@ -0,0 +1,11 @@
+"""
+DocuVault - Test configuration
+"""
+import os
+import sys
+from pathlib import Path
+
+# The extractors are created at import and need a key to exist; tests never reach the real API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
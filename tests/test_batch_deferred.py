@@ -0,0 +1,142 @@
+"""
+DocuVault - Deferred batch processing tests
+Runs process_batch_deferred end to end against the local stand-in Batch API server
+"""
+import cv2
+import numpy as np
+import pytest
+
+from core.config import Config
+from extraction.batch_api import BatchClient
+from extraction.batch_server import start_server
+from extraction.prescription_processor import PrescriptionProcessor
+
+
+@pytest.fixture
+def batch_server():
+    server, base_url = start_server(port=0, delay=0.1)
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def processor(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "LLM_BATCH_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(Config, "BATCH_DIR", tmp_path / "batches")
+
+    processor = PrescriptionProcessor()
+    if not processor.vision or not processor.llm_text:
+        pytest.skip("OpenAI extractors not available")
+
+    def interactive_call(*args, **kwargs):
+        raise AssertionError("deferred processing made an interactive LLM call")
+
+    monkeypatch.setattr(processor.vision, "_complete", interactive_call)
+    monkeypatch.setattr(processor.llm_text, "send", interactive_call)
+    monkeypatch.setattr(processor, "llm_router", None)
+    monkeypatch.setattr(processor.llm_text, "provider", "openai")
+    return processor
+
+
+def write_image(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image = np.full((200, 300, 3), 255, dtype=np.uint8)
+    cv2.putText(image, "Rx", (20, 100), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 3)
+    cv2.imwrite(str(path), image)
+    return path
+
+
+def test_deferred_batch_runs_every_llm_stage_through_the_batch_api(processor, batch_server, tmp_path, monkeypatch):
+    paths = [
+        write_image(tmp_path / "printed" / "a.png"),
+        write_image(tmp_path / "printed" / "b.png"),
+        write_image(tmp_path / "handwritten" / "c.png")
+    ]
+    ocr_text = "Dr. Smith\nAmoxicillin 500mg\nTake twice daily"
+    confidences = [0.95, 0.9, 0.4]
+    monkeypatch.setattr(
+        processor,
+        "ocr_batch",
+        lambda image_paths: [(ocr_text, confidence, {}) for confidence in confidences]
+    )
+
+    client = BatchClient(base_url=batch_server)
+    submitted = []
+    submit = client.submit
+
+    def record_submit(path, description=None):
+        submitted.append(path.read_text(encoding="utf-8").count("\n"))
+        return submit(path, description)
+
+    monkeypatch.setattr(client, "submit", record_submit)
+
+    results = processor.process_batch_deferred(paths, batch_client=client)
+
+    assert len(results) == 3
+    methods = [metadata["extraction_method"] for _, metadata in results]
+    assert methods == ["ocr_plus_llm_text", "ocr_plus_llm_text", "ocr_plus_llm_vision"]
+
+    expected_stages = [
+        ["llm_text_structuring", "signature_detection"],
+        ["llm_text_structuring", "signature_detection"],
+        ["vision", "signature_detection"]
+    ]
+    for (prescription, metadata), expected in zip(results, expected_stages):
+        assert "error" not in metadata
+        assert prescription.ocr_text == ocr_text
+        llm_stages = [stage for stage in metadata["processing_stages"] if stage["stage"] != "ocr"]
+        assert [stage["stage"] for stage in llm_stages] == expected
+        assert all(stage["deferred"] for stage in llm_stages)
+
+    # One batch for the first round and, for the vision document, one for the signature round
+    assert submitted == [5, 1]
+    # Input files carry the prescription images and must not outlive the upload
+    assert list((tmp_path / "batches").iterdir()) == []
+
+
+def test_parts_submitted_before_a_failure_are_still_collected(batch_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_BATCH_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(Config, "LLM_BATCH_MAX_REQUESTS", 1)
+    monkeypatch.setattr(Config, "BATCH_DIR", tmp_path / "batches")
+
+    client = BatchClient(base_url=batch_server)
+    submit = client.submit
+    calls = []
+
+    def flaky_submit(path, description=None):
+        calls.append(path)
+        if len(calls) == 2:
+            raise ConnectionError("upload interrupted")
+        return submit(path, description)
+
+    monkeypatch.setattr(client, "submit", flaky_submit)
+    requests = {
+        f"{i}:llm_text": {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": f"document {i}"}]}
+        for i in range(3)
+    }
+
+    results = client.run(requests, description="test")
+
+    assert len(calls) == 3
+    assert sorted(results) == ["0:llm_text", "2:llm_text"]
+    assert all(result["error"] is None for result in results.values())
+    assert list((tmp_path / "batches").iterdir()) == []
+
+
+def test_split_requests_respects_count_and_byte_limits():
+    client = BatchClient(base_url="http://127.0.0.1:1/v1", api_key="test-key")
+    requests = {
+        f"{i}:llm_text": {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "x" * 1000}]}
+        for i in range(7)
+    }
+
+    by_count = client.split_requests(requests, max_requests=3, max_bytes=10 ** 9)
+    assert [len(chunk) for chunk in by_count] == [3, 3, 1]
+
+    line_bytes = len(client.request_line("0:llm_text", requests["0:llm_text"]).encode("utf-8"))
+    by_bytes = client.split_requests(requests, max_requests=100, max_bytes=2 * line_bytes)
+    assert [len(chunk) for chunk in by_bytes] == [2, 2, 2, 1]
+
+    merged = [custom_id for chunk in by_bytes for custom_id in chunk]
+    assert merged == list(requests)
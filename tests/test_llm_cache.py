@@ -0,0 +1,77 @@
+"""
+DocuVault - LLM response cache tests
+Hits, misses and expiry, read errors and connection cleanup on a temporary SQLite file
+"""
+import sqlite3
+
+import pytest
+
+from extraction.llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(db_path=tmp_path / "llm_cache.sqlite3", ttl_hours=1, max_size_mb=1)
+
+
+def test_put_then_get(cache):
+    key = cache.make_key("openai", {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "rx"}]})
+
+    assert cache.get(key) is None
+    cache.put(key, "openai", "gpt-4o-mini", '{"diagnosis": "MALARIA"}')
+
+    assert cache.get(key) == '{"diagnosis": "MALARIA"}'
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_expired_entry_is_a_miss(cache):
+    cache.put("key", "openai", "gpt-4o-mini", "response")
+    cache.ttl = -1
+
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_unreadable_database_is_a_miss(cache):
+    cache.db_path.write_bytes(b"not a database" * 100)
+
+    assert cache.get("key") is None
+    assert cache.misses == 1
+
+    # Writes fail the same way, without raising
+    cache.put("key", "openai", "gpt-4o-mini", "response")
+
+
+def test_locked_database_is_a_miss(cache, monkeypatch):
+    cache.put("key", "openai", "gpt-4o-mini", "response")
+
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "_connect", locked)
+
+    assert cache.get("key") is None
+
+
+def test_connections_are_closed(cache, monkeypatch):
+    opened = []
+    connect = cache._connect
+
+    def tracking_connect():
+        conn = connect()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(cache, "_connect", tracking_connect)
+
+    cache.put("key", "openai", "gpt-4o-mini", "response")
+    cache.get("key")
+    cache.evict()
+    cache.stats()
+    cache.delete("key")
+    cache.clear()
+
+    assert len(opened) == 6
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
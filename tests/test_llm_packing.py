@@ -0,0 +1,202 @@
+"""
+DocuVault - Packed LLM extraction tests
+Mapping packed responses back to their documents and choosing which ones are redone individually
+"""
+import json
+
+import pytest
+
+from core.config import Config
+from extraction.llm_extractor import LLMExtractor, split_usage
+from extraction.prescription_processor import PrescriptionProcessor
+from extraction.schema import ExtractedPrescription
+from extraction.text_compaction import text_compactor
+
+
+@pytest.fixture
+def extractor():
+    return LLMExtractor(provider="openai")
+
+
+def packed(*items):
+    return json.dumps({"documents": list(items)})
+
+
+def test_documents_are_placed_by_document_id(extractor):
+    response = packed(
+        {"document_id": 2, "diagnosis": "second"},
+        {"document_id": 1, "diagnosis": "first"}
+    )
+
+    documents = extractor.parse_packed(response, 3)
+
+    assert [d.diagnosis if d else None for d in documents] == ["first", "second", None]
+
+
+def test_missing_document_id_falls_back_to_position(extractor):
+    documents = extractor.parse_packed(packed({"diagnosis": "a"}, {"diagnosis": "b"}), 2)
+
+    assert [d.diagnosis for d in documents] == ["a", "b"]
+
+
+def test_bad_elements_are_left_for_individual_extraction(extractor):
+    response = packed(
+        {"document_id": 1, "diagnosis": "kept"},
+        {"document_id": 1, "diagnosis": "duplicate"},
+        {"document_id": 2, "confidence_score": 7},
+        {"document_id": 3, "document_type": "unknown"},
+        {"document_id": 9, "diagnosis": "out of range"},
+        {"document_id": "four", "diagnosis": "not an id"},
+        "not an object"
+    )
+
+    documents = extractor.parse_packed(response, 4)
+
+    assert documents[0].diagnosis == "kept"
+    assert documents[1:] == [None, None, None]
+
+
+def test_response_without_usable_documents_raises(extractor):
+    with pytest.raises(ValueError):
+        extractor.parse_packed(json.dumps({"result": []}), 2)
+    with pytest.raises(ValueError):
+        extractor.parse_packed(packed({"document_id": 1, "document_type": "unknown"}), 2)
+
+
+def test_pack_chunks_respects_document_and_token_limits(extractor, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_PACK_MAX_DOCUMENTS", 3)
+    monkeypatch.setattr(Config, "LLM_PACK_MAX_INPUT_TOKENS", 100)
+    counts = {"short": 10, "medium": 60, "huge": 500}
+    monkeypatch.setattr("extraction.llm_extractor.text_compactor.counter.count", lambda text: counts[text])
+
+    assert extractor.pack_chunks(["short"] * 7) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert extractor.pack_chunks(["medium", "short", "medium", "short"]) == [[0, 1], [2, 3]]
+    # A document over the token limit still gets a request of its own
+    assert extractor.pack_chunks(["short", "huge", "short"]) == [[0], [1], [2]]
+    assert extractor.pack_chunks([]) == []
+
+
+def test_extract_many_redoes_only_failed_documents(extractor, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_PACK_MAX_DOCUMENTS", 8)
+    sent = []
+
+    def send(request, call_info=None):
+        sent.append(request)
+        return packed(
+            {"document_id": 1, "diagnosis": "packed 1"},
+            {"document_id": 3, "document_type": "unknown"}
+        )
+
+    redone = []
+
+    def extract(ocr_text, document_type=None, use_cache=True, call_info=None):
+        redone.append(ocr_text)
+        return ExtractedPrescription(diagnosis=f"single {ocr_text}"), 0.0
+
+    monkeypatch.setattr(extractor, "send", send)
+    monkeypatch.setattr(extractor, "extract", extract)
+    infos = [{}, {}, {}]
+
+    results = extractor.extract_many(["doc a", "doc b", "doc c"], use_cache=False, call_infos=infos)
+
+    assert len(sent) == 1
+    assert redone == ["doc b", "doc c"]
+    assert [document.diagnosis for document, _ in results] == ["packed 1", "single doc b", "single doc c"]
+    assert infos[0]["packed_documents"] == 3
+    assert "packed_documents" not in infos[1]
+
+
+def test_extract_many_redoes_everything_when_the_pack_fails(extractor, monkeypatch):
+    def send(request, call_info=None):
+        return "not json at all"
+
+    redone = []
+
+    def extract(ocr_text, document_type=None, use_cache=True, call_info=None):
+        redone.append(ocr_text)
+        return ExtractedPrescription(), 0.0
+
+    monkeypatch.setattr(extractor, "send", send)
+    monkeypatch.setattr(extractor, "extract", extract)
+
+    results = extractor.extract_many(["doc a", "doc b"], use_cache=False)
+
+    assert redone == ["doc a", "doc b"]
+    assert len(results) == 2
+
+
+def test_split_usage_is_proportional_and_keeps_the_total():
+    assert split_usage(300, [1, 2]) == [100, 200]
+    assert split_usage(10, [1, 1, 1]) == [4, 3, 3]
+    assert split_usage(7, [0, 0]) == [4, 3]
+    assert split_usage(0, [5, 3]) == [0, 0]
+
+
+def test_pack_usage_is_split_across_its_documents(extractor, monkeypatch):
+    counts = {"doc a": 10, "doc b": 30, "doc c": 60}
+    monkeypatch.setattr("extraction.llm_extractor.text_compactor.counter.count", lambda text: counts[text])
+
+    def send(request, call_info=None):
+        call_info.update(input_tokens=1000, cached_tokens=500)
+        return packed(
+            {"document_id": 1, "diagnosis": "a"},
+            {"document_id": 2, "diagnosis": "b"},
+            {"document_id": 3, "document_type": "unknown"}
+        )
+
+    def extract(ocr_text, document_type=None, use_cache=True, call_info=None):
+        call_info.update(input_tokens=200, cached_tokens=0)
+        return ExtractedPrescription(diagnosis="single"), 0.0
+
+    monkeypatch.setattr(extractor, "send", send)
+    monkeypatch.setattr(extractor, "extract", extract)
+    infos = [{}, {}, {}]
+
+    extractor.extract_many(["doc a", "doc b", "doc c"], use_cache=False, call_infos=infos)
+
+    assert [info["input_tokens"] for info in infos] == [100, 300, 600 + 200]
+    assert [info["cached_tokens"] for info in infos] == [50, 150, 300]
+    assert sum(info["input_tokens"] for info in infos) == 1000 + 200
+
+
+def test_packed_documents_are_compacted_once(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_PACK_DOCUMENTS", True)
+    monkeypatch.setattr(Config, "LLM_PROMPT_COMPACTION", True)
+    monkeypatch.setattr(Config, "LLM_PACK_MIN_OCR_CONFIDENCE", 0.0)
+    monkeypatch.setattr("extraction.llm_cache.llm_cache", None)
+
+    processor = PrescriptionProcessor()
+    if not processor.llm_text:
+        pytest.skip("LLM text extractor not available")
+
+    ocr_text = "Dr.  Smith\n\nAmoxicillin   500mg\nTake twice daily"
+    monkeypatch.setattr(processor, "get_ocr_pool", lambda: None)
+    monkeypatch.setattr(processor, "run_ocr", lambda path: (ocr_text, 0.95, {}))
+    monkeypatch.setattr(processor, "choose_extraction_method", lambda *args: "llm_text")
+    monkeypatch.setattr(processor, "needs_signature_detection", lambda prescription: False)
+    monkeypatch.setattr(processor, "llm_router", None)
+    monkeypatch.setattr(processor.llm_text, "provider", "openai")
+
+    compact = text_compactor.compact
+    compacted = []
+
+    def counting_compact(text, ocr_result=None):
+        compacted.append(text)
+        return compact(text, ocr_result)
+
+    def send(request, call_info=None):
+        call_info.update(input_tokens=400, cached_tokens=0)
+        return packed({"document_id": 1, "diagnosis": "first"}, {"document_id": 2, "diagnosis": "second"})
+
+    monkeypatch.setattr(text_compactor, "compact", counting_compact)
+    monkeypatch.setattr(processor.llm_text, "send", send)
+
+    results = processor.process_batch(["printed/a.png", "printed/b.png"])
+
+    assert len(compacted) == 2
+    for prescription, metadata in results:
+        assert "prompt_compaction" in metadata
+        stage = next(stage for stage in metadata["processing_stages"] if stage["stage"] == "llm_text_structuring")
+        assert stage["packed_documents"] == 2
+        assert stage["input_tokens"] == 200
+    assert [prescription.diagnosis for prescription, _ in results] == ["first", "second"]
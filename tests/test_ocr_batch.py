@@ -0,0 +1,165 @@
+"""
+DocuVault - Batch OCR tests
+Cross-image recognition batching in OCREngine.extract_batch, with fake detector and recognizer models
+"""
+import numpy as np
+import pytest
+
+from core.config import Config
+from extraction.ocr import OCREngine
+
+
+class FakeClassifier:
+    def __init__(self):
+        self.cls_batch_num = 6
+        self.batch_sizes = []
+
+    def __call__(self, crops):
+        self.batch_sizes.append(self.cls_batch_num)
+        return crops, None, 0.0
+
+
+class FakeRecognizer:
+    """Reads each crop's label; img2-line1 comes back below the drop score"""
+
+    def __init__(self):
+        self.rec_batch_num = 6
+        self.calls = []
+        self.lock = None
+        self.locked = []
+
+    def __call__(self, crops):
+        self.calls.append((len(crops), self.rec_batch_num))
+        self.locked.append(self.lock.locked())
+        return [(crop, 0.3 if crop == "img2-line1" else 0.9) for crop in crops], 0.0
+
+
+class FakePaddle:
+    drop_score = 0.5
+
+    def __init__(self):
+        self.text_classifier = FakeClassifier()
+        self.text_recognizer = FakeRecognizer()
+        self.lock = None
+        self.ocr_calls = []
+
+    def ocr(self, img, cls=True):
+        """Whole-image OCR as used by extract_text and ocr_page"""
+        self.ocr_calls.append((self.text_recognizer.rec_batch_num, self.lock.locked()))
+        return [[[[[0, 0], [50, 0], [50, 8], [0, 8]], ("whole image", 0.9)]]]
+
+
+def make_image(image_id, lines):
+    """Blank page whose first pixel encodes the image id and its number of text lines"""
+    img = np.full((80, 120, 3), 255, dtype=np.uint8)
+    img[0, 0] = (lines, image_id, 0)
+    return img
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(Config, "OCR_NORMALIZE_RESOLUTION", False)
+    monkeypatch.setattr(Config, "OCR_BATCH_REC_SIZE", 64)
+
+    engine = OCREngine()
+    engine._engine = FakePaddle()
+    engine._engine.lock = engine._engine.text_recognizer.lock = engine.predictor_lock(engine._engine)
+    monkeypatch.setattr("extraction.ocr.paddle_box_helpers", lambda: (None, None))
+
+    def detect(paddle, img):
+        return [
+            np.array([[0, 10 * k], [50, 10 * k], [50, 10 * k + 8], [0, 10 * k + 8]], dtype=np.float32)
+            for k in range(int(img[0, 0, 0]))
+        ]
+
+    def crop_boxes(img, boxes):
+        return [f"img{int(img[0, 0, 1])}-line{k}" for k in range(len(boxes))]
+
+    monkeypatch.setattr(engine, "_detect", detect)
+    monkeypatch.setattr(engine, "_crop_boxes", crop_boxes)
+    return engine
+
+
+def test_crops_of_all_images_are_recognized_together(engine):
+    images = [make_image(0, 2), make_image(1, 0), make_image(2, 3)]
+
+    results = engine.extract_batch(images, preprocess=False)
+
+    recognizer = engine.engine.text_recognizer
+    assert recognizer.calls == [(5, 64)]
+    assert [text for text, _, _ in results] == [
+        "img0-line0\nimg0-line1",
+        "",
+        "img2-line0\nimg2-line2"
+    ]
+    assert [metadata["total_lines"] for _, _, metadata in results] == [2, 0, 2]
+    assert all(metadata["batch_size"] == 3 for _, _, metadata in results)
+
+
+def test_batch_lines_match_single_image_recognition(engine):
+    img = make_image(2, 3)
+
+    batch_text, _, batch_metadata = engine.extract_batch([img], preprocess=False)[0]
+    single = engine._recognize(engine.engine, img, engine._detect(engine.engine, img))
+    single_text, _, _ = engine._build_result(single, False, 0.0)
+
+    assert batch_text == single_text
+    assert batch_metadata["ocr_result"].boxes[1].tolist() == [[0, 20], [50, 20], [50, 28], [0, 28]]
+
+
+def test_batch_size_override_is_restored(engine):
+    engine.extract_batch([make_image(0, 1)], preprocess=False, batch_size=16)
+
+    paddle = engine.engine
+    assert paddle.text_recognizer.calls == [(1, 16)]
+    assert paddle.text_classifier.batch_sizes == [16]
+    assert paddle.text_recognizer.rec_batch_num == 6
+    assert paddle.text_classifier.cls_batch_num == 6
+
+
+def test_unreadable_inputs_fail_alone(engine):
+    results = engine.extract_batch(
+        [b"not an image", make_image(0, 1), "scan.pdf"],
+        preprocess=False
+    )
+
+    assert results[1][0] == "img0-line0"
+    for text, confidence, metadata in (results[0], results[2]):
+        assert text == ""
+        assert confidence == 0.0
+        assert "error" in metadata
+    assert "not supported" in results[2][2]["error"]
+
+
+def test_no_lines_skips_recognition(engine):
+    results = engine.extract_batch([make_image(0, 0)], preprocess=False)
+
+    assert engine.engine.text_recognizer.calls == []
+    assert results[0][0] == ""
+
+
+def test_recognition_holds_the_predictor_lock(engine):
+    engine.extract_batch([make_image(0, 2)], preprocess=False)
+
+    assert engine.engine.text_recognizer.locked == [True]
+    assert not engine.predictor_lock(engine.engine).locked()
+
+
+def test_single_image_ocr_shares_the_lock_and_keeps_default_batch_size(engine):
+    text, _, _ = engine.extract_text(make_image(0, 1), preprocess=False)
+    engine.ocr_page(make_image(0, 1), page_index=0)
+
+    assert text == "whole image"
+    assert engine.engine.ocr_calls == [(6, True), (6, True)]
+
+
+def test_falls_back_to_per_image_ocr_without_paddle_internals(engine, monkeypatch):
+    def missing_helpers():
+        raise ImportError("No module named 'tools.infer'")
+
+    monkeypatch.setattr("extraction.ocr.paddle_box_helpers", missing_helpers)
+
+    results = engine.extract_batch([make_image(0, 2), make_image(1, 3)], preprocess=False)
+
+    assert [text for text, _, _ in results] == ["whole image", "whole image"]
+    assert engine.engine.text_recognizer.calls == []
@@ -0,0 +1,94 @@
+"""
+DocuVault - OCR worker pool tests
+Job dispatch, ordering and error handling, with a thread pool standing in for the worker processes
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from extraction import ocr_pool
+from extraction.ocr_pool import OCRWorkerPool
+from extraction.ocr_result import OCRResult
+
+
+class FakeEngine:
+    """Stands in for the worker's OCREngine"""
+
+    def __init__(self):
+        self.calls = []
+
+    def extract_with_fallback(self, image, preprocess_chain=None):
+        self.calls.append((image, preprocess_chain))
+        if image == "broken.png":
+            raise RuntimeError("worker crashed")
+        return f"text of {image}", 0.9, {"confidence": 0.9}
+
+    def ocr_page(self, image, page_index, scale=1.0):
+        return OCRResult([f"{image} line"], [0.8], page_indices=[page_index])
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setattr(ocr_pool, "_worker_engine", engine)
+    return engine
+
+
+@pytest.fixture
+def pool():
+    pool = OCRWorkerPool(num_workers=2, threads_per_worker=1)
+    # Jobs run in threads of this process, so the patched worker engine is visible to them
+    pool._executor = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_map_preserves_order_and_passes_chains(pool, engine):
+    images = [f"{i}.png" for i in range(6)]
+    chains = [["grayscale"] if i % 2 else None for i in range(6)]
+
+    results = pool.map(images, chains)
+
+    assert [text for text, _, _ in results] == [f"text of {i}.png" for i in range(6)]
+    assert all("worker_pid" in metadata for _, _, metadata in results)
+    assert sorted(engine.calls, key=lambda call: call[0]) == list(zip(images, chains))
+
+
+def test_failed_job_yields_empty_result(pool, engine):
+    results = pool.map(["ok.png", "broken.png", "also-ok.png"])
+
+    assert [text for text, _, _ in results] == ["text of ok.png", "", "text of also-ok.png"]
+    text, confidence, metadata = results[1]
+    assert confidence == 0.0
+    assert metadata["error"] == "worker crashed"
+
+
+def test_paths_are_sent_as_strings(pool, engine):
+    pool.submit(Path("scans") / "rx.png").result()
+
+    assert engine.calls == [(str(Path("scans") / "rx.png"), None)]
+
+
+def test_submit_page_returns_page_result(pool, engine):
+    result = pool.submit_page("page.png", page_index=4).result()
+
+    assert result.texts == ["page.png line"]
+    assert result.page_indices.tolist() == [4]
+
+
+def test_start_keeps_a_running_executor(pool):
+    executor = pool._executor
+    pool.start()
+
+    assert pool._executor is executor
+
+
+def test_shutdown_is_idempotent():
+    pool = OCRWorkerPool(num_workers=1, threads_per_worker=1)
+    pool._executor = ThreadPoolExecutor(max_workers=1)
+
+    pool.shutdown()
+    pool.shutdown()
+
+    assert pool._executor is None
@@ -0,0 +1,105 @@
+"""
+DocuVault - OCR result tests
+Conversion from PaddleOCR output, scaling, selection and cache round-trips
+"""
+import json
+
+import numpy as np
+
+from extraction.ocr_result import OCRResult
+
+
+def paddle_line(x, y, text, score, width=100, height=20):
+    box = [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+    return [box, (text, score)]
+
+
+def test_from_paddle_collects_lines_across_pages():
+    results = [
+        [paddle_line(10, 10, "Dr. Smith", 0.9), paddle_line(10, 40, "Amoxicillin", 0.8)],
+        None,
+        [paddle_line(10, 10, "Signature", 0.7)]
+    ]
+
+    result = OCRResult.from_paddle(results, page_offset=3)
+
+    assert len(result) == 3
+    assert result.texts == ["Dr. Smith", "Amoxicillin", "Signature"]
+    assert result.page_indices.tolist() == [3, 3, 5]
+    assert result.text == "Dr. Smith\nAmoxicillin\nSignature"
+    assert np.isclose(result.mean_confidence, 0.8)
+
+
+def test_from_paddle_skips_malformed_lines():
+    results = [[paddle_line(0, 0, "ok", 0.9), [[[0, 0]] * 4], [[[0, 0]] * 4, ("no score",)]]]
+
+    result = OCRResult.from_paddle(results)
+
+    assert result.texts == ["ok"]
+
+
+def test_from_paddle_maps_boxes_back_to_original_coordinates():
+    result = OCRResult.from_paddle([[paddle_line(20, 40, "x", 0.9, width=200, height=60)]], scale=2.0)
+
+    assert result.boxes.dtype == np.float32
+    assert result.boxes[0].tolist() == [[10, 20], [110, 20], [110, 50], [10, 50]]
+    assert result.bounding_rects().tolist() == [[10, 20, 110, 50]]
+
+
+def test_empty_result():
+    result = OCRResult.from_paddle([None])
+
+    assert len(result) == 0
+    assert result.text == ""
+    assert result.mean_confidence == 0.0
+    assert result.boxes.shape == (0, 4, 2)
+    assert result.bounding_rects().shape == (0, 4)
+
+
+def test_concatenate_skips_empty_results():
+    first = OCRResult.from_paddle([[paddle_line(0, 0, "a", 0.9)]], page_offset=0)
+    second = OCRResult.from_paddle([[paddle_line(0, 0, "b", 0.6), paddle_line(0, 30, "c", 0.5)]], page_offset=1)
+
+    merged = OCRResult.concatenate([first, OCRResult(), second])
+
+    assert merged.texts == ["a", "b", "c"]
+    assert merged.page_indices.tolist() == [0, 1, 1]
+    assert merged.boxes.shape == (3, 4, 2)
+    assert len(OCRResult.concatenate([OCRResult(), OCRResult()])) == 0
+
+
+def test_select_and_page():
+    result = OCRResult.from_paddle(
+        [[paddle_line(0, 0, "a", 0.9), paddle_line(0, 30, "b", 0.2)], [paddle_line(0, 0, "c", 0.8)]]
+    )
+
+    confident = result.select(result.confidences >= 0.5)
+    assert confident.texts == ["a", "c"]
+    assert confident.page_indices.tolist() == [0, 1]
+
+    assert result.select(np.array([2, 0])).texts == ["c", "a"]
+    assert result.page(0).texts == ["a", "b"]
+    assert len(result.page(7)) == 0
+
+
+def test_dict_round_trip_survives_json():
+    result = OCRResult.from_paddle(
+        [[paddle_line(1.25, 2.5, "Paracetamol", 0.91234)], [paddle_line(3, 4, "500 mg", 0.75)]],
+        scale=0.5
+    )
+
+    restored = OCRResult.from_dict(json.loads(json.dumps(result.to_dict())))
+
+    assert restored.texts == result.texts
+    assert restored.page_indices.tolist() == result.page_indices.tolist()
+    assert np.allclose(restored.confidences, result.confidences, atol=1e-4)
+    assert np.allclose(restored.boxes, result.boxes, atol=0.05)
+    assert len(OCRResult.from_dict({})) == 0
+
+
+def test_crop_clips_to_image_bounds():
+    image = np.arange(100 * 200, dtype=np.uint8).reshape(100, 200)
+    result = OCRResult.from_paddle([[paddle_line(5, 80, "x", 0.9, width=50, height=10)]])
+
+    assert result.crop(image, 0).shape == (10, 50)
+    assert result.crop(image, 0, padding=15).shape == (35, 70)
@@ -0,0 +1,102 @@
+"""
+DocuVault - Page prefetch tests
+The background producer behind PDF page streaming, including consumers that stop early
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from extraction.ocr import OCREngine
+
+
+class Source:
+    """Page generator that records whether it was closed"""
+
+    def __init__(self, count, fail_at=None):
+        self.count = count
+        self.fail_at = fail_at
+        self.closed = threading.Event()
+
+    def pages(self):
+        try:
+            for i in range(self.count):
+                if i == self.fail_at:
+                    raise RuntimeError(f"page {i} failed to render")
+                yield i
+        finally:
+            self.closed.set()
+
+
+@pytest.fixture
+def engine():
+    return OCREngine()
+
+
+def prefetch_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "pdf-prefetch"]
+
+
+def test_items_arrive_in_order(engine):
+    source = Source(10)
+
+    assert list(engine._prefetch(source.pages(), depth=2)) == list(range(10))
+    assert source.closed.wait(1)
+
+
+def test_producer_error_is_raised_in_consumer(engine):
+    source = Source(5, fail_at=3)
+    consumed = []
+
+    with pytest.raises(RuntimeError, match="page 3"):
+        for item in engine._prefetch(source.pages(), depth=1):
+            consumed.append(item)
+
+    assert consumed == [0, 1, 2]
+    assert source.closed.wait(1)
+
+
+def test_consumer_stopping_early_releases_the_source(engine):
+    source = Source(100)
+    pages = engine._prefetch(source.pages(), depth=1)
+
+    assert next(pages) == 0
+    pages.close()
+
+    assert source.closed.is_set()
+    assert not prefetch_threads()
+
+
+def test_pending_error_does_not_block_a_stopped_producer(engine):
+    source = Source(3, fail_at=2)
+    pages = engine._prefetch(source.pages(), depth=1)
+
+    # Item 1 fills the buffer, so the producer's error has nowhere to go
+    assert next(pages) == 0
+    pages.close()
+
+    assert source.closed.is_set()
+    assert not prefetch_threads()
+
+
+def test_failed_page_ocr_releases_the_document(engine, monkeypatch):
+    closed = threading.Event()
+
+    def pages():
+        try:
+            for i in range(20):
+                yield i, np.full((50, 50, 3), 255, dtype=np.uint8), 300
+        finally:
+            closed.set()
+
+    def ocr_page(image, page_index, scale=1.0):
+        raise RuntimeError("recognizer crashed")
+
+    monkeypatch.setattr(engine, "find_skippable_page", lambda page, index, seen: None)
+    monkeypatch.setattr(engine, "ocr_page", ocr_page)
+
+    text, confidence, metadata = engine._extract_from_pages(pages())
+
+    assert metadata["error"] == "recognizer crashed"
+    assert closed.is_set()
+    assert not prefetch_threads()
@@ -0,0 +1,216 @@
+"""
+DocuVault - Provider router tests
+Circuit breaker states, latency percentiles and hedged routing with fake providers
+"""
+import asyncio
+
+import pytest
+
+from core.config import Config
+from extraction.provider_router import CircuitBreaker, LatencyTracker, ProviderRouter
+from extraction.schema import ExtractedPrescription
+
+
+class FakeExtractor:
+    """Stands in for LLMExtractor.extract_async"""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def extract_async(self, ocr_text, document_type=None, use_cache=True, call_info=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} unavailable")
+        call_info["model"] = self.name
+        return ExtractedPrescription(diagnosis=self.name), self.delay
+
+
+@pytest.fixture(autouse=True)
+def router_config(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_HEDGE_DEFAULT_DELAY", 0.05)
+    monkeypatch.setattr(Config, "LLM_HEDGE_MIN_SAMPLES", 20)
+    monkeypatch.setattr(Config, "LLM_HEDGE_MIN_DELAY", 1.0)
+    monkeypatch.setattr(Config, "LLM_HEDGE_PERCENTILE", 95)
+    monkeypatch.setattr(Config, "LLM_BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(Config, "LLM_BREAKER_COOLDOWN_SECONDS", 60)
+
+
+def expire_cooldown(breaker):
+    breaker.opened_at -= breaker.cooldown
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(95) is None
+
+    for seconds in range(1, 101):
+        tracker.record(float(seconds))
+
+    assert len(tracker) == 100
+    assert tracker.percentile(50) == 50.0
+    assert tracker.percentile(95) == 95.0
+    assert tracker.percentile(100) == 100.0
+    assert tracker.percentile(0) == 1.0
+
+
+def test_latency_window_keeps_recent_samples():
+    tracker = LatencyTracker(window=3)
+    for seconds in (9.0, 1.0, 2.0, 3.0):
+        tracker.record(seconds)
+
+    assert len(tracker) == 3
+    assert tracker.percentile(100) == 3.0
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+
+def test_half_open_lets_a_single_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    expire_cooldown(breaker)
+
+    assert breaker.allow_request()
+    assert breaker.state == "half_open"
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=5, cooldown=60)
+    for _ in range(5):
+        breaker.record_failure()
+    expire_cooldown(breaker)
+
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+
+def test_cancelled_probe_frees_the_probe_slot():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    expire_cooldown(breaker)
+
+    assert breaker.allow_request()
+    breaker.record_cancelled()
+
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+
+
+def test_hedge_delay_uses_default_until_enough_samples():
+    router = ProviderRouter({"openai": FakeExtractor("openai"), "anthropic": FakeExtractor("anthropic")}, primary="openai")
+    assert router.hedge_delay("openai") == 0.05
+
+    for _ in range(20):
+        router.latencies["openai"].record(3.0)
+    assert router.hedge_delay("openai") == 3.0
+
+    for _ in range(20):
+        router.latencies["anthropic"].record(0.1)
+    assert router.hedge_delay("anthropic") == 1.0
+
+
+def test_unknown_primary_is_rejected():
+    with pytest.raises(ValueError):
+        ProviderRouter({"openai": FakeExtractor("openai")}, primary="anthropic")
+
+
+def test_fast_primary_is_not_hedged():
+    primary, secondary = FakeExtractor("openai"), FakeExtractor("anthropic")
+    router = ProviderRouter({"openai": primary, "anthropic": secondary}, primary="openai")
+    call_info = {}
+
+    document, _ = asyncio.run(router.extract_async("text", call_info=call_info))
+
+    assert document.diagnosis == "openai"
+    assert call_info == {"model": "openai", "provider": "openai", "hedged": False}
+    assert secondary.calls == 0
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    primary, secondary = FakeExtractor("openai", delay=1.0), FakeExtractor("anthropic")
+    router = ProviderRouter({"openai": primary, "anthropic": secondary}, primary="openai")
+    call_info = {}
+
+    document, elapsed = asyncio.run(router.extract_async("text", call_info=call_info))
+
+    assert document.diagnosis == "anthropic"
+    assert call_info["provider"] == "anthropic"
+    assert call_info["hedged"] is True
+    assert elapsed < 1.0
+    assert primary.cancelled == 1
+
+    metrics = router.metrics()
+    assert metrics["anthropic"]["hedges"] == 1
+    assert metrics["anthropic"]["wins"] == 1
+    assert metrics["openai"]["cancelled"] == 1
+    assert metrics["openai"]["circuit"] == "closed"
+
+
+def test_failing_primary_fails_over_and_opens_its_circuit():
+    primary, secondary = FakeExtractor("openai", fail=True), FakeExtractor("anthropic")
+    router = ProviderRouter({"openai": primary, "anthropic": secondary}, primary="openai")
+
+    for _ in range(3):
+        document, _ = asyncio.run(router.extract_async("text"))
+        assert document.diagnosis == "anthropic"
+
+    # Two failures open the circuit, so the third request skips the primary
+    assert primary.calls == 2
+    assert router.breakers["openai"].state == "open"
+
+    expire_cooldown(router.breakers["openai"])
+    primary.fail = False
+    document, _ = asyncio.run(router.extract_async("text"))
+
+    assert document.diagnosis == "openai"
+    assert router.breakers["openai"].state == "closed"
+
+
+def test_all_providers_failing_returns_unknown_document():
+    router = ProviderRouter(
+        {"openai": FakeExtractor("openai", fail=True), "anthropic": FakeExtractor("anthropic", fail=True)},
+        primary="openai"
+    )
+
+    document, _ = asyncio.run(router.extract_async("text"))
+
+    assert document.document_type == "unknown"
+
+
+def test_sync_extract_runs_on_the_background_loop():
+    router = ProviderRouter({"openai": FakeExtractor("openai"), "anthropic": FakeExtractor("anthropic")}, primary="openai")
+
+    document, _ = router.extract("text")
+
+    assert document.diagnosis == "openai"
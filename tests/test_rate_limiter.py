@@ -0,0 +1,131 @@
+"""
+DocuVault - Rate limiter tests
+Token bucket accounting, Retry-After parsing and request token estimates
+"""
+import time
+from email.utils import formatdate
+from types import SimpleNamespace
+
+import pytest
+
+from core.config import Config
+from extraction.rate_limiter import RateLimiter, TokenBucket
+
+
+def rate_limit_error(headers, status_code=429):
+    error = Exception("rate limited")
+    error.status_code = status_code
+    error.response = SimpleNamespace(headers=headers)
+    return error
+
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    bucket = TokenBucket(capacity=3, refill_per_second=1)
+    now = bucket.updated
+
+    assert [bucket.reserve(1, now) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve(1, now) == pytest.approx(1.0)
+    # Waits queue up behind earlier reservations
+    assert bucket.reserve(1, now) == pytest.approx(2.0)
+
+
+def test_token_bucket_refills_but_not_past_capacity():
+    bucket = TokenBucket(capacity=10, refill_per_second=2)
+    now = bucket.updated
+
+    assert bucket.reserve(10, now) == 0.0
+    assert bucket.reserve(4, now + 1.0) == pytest.approx(1.0)
+
+    bucket.reserve(0, now + 1000.0)
+    assert bucket.tokens == pytest.approx(10)
+
+
+def test_limiter_throttles_per_model(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_RATE_LIMIT_HEADROOM", 1.0)
+    limiter = RateLimiter(limits={"small": (2, 1_000_000), "large": (100, 1_000_000)})
+
+    assert limiter.reserve("small", 10) == 0.0
+    assert limiter.reserve("small", 10) == 0.0
+    assert limiter.reserve("small", 10) == pytest.approx(30.0, abs=0.1)
+    assert limiter.reserve("large", 10) == 0.0
+
+    metrics = limiter.metrics()
+    assert metrics["small"]["requests"] == 3
+    assert metrics["small"]["throttled"] == 1
+    assert metrics["large"]["throttled"] == 0
+
+
+def test_pause_holds_back_the_model(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_RATE_LIMIT_HEADROOM", 1.0)
+    limiter = RateLimiter(limits={"m": (100, 1_000_000)})
+
+    limiter.pause("m", 5.0)
+
+    assert limiter.reserve("m", 1) == pytest.approx(5.0, abs=0.1)
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after-ms": "1500"}, 1.5),
+    ({"retry-after": "7"}, 7.0),
+    ({"retry-after-ms": "250", "retry-after": "7"}, 0.25),
+    ({"retry-after": "soon"}, None),
+    ({"x-request-id": "abc"}, None),
+    ({}, None)
+])
+def test_retry_after_headers(headers, expected):
+    assert RateLimiter().retry_after(rate_limit_error(headers)) == expected
+
+
+def test_retry_after_http_date():
+    retry_at = formatdate(time.time() + 30, usegmt=True)
+
+    delay = RateLimiter().retry_after(rate_limit_error({"retry-after": retry_at}))
+
+    assert 28 <= delay <= 30
+
+
+def test_retry_after_date_in_the_past_is_zero():
+    retry_at = formatdate(time.time() - 30, usegmt=True)
+
+    assert RateLimiter().retry_after(rate_limit_error({"retry-after": retry_at})) == 0.0
+
+
+def test_retry_after_without_response():
+    assert RateLimiter().retry_after(Exception("connection reset")) is None
+
+
+def test_backoff_prefers_retry_after_and_caps_it():
+    limiter = RateLimiter(base_delay=1.0, max_delay=10.0)
+
+    assert limiter.backoff_delay(0, rate_limit_error({"retry-after": "3"})) == 3.0
+    assert limiter.backoff_delay(0, rate_limit_error({"retry-after": "60"})) == 10.0
+    for attempt in range(6):
+        assert 0.0 <= limiter.backoff_delay(attempt) <= min(10.0, 2 ** attempt)
+
+
+def test_is_retryable_by_status():
+    limiter = RateLimiter()
+
+    assert limiter.is_retryable(rate_limit_error({}, status_code=429))
+    assert limiter.is_retryable(rate_limit_error({}, status_code=529))
+    assert not limiter.is_retryable(rate_limit_error({}, status_code=400))
+    assert not limiter.is_retryable(ValueError("bad json"))
+
+
+def test_estimate_tokens_counts_prompt_images_and_completion_limit(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_IMAGE_TOKEN_ESTIMATE", 1000)
+    request = {
+        "system": "s" * 40,
+        "max_tokens": 500,
+        "messages": [
+            {"role": "user", "content": "u" * 80},
+            {"role": "user", "content": [
+                {"type": "text", "text": "t" * 40},
+                {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}},
+                {"type": "image", "source": {"type": "base64", "data": "AAAA"}}
+            ]}
+        ]
+    }
+
+    assert RateLimiter().estimate_tokens(request) == 10 + 20 + 10 + 2 * 1000 + 500
+    assert RateLimiter().estimate_tokens({"messages": []}) == 0
@@ -0,0 +1,103 @@
+"""
+DocuVault - Structured output schema tests
+Strict-mode constraints on the schemas generated from the Pydantic models
+"""
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from extraction.schema import ExtractedPrescription
+from extraction.structured_output import (
+    PACKED_PRESCRIPTION_JSON_SCHEMA,
+    PIPELINE_FIELDS,
+    PRESCRIPTION_JSON_SCHEMA,
+    SIGNATURE_JSON_SCHEMA,
+    UNSUPPORTED_KEYWORDS,
+    packed_json_schema,
+    strict_json_schema
+)
+
+
+class Dose(BaseModel):
+    amount: float = 1.0
+    unit: Optional[str] = None
+
+
+class Order(BaseModel):
+    item: str
+    doses: List[Dose] = []
+    first_dose: Optional[Dose] = None
+    note: Optional[str] = "none"
+
+
+def walk(node: Any) -> Iterator[Dict[str, Any]]:
+    """Every dict in a schema"""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from walk(item)
+
+
+def assert_strict(schema: Dict[str, Any]):
+    for node in walk(schema):
+        assert "$ref" not in node
+        assert "$defs" not in node
+        assert not set(UNSUPPORTED_KEYWORDS) & set(node)
+        if node.get("type") == "object" and "properties" in node:
+            assert node["additionalProperties"] is False
+            assert node["required"] == list(node["properties"])
+
+
+def test_nested_models_are_inlined_and_tightened():
+    schema = strict_json_schema(Order)
+
+    assert_strict(schema)
+    assert schema["required"] == ["item", "doses", "first_dose", "note"]
+
+    dose = schema["properties"]["doses"]["items"]
+    assert dose["type"] == "object"
+    assert dose["required"] == ["amount", "unit"]
+
+    # Optional fields stay optional through a null branch
+    first_dose_types = [branch.get("type") for branch in schema["properties"]["first_dose"]["anyOf"]]
+    assert first_dose_types == ["object", "null"]
+
+
+def test_exclude_drops_top_level_fields():
+    schema = strict_json_schema(Order, exclude=("note", "missing"))
+
+    assert "note" not in schema["properties"]
+    assert schema["required"] == ["item", "doses", "first_dose"]
+
+
+def test_source_model_schema_is_not_modified():
+    before = Order.model_json_schema()
+    strict_json_schema(Order, exclude=("note",))
+
+    assert Order.model_json_schema() == before
+
+
+def test_prescription_schema():
+    assert_strict(PRESCRIPTION_JSON_SCHEMA)
+    assert_strict(SIGNATURE_JSON_SCHEMA)
+
+    properties = PRESCRIPTION_JSON_SCHEMA["properties"]
+    assert not set(PIPELINE_FIELDS) & set(properties)
+    assert set(properties) == set(ExtractedPrescription.model_fields) - set(PIPELINE_FIELDS)
+    assert "follow_up_date" in properties
+
+
+def test_packed_schema_adds_document_id_first():
+    packed = packed_json_schema(strict_json_schema(Dose))
+
+    assert_strict(packed)
+    assert packed["required"] == ["documents"]
+    item = packed["properties"]["documents"]["items"]
+    assert item["required"] == ["document_id", "amount", "unit"]
+    assert item["properties"]["document_id"]["type"] == "integer"
+
+    assert_strict(PACKED_PRESCRIPTION_JSON_SCHEMA)
+    assert "document_id" not in PRESCRIPTION_JSON_SCHEMA["properties"]
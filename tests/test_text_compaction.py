@@ -0,0 +1,115 @@
+"""
+DocuVault - Text compaction tests
+Noise filters, repeat handling and the token budget of the prompt copy of OCR text
+"""
+import pytest
+
+from core.config import Config
+from extraction.ocr_result import OCRResult
+from extraction.text_compaction import TextCompactor, TokenCounter
+
+
+@pytest.fixture
+def compactor(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_COMPACT_MIN_LINE_CONFIDENCE", 0.6)
+    monkeypatch.setattr(Config, "LLM_COMPACT_MIN_LINE_CHARS", 2)
+    monkeypatch.setattr(Config, "LLM_COMPACT_DEDUPE_MIN_CHARS", 20)
+
+    counter = TokenCounter()
+    counter.encoding = None  # Heuristic counts keep the budget tests independent of tiktoken
+    return TextCompactor(counter)
+
+
+def ocr_lines(*lines):
+    texts = [text for text, _ in lines]
+    confidences = [confidence for _, confidence in lines]
+    return OCRResult(texts, confidences)
+
+
+def test_heuristic_token_counter():
+    counter = TokenCounter()
+    counter.encoding = None
+
+    assert counter.name == "heuristic"
+    assert counter.count("") == 0
+    assert counter.count("Rx") == 1
+    assert counter.count("Amoxicillin 500mg.") == 3 + 2 + 1
+
+
+def test_consecutive_repeats_are_dropped_case_insensitively(compactor):
+    text, stats = compactor.compact("Take after meals\nTAKE AFTER MEALS\nTake after meals\nAmoxicillin")
+
+    assert text == "Take after meals\nAmoxicillin"
+    assert stats["dropped_lines"]["duplicates"] == 2
+
+
+def test_long_repeats_are_dropped_anywhere(compactor):
+    header = "City Hospital Outpatient Department"
+    text, stats = compactor.compact(f"{header}\nParacetamol 500mg\n{header}\nIbuprofen 200mg")
+
+    assert text == f"{header}\nParacetamol 500mg\nIbuprofen 200mg"
+    assert stats["dropped_lines"]["duplicates"] == 1
+
+
+def test_short_non_consecutive_repeats_are_kept(compactor):
+    raw = "Paracetamol\n1 Morning\nIbuprofen\n1 Morning"
+
+    text, stats = compactor.compact(raw)
+
+    assert text == raw
+    assert stats["dropped_lines"]["duplicates"] == 0
+
+
+def test_garbage_separators_and_whitespace(compactor):
+    raw = "--- Page 1 ---\nDr.   Smith\n|\n~ .\n\n--- page 2 ---\nRx: Cetirizine"
+
+    text, stats = compactor.compact(raw)
+
+    assert text == "Dr. Smith\nRx: Cetirizine"
+    assert stats["dropped_lines"]["page_separators"] == 2
+    assert stats["dropped_lines"]["garbage"] == 2
+
+
+def test_low_confidence_lines_are_dropped_only_as_often_as_misread(compactor):
+    ocr_result = ocr_lines(("Twice daily", 0.9), ("Amoxlcilin", 0.3), ("Twice daily", 0.4))
+    raw = "Twice daily\nAmoxlcilin\nNotes\nTwice daily"
+
+    text, stats = compactor.compact(raw, ocr_result)
+
+    assert text == "Notes\nTwice daily"
+    assert stats["dropped_lines"]["low_confidence"] == 2
+
+
+def test_confidence_filter_needs_ocr_result(compactor):
+    text, stats = compactor.compact("Amoxlcilin")
+
+    assert text == "Amoxlcilin"
+    assert stats["dropped_lines"]["low_confidence"] == 0
+
+
+def test_token_budget_truncates_the_tail(compactor):
+    lines = [f"Medication number {i}" for i in range(10)]
+
+    # Each line costs 6 heuristic tokens plus one for the newline
+    text, stats = compactor.compact("\n".join(lines), token_budget=20)
+
+    assert text.splitlines() == lines[:2] + [TextCompactor.TRUNCATION_MARKER]
+    assert stats["truncated_lines"] == 8
+    assert stats["compacted_tokens"] < stats["original_tokens"]
+    assert stats["token_counter"] == "heuristic"
+
+
+def test_text_within_budget_is_not_truncated(compactor):
+    text, stats = compactor.compact("Paracetamol 500mg", token_budget=1000)
+
+    assert text == "Paracetamol 500mg"
+    assert stats["truncated_lines"] == 0
+    assert stats["token_reduction"] == 0.0
+
+
+def test_empty_text(compactor):
+    text, stats = compactor.compact("")
+
+    assert text == ""
+    assert stats["original_tokens"] == 0
+    assert stats["token_reduction"] == 0.0